@@ -2,7 +2,13 @@ from __future__ import annotations
 
 import numpy as np
 
-from mckit.utils import get_decades, significant_digits
+from mckit.utils import (
+    decades_array,
+    get_decades,
+    round_array,
+    significant_array,
+    significant_digits,
+)
 
 
 def run_significant_digits(a: np.ndarray) -> None:
@@ -23,5 +29,21 @@ def test_get_decades(benchmark):
     benchmark(run_get_decades, values)
 
 
+def test_decades_array(benchmark):
+    values = (np.random.default_rng().random(1000) - 0.5) * 1000.0
+    benchmark(decades_array, values)
+
+
+def test_significant_array(benchmark):
+    values = (np.random.default_rng().random(1000) - 0.5) * 1000.0
+    benchmark(significant_array, values)
+
+
+def test_round_array(benchmark):
+    values = (np.random.default_rng().random(1000) - 0.5) * 1000.0
+    digits = significant_array(values)
+    benchmark(round_array, values, digits)
+
+
 # Name (time in ms)        Min     Max    Mean  StdDev  Median     IQR  Outliers       OPS  Rounds  Iterations
 # test_get_decades      2.8199  5.4146  2.9415  0.2459  2.8766  0.0728     12;45  339.9577     331           1
@@ -20,5 +20,20 @@ def test_sly_mcnp_reading(benchmark, clite_text):
     assert len(result.universe) == 150
 
 
+def test_sly_mcnp_reading_with_workers(benchmark, clite_text):
+    """Benchmark parsing MCNP model using all the available CPUs."""
+    result: ParseResult = benchmark(from_text, clite_text, workers=None)
+    assert result.title == "C-LITE VERSION 1 RELEASE 131031 ISSUED 31/10/2013 - Halloween edition"
+    assert len(result.universe) == 150
+
+
+def test_sly_mcnp_reading_from_snapshot(benchmark, clite_text, tmp_path):
+    """Benchmark loading MCNP model from snapshot of previous parsing."""
+    from_text(clite_text, snapshots=tmp_path)
+    result: ParseResult = benchmark(from_text, clite_text, snapshots=tmp_path)
+    assert result.title == "C-LITE VERSION 1 RELEASE 131031 ISSUED 31/10/2013 - Halloween edition"
+    assert len(result.universe) == 150
+
+
 if __name__ == "__main__":
     pytest.main(["--benchmark-enable"])
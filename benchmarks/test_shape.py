@@ -6,12 +6,16 @@ from typing import TYPE_CHECKING
 
 from zipfile import ZipFile
 
+import numpy as np
 import pytest
 
+from mckit.geometry import Shape as _Shape
+
 from mckit import Shape, Universe
 from mckit.box import Box
 from mckit.constants import MCNP_ENCODING
 from mckit.parser import from_text
+from mckit.surface import create_surface
 from mckit.utils import path_resolver
 
 if TYPE_CHECKING:
@@ -42,7 +46,11 @@ def test_bounding_box(benchmark, complexity, cell) -> None:
     benchmark.extra_info["complexity"] = complexity
     benchmark.extra_info["cell"] = cell.name()
     shape = cell.shape
+    hits, misses = shape.box_cache_stat()
     benchmark.pedantic(Shape.bounding_box, args=(shape,), kwargs={"box": gb, "tol": 10.0})
+    new_hits, new_misses = shape.box_cache_stat()
+    benchmark.extra_info["box_cache_hits"] = new_hits - hits
+    benchmark.extra_info["box_cache_misses"] = new_misses - misses
 
 
 def test_universe_bounding_box(benchmark) -> None:
@@ -65,5 +73,71 @@ def test_cell_volume(benchmark, complexity, cell) -> None:
     benchmark.pedantic(Shape.volume, args=(shape,), kwargs={"box": gb, "min_volume": 10.0})
 
 
+@pytest.mark.parametrize("complexity, cell", sample_by_complexity(clite_model))
+def test_cell_ultimate_test_box(benchmark, complexity, cell) -> None:
+    gb = Box([692.0, 27.0, -313.0], 4000.0, 2000.0, 5000.0)
+    benchmark.extra_info["complexity"] = complexity
+    benchmark.extra_info["cell"] = cell.name()
+    shape = cell.shape
+    benchmark.pedantic(
+        Shape.ultimate_test_box, args=(shape,), kwargs={"box": gb, "min_volume": 10.0}
+    )
+
+
+def random_planes_union(terms: int, seed: int = 0) -> Shape:
+    """Union of intersections of four random half-spaces."""
+    rng = np.random.default_rng(seed)
+    args = []
+    for i in range(terms):
+        half_spaces = [
+            Shape("C", create_surface("P", *rng.normal(size=3), rng.uniform(-8, 8), name=name))
+            for name in range(4 * i + 1, 4 * i + 5)
+        ]
+        args.append(Shape("I", *half_spaces))
+    return Shape("U", *args)
+
+
+def slabs_union(terms: int) -> Shape:
+    """Union of disjoint slabs between planes normal to x axis."""
+    args = [
+        Shape(
+            "I",
+            Shape("S", create_surface("PX", i, name=2 * i + 1)),
+            Shape("C", create_surface("PX", i + 0.5, name=2 * i + 2)),
+        )
+        for i in range(terms)
+    ]
+    return Shape("U", *args)
+
+
+def rotated_box() -> Shape:
+    """Inside of a box macrobody rotated about z axis."""
+    return Shape("C", create_surface("BOX", -1, -2, -3, 3, 4, 0, -4, 3, 0, 0, 0, 6, name=1))
+
+
+@pytest.mark.parametrize(
+    "method",
+    [
+        pytest.param(_Shape.volume, id="bisection"),
+        pytest.param(Shape.volume, id="default"),
+        pytest.param(lambda shape, **kwargs: Shape.volume(shape, exact=True, **kwargs), id="exact"),
+    ],
+)
+@pytest.mark.parametrize(
+    "make_shape",
+    [
+        pytest.param(rotated_box, id="box"),
+        pytest.param(lambda: slabs_union(8), id="slabs-8"),
+        pytest.param(lambda: random_planes_union(8), id="random-8"),
+        pytest.param(lambda: random_planes_union(16), id="random-16"),
+        pytest.param(lambda: random_planes_union(30), id="random-30"),
+    ],
+)
+def test_planes_volume(benchmark, make_shape, method) -> None:
+    """The default volume computation of plane-only shapes is as fast as the bisection."""
+    box = Box([0.0, 0.0, 0.0], 20.0, 20.0, 20.0)
+    benchmark.pedantic(method, setup=lambda: ((make_shape(),), {"box": box, "min_volume": 1.0e-3}))
+
+
 if __name__ == "__main__":
     pytest.main(["--benchmark-enable", "--benchmark-autosave"])
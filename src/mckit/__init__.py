@@ -9,6 +9,7 @@ from mckit.material import AVOGADRO, Composition, Element, Material
 from mckit.parser import ParseResult, from_file, from_stream, from_text, read_meshtal
 from mckit.parser.mctal_parser import read_mctal
 from mckit.surface import Cone, Cylinder, GQuadratic, Plane, Sphere, Torus, create_surface
+from mckit.surface_table import SurfaceTable
 from mckit.transformation import Transformation
 from mckit.universe import Universe
 from mckit.version import (
@@ -36,6 +37,7 @@ __all__: list[str] = [
     "Plane",
     "Shape",
     "Sphere",
+    "SurfaceTable",
     "Torus",
     "Transformation",
     "Universe",
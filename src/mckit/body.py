@@ -1,15 +1,16 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Any, cast
 
 import os
 
+from collections import defaultdict
 from collections.abc import Generator
-from copy import deepcopy
-from functools import reduce
-from itertools import groupby, permutations, product
+from functools import cached_property, reduce
+from itertools import product
 from logging import getLogger
 from multiprocessing import Pool
+from weakref import WeakValueDictionary
 
 import numpy as np
 
@@ -24,6 +25,12 @@ from mckit.geometry import Shape as _Shape
 from .box import GLOBAL_BOX, Box
 from .card import Card
 from .constants import MIN_BOX_VOLUME
+from .polyhedron import (
+    convex_decomposition,
+    convex_polyhedron,
+    polyhedra_bounds,
+    polyhedra_volume,
+)
 from .printer import CELL_OPTION_GROUPS, print_option
 from .surface import Surface
 from .transformation import Transformation
@@ -62,10 +69,14 @@ class Shape(_Shape):
     Methods:
         test_box(box)
             Tests if the box intersects the shape.
-        volume(box, min_volume)
-            Calculates the volume of the shape with desired accuracy.
-        bounding_box(box, tol)
-            Finds bounding box for the shape with desired accuracy.
+        volume(box, min_volume, exact)
+            Calculates the volume of the shape with desired accuracy,
+            exactly for an intersection of planes half-spaces
+            and optionally for any shape bounded by planes only.
+        bounding_box(box, tol, exact)
+            Finds bounding box for the shape with desired accuracy,
+            exactly for an intersection of planes half-spaces
+            and optionally for any shape bounded by planes only.
         test_points(points)
             Tests the senses of the points.
         is_complement(other)
@@ -99,6 +110,35 @@ class Shape(_Shape):
         "C": ~hash("S"),
     }
 
+    _interned: ClassVar[WeakValueDictionary[tuple[Any, ...], Shape]] = WeakValueDictionary()
+
+    def __new__(cls, _opc: str | None = None, *_args: Shape | Surface | Body) -> Shape:  # noqa: PYI034
+        """Get the shape for the operation and arguments.
+
+        The shapes are interned: the existing shape with the same operation and
+        the same argument objects is returned, if any. So, identical sub-expressions
+        are shared between shapes.
+        """
+        if _opc is None:  # unpickling, the state is set by __setstate__()
+            return _Shape.__new__(cls)
+        opc, args = _clean_args(_opc, *_args)
+        return cls._intern(opc, args)
+
+    @classmethod
+    def _intern(cls, opc: str, args: list[Shape | Surface], hash_value: int | None = None) -> Shape:
+        """Get the interned shape for the operation and the clean arguments."""
+        key = (cls, opc, *map(id, args))  # the ids are valid while the shape holds the args
+        shape = cls._interned.get(key)
+        if shape is None:
+            shape = _Shape.__new__(cls)
+            _Shape.__init__(shape, opc, *args)
+            if hash_value is None:
+                shape._calculate_hash(opc, *args)
+            else:
+                shape._hash = hash_value
+            cls._interned[key] = shape
+        return shape
+
     def __init__(self, _opc: str, *_args: Shape | Surface | Body) -> None:
         """Initialize Shape object.
 
@@ -114,9 +154,7 @@ class Shape(_Shape):
                 no arguments must be specified for 'E' or 'R' opc. Only one argument
                 must present for 'C' or 'S' opc values.
         """
-        opc, args = _clean_args(_opc, *_args)
-        _Shape.__init__(self, opc, *args)
-        self._calculate_hash(opc, *args)
+        # The shape is initialized in __new__()
 
     def __iter__(self):
         return iter(self.args)
@@ -165,29 +203,22 @@ class Shape(_Shape):
                 words.append(")")
         return words
 
-    def __eq__(self, other) -> bool:  # noqa: PLR0911
+    def __eq__(self, other) -> bool:
         if self is other:
             return True
         if self.opc != other.opc:
             return False
         if self.opc in {"E", "R"}:  # empty or whole space
             return True
-        if len(self.args) != len(other.args):
+        if self._hash != other._hash or len(self.args) != len(other.args):
             return False
-        self_groups = {k: list(v) for k, v in groupby(self.args, key=hash)}
-        other_groups = {k: list(v) for k, v in groupby(other.args, key=hash)}
-        for hash_value, entities in self_groups.items():
-            if hash_value not in other_groups.keys():
-                return False
-            if len(entities) != len(other_groups[hash_value]):
-                return False
-            for other_entities in permutations(other_groups[hash_value]):
-                for se, oe in zip(entities, other_entities, strict=False):
-                    if not (se == oe):
-                        break
-                else:
-                    return True
-        return False
+        # The args are in canonical order, so equal shapes usually have equal args pairwise.
+        for a, b in zip(self.args, other.args, strict=True):
+            if a is not b and not (a == b):
+                break
+        else:
+            return True
+        return _match_args_with_equal_hashes(self.args, other.args)
 
     def __hash__(self) -> int:
         return cast(int, self._hash)
@@ -301,6 +332,10 @@ class Shape(_Shape):
             surfaces needed to describe the shape. Repeats are taken into
             account.
         """
+        return self._complexity
+
+    @cached_property
+    def _complexity(self) -> int:
         args = self.args
         if len(args) == 1:
             return 1
@@ -311,17 +346,104 @@ class Shape(_Shape):
             return result
         return 0
 
-    def get_surfaces(self) -> set[Surface]:
-        """Gets all the surfaces that describe the shape."""
+    def get_surfaces(self) -> frozenset[Surface]:
+        """Gets all the surfaces that describe the shape.
+
+        The set is computed once and shared between calls.
+        """
+        return self._surfaces
+
+    @cached_property
+    def _surfaces(self) -> frozenset[Surface]:
         args = self.args
         if len(args) == 1:
-            return {args[0]}
+            return frozenset(args)
         if len(args) > 1:
-            result: set[Surface] = set()
-            for a in args:
-                result = result.union(a.get_surfaces())
-            return result
-        return set()
+            return frozenset().union(*(a.get_surfaces() for a in args))
+        return frozenset()
+
+    def bounding_box(
+        self, tol: float = 100.0, box: Box = GLOBAL_BOX, *, exact: bool = False
+    ) -> Box:
+        """Finds bounding box for the shape with desired accuracy.
+
+        The bounding box of an intersection of planes half-spaces, including insides
+        of BOX macrobodies, is found exactly. The boxes are cached by the starting box,
+        tolerance and `exact` flag.
+
+        Args:
+            tol: Linear tolerance for the bounding box.
+            box: Starting box for the search.
+            exact: Find the exact bounding box of any shape bounded by planes only.
+                The decomposition of the shape to convex polyhedra may be much slower
+                than the search with tolerance,
+                see :func:`mckit.polyhedron.convex_decomposition`.
+
+        Returns:
+            The bounding box.
+        """
+        key = (box, tol, exact)
+        result = self._bounding_boxes.get(key)
+        if result is None:
+            result = self._polyhedra_bounding_box(box, exact=exact)
+            if result is None:
+                result = _Shape.bounding_box(self, tol=tol, box=box)
+            self._bounding_boxes[key] = result
+        return result
+
+    @cached_property
+    def _bounding_boxes(self) -> dict[tuple[Box, float, bool], Box]:
+        return {}
+
+    def volume(
+        self, box: Box = GLOBAL_BOX, min_volume: float = MIN_BOX_VOLUME, *, exact: bool = False
+    ) -> float:
+        """Calculates volume of the shape inside the box.
+
+        The volume of an intersection of planes half-spaces, including insides
+        of BOX macrobodies, is computed exactly.
+
+        Args:
+            box: The box to compute the volume in.
+            min_volume: The smallest volume of the box splitting in approximate computation.
+            exact: Compute the volume of any shape bounded by planes only exactly.
+                The decomposition of the shape to convex polyhedra may be much slower
+                than the approximate computation,
+                see :func:`mckit.polyhedron.convex_decomposition`.
+
+        Returns:
+            The volume.
+        """
+        polyhedra = self._polyhedra if exact else self._convex_polyhedron
+        if polyhedra is not None:
+            result = polyhedra_volume(polyhedra, box)
+            if result is not None:
+                return result
+        return cast(float, _Shape.volume(self, box=box, min_volume=min_volume))
+
+    def _polyhedra_bounding_box(self, box: Box, *, exact: bool) -> Box | None:
+        polyhedra = self._polyhedra if exact else self._convex_polyhedron
+        if polyhedra is None:
+            return None
+        bounds = polyhedra_bounds(polyhedra, box)
+        if bounds is None:
+            return None
+        lower, upper = bounds
+        basis = np.array([box.ex, box.ey, box.ez])
+        center = box.center + 0.5 * (lower + upper) @ basis
+        wx, wy, wz = upper - lower
+        return Box(center, wx, wy, wz, ex=box.ex, ey=box.ey, ez=box.ez)
+
+    @cached_property
+    def _polyhedra(self) -> list[npt.NDArray[np.float64]] | None:
+        polyhedra = self._convex_polyhedron
+        if polyhedra is None:
+            polyhedra = convex_decomposition(self)
+        return polyhedra
+
+    @cached_property
+    def _convex_polyhedron(self) -> list[npt.NDArray[np.float64]] | None:
+        return convex_polyhedron(self)
 
     def is_empty(self) -> bool:
         """Check, if the shape is empty."""
@@ -481,6 +603,31 @@ class Shape(_Shape):
             return Shape(self.opc, *args)
         return self
 
+    def _copy_with_surfaces(self, copies: dict[int, Surface]) -> Shape:
+        """Creates the same shape of the surfaces copies.
+
+        The copies are equal to the surfaces, so the arguments are not cleaned again
+        and the hash is kept.
+
+        Args:
+            copies: The surfaces copies by the ids of the surfaces, the missing
+                copies are made and added.
+
+        Returns:
+            New Shape object with the same structure.
+        """
+        if self.opc in {"C", "S"}:
+            surface = self.args[0]
+            copy = copies.get(id(surface))
+            if copy is None:
+                copy = copies[id(surface)] = surface.copy()
+            args = [copy]
+        elif self.opc in {"I", "U"}:
+            args = [arg._copy_with_surfaces(copies) for arg in self.args]
+        else:
+            return self
+        return Shape._intern(self.opc, args, self._hash)
+
     @staticmethod
     def from_polish_notation(polish: list[Surface | Shape | str]) -> Shape:
         """Creates Shape instance from reversed Polish notation.
@@ -491,19 +638,31 @@ class Shape(_Shape):
         Returns:
             The geometry represented by Shape instance.
         """
-        operands = []
+        # The chains of the same operations are collected to lists [opc, args]
+        # and a shape is created once for the whole chain.
+        operands: list[Shape | list] = []
         for op in polish:
             if isinstance(op, Surface):
                 operands.append(Shape("S", op))
             elif isinstance(op, Shape):
                 operands.append(op)
             elif op == "C":
-                operands.append(operands.pop().complement())
+                operands.append(_complete_operand(operands.pop()).complement())
             else:
                 arg1 = operands.pop()
                 arg2 = operands.pop()
-                operands.append(Shape(op, arg1, arg2))
-        return operands.pop()
+                if isinstance(arg2, list) and arg2[0] == op:
+                    chain = arg2
+                    _extend_chain(chain, arg1)
+                elif isinstance(arg1, list) and arg1[0] == op:
+                    chain = arg1
+                    _extend_chain(chain, arg2)
+                else:
+                    chain = [op, []]
+                    _extend_chain(chain, arg2)
+                    _extend_chain(chain, arg1)
+                operands.append(chain)
+        return _complete_operand(operands.pop())
 
 
 if TYPE_CHECKING:
@@ -528,31 +687,29 @@ def _clean_args(opc: str, *_args: Shape | Surface | Body) -> tuple[str, list[Sha
     if opc in {"I", "U"}:  # intersect or union
         args = [Shape("S", a) if isinstance(a, Surface) else a for a in args]
     if len(args) > 1:
-        # Extend arguments
-        i = 0
-        while i < len(args):
-            if args[i].opc == opc:
-                a = args.pop(i)
-                args.extend(a.args)
+        # Extend arguments, the args of the same operation are already flat
+        flat_args = []
+        for a in args:
+            if a.opc == opc:
+                flat_args.extend(a.args)
             else:
-                i += 1
-
-        i = 0
-        while i < len(args):
-            a = args[i]
+                flat_args.append(a)
+        args = []
+        by_hash: dict[int, list[Shape]] = defaultdict(list)
+        for a in flat_args:
             if (a.opc == "E" and opc == "I") or (a.opc == "R" and opc == "U"):
                 return a.opc, []
             if (a.opc == "E" and opc == "U") or (a.opc == "R" and opc == "I"):
-                args.pop(i)
                 continue
-            for b in args[i + 1 :]:
-                if a.is_complement(b):
-                    if opc == "I":
-                        return "E", []
-                    return "R", []
-            i += 1
+            complement_candidates = by_hash.get(~hash(a))
+            if complement_candidates and any(a.is_complement(b) for b in complement_candidates):
+                if opc == "I":
+                    return "E", []
+                return "R", []
+            by_hash[hash(a)].append(a)
+            args.append(a)
         # TODO dvp: make args unique: args = list(set(args))
-        args.sort(key=hash)
+        args.sort(key=_canonical_order_key)
         if len(args) == 0:
             opc = "E" if opc == "U" else "R"
     if len(args) == 1 and isinstance(args[0], Shape):
@@ -565,6 +722,54 @@ def _clean_args(opc: str, *_args: Shape | Surface | Body) -> tuple[str, list[Sha
     return opc, args
 
 
+def _extend_chain(chain: list, operand: Shape | list) -> None:
+    """Add operand to the chain [opc, args] of operations in Polish notation."""
+    if isinstance(operand, list):
+        operand = _complete_operand(operand)
+    chain[1].append(operand)
+
+
+def _complete_operand(operand: Shape | list) -> Shape:
+    """Create the shape for a chain [opc, args] of operations in Polish notation."""
+    if isinstance(operand, list):
+        opc, args = operand
+        return Shape(opc, *args)
+    return operand
+
+
+def _canonical_order_key(shape: Shape) -> tuple[int, str, bool, int]:
+    """Sort key to bring the args of equal shapes to the same order.
+
+    Unnamed surfaces go after the named ones.
+    """
+    if shape.opc in {"S", "C"}:
+        name = shape.args[0].name()
+        return hash(shape), shape.opc, name is None, name or 0
+    return hash(shape), shape.opc, False, 0
+
+
+def _match_args_with_equal_hashes(args: tuple[Shape, ...], other_args: tuple[Shape, ...]) -> bool:
+    """Checks if every arg has its own equal arg among the other args with the same hash.
+
+    This resolves the cases, when canonical order differs for equal shapes:
+    hash collisions and equal surfaces with different names.
+    """
+    groups: dict[int, list[Shape]] = defaultdict(list)
+    for b in other_args:
+        groups[hash(b)].append(b)
+    for a in args:
+        group = groups.get(hash(a))
+        if not group:
+            return False
+        for i, b in enumerate(group):
+            if a is b or a == b:
+                group.pop(i)
+                break
+        else:
+            return False
+    return True
+
+
 def _verify_opc(opc, *args):
     """Checks if such argument combination is valid."""
     if (opc in {"E", "R"}) and len(args) > 0:
@@ -794,6 +999,8 @@ class Body(Card):
         universe: Universe = None,
         recurrent: bool = False,
         simplify: bool = False,
+        prune: bool = False,
+        prune_tol: float = 10.0,
         **kwargs: dict[str, any],
     ) -> list[Body]:
         """Fills this cell by filling universe.
@@ -813,6 +1020,11 @@ class Body(Card):
                 be also filled. Default: False.
             simplify:
                 If True, all cells obtained will be simplified.
+            prune:
+                If True, the filler cells, which bounding boxes don't intersect the bounding
+                box of this cell, are dropped before intersection. Default: False.
+            prune_tol:
+                Tolerance for the bounding boxes used on pruning. Default: 10 cm.
             **kwargs: dict
                 Keyword parameters for simplify method if simplify is True.
                 Default: all False.
@@ -830,8 +1042,12 @@ class Body(Card):
                 return [self]
         if recurrent:
             universe = universe.fill(recurrent=True, simplify=simplify, **kwargs)
+        if prune:
+            envelope = self._shape.bounding_box(tol=prune_tol)
         cells = []
         for c in universe:
+            if prune and not _boxes_overlap(envelope, c.shape.bounding_box(tol=prune_tol)):
+                continue
             new_cell = c.intersection(self)  # because properties like MAT, etc
             # must be as in filling cell.
             if "U" in self.options.keys():
@@ -842,16 +1058,25 @@ class Body(Card):
         return cells
 
     # noinspection PyUnresolvedReferences
-    def transform(self, transformation: Transformation) -> Body:
+    def transform(
+        self,
+        transformation: Transformation,
+        transformed_surfaces: dict[Surface, Surface | Shape] | None = None,
+    ) -> Body:
         """Applies transformation to this cell.
 
         Args:
             transformation: Transformation to be applied.
+            transformed_surfaces: Optional map of all the surfaces of the cell to the results
+                of their transformation, to share them between cells.
 
         Returns:
             The result of this cell transformation.
         """
-        geometry = self._shape.transform(transformation)
+        if transformed_surfaces is None:
+            geometry = self._shape.transform(transformation)
+        else:
+            geometry = self._shape.replace_surfaces(transformed_surfaces)
         options = filter_dict(self.options, "original")
         cell = Body(geometry, **options)
         fill = cell.options.get("FILL", None)
@@ -864,24 +1089,61 @@ class Body(Card):
             fill["transform"] = new_tr
         return cell
 
-    def apply_transformation(self) -> Body:
-        """Actually apply transformation to this cell."""
+    def apply_transformation(
+        self,
+        instancing: bool = False,
+        cache: dict[tuple[Universe, Transformation | None], Universe] | None = None,
+    ) -> Body:
+        """Actually apply transformation to this cell.
+
+        The filling universe is transformed once for each transformation, the cells filled
+        with the same universe and transformation share the resulting universe.
+
+        Args:
+            instancing: Don't apply FILL transformation to the filling universe,
+                keep it in the FILL option for output instead.
+            cache: The filling universes and transformations mapped to the transformed
+                universes. Pass the same map to share the universes between cells.
+
+        Returns:
+            The cell with applied transformations.
+        """
         geometry = self._shape.apply_transformation()
         options = filter_dict(self.options, "original")
         cell = Body(geometry, **options)
         fill = cell.options.get("FILL")
         if fill is not None:
-            tr_in = fill.get("transform")
+            if cache is None:
+                cache = {}
             filling_universe = fill["universe"]
-            new_filling_universe = (
-                deepcopy(filling_universe).transform(tr_in).apply_transformation()
-            )
-            cell.options["FILL"] = {"universe": new_filling_universe}
+            tr_in = None if instancing else fill.get("transform")
+            key = (filling_universe, tr_in)
+            new_filling_universe = cache.get(key)
+            if new_filling_universe is None:
+                if tr_in is not None:
+                    filling_universe = filling_universe.transform(tr_in)
+                new_filling_universe = filling_universe.apply_transformation(instancing, cache)
+                cache[key] = new_filling_universe
+            new_fill = {"universe": new_filling_universe}
+            if instancing and "transform" in fill:
+                new_fill["transform"] = fill["transform"]
+            cell.options["FILL"] = new_fill
             # TODO dvp: this should create a lot of cell clashes on complex models with multiple filling with
             #           one universe. Should be resolved before saving.
         return cell
 
 
+def _boxes_overlap(box1: Box, box2: Box) -> bool:
+    """Checks if the axis-aligned bounds of the boxes overlap.
+
+    Unlike `Box.check_intersection()`, this is a cheap conservative check:
+    the boxes are disjoint, if the result is False.
+    """
+    bounds1 = box1.bounds
+    bounds2 = box2.bounds
+    return bool(np.all(bounds1[:, 0] <= bounds2[:, 1]) and np.all(bounds2[:, 0] <= bounds1[:, 1]))
+
+
 def simplify(
     cells: Iterable[Body], box: Box = GLOBAL_BOX, min_volume: float = 1.0
 ) -> Iterator[Body]:
@@ -7,7 +7,10 @@ materials.txt, transformations.txt, sdef.txt, cards.txt
 
 from __future__ import annotations
 
+from typing import TextIO
+
 from collections.abc import Iterable
+from contextlib import closing
 from pathlib import Path
 
 import mckit.parser.mcnp_section_parser as sp
@@ -28,15 +31,66 @@ def print_text(text: str, output_dir: Path, section_file_name: str, override: bo
         out.write_text(text, encoding=MCNP_ENCODING)
 
 
+class CardsWriter:
+    """Writes cards to a file, which is created on the first card."""
+
+    def __init__(self, path: Path, override: bool) -> None:
+        self.path = path
+        self.override = override
+        self._fid: TextIO | None = None
+
+    def write(self, card: sp.Card) -> None:
+        if self._fid is None:
+            check_if_path_exists(self.path, self.override)
+            self._fid = self.path.open("w", encoding=MCNP_ENCODING)
+        print(card.text, file=self._fid)
+
+    def close(self) -> None:
+        if self._fid is not None:
+            self._fid.close()
+            self._fid = None
+
+
 def print_cards(
     cards: Iterable[sp.Card], output_dir: Path, section_file_name: str, override: bool
 ) -> None:
-    if cards:
-        out = output_dir / section_file_name
-        check_if_path_exists(out, override)
-        with out.open("w", encoding=MCNP_ENCODING) as fid:
-            for card in cards:
-                print(card.text, file=fid)
+    with closing(CardsWriter(output_dir / section_file_name, override)) as writer:
+        for card in cards:
+            writer.write(card)
+
+
+DATA_FILES = {
+    sp.Kind.MATERIAL: "materials.txt",
+    sp.Kind.TRANSFORMATION: "transformations.txt",
+    sp.Kind.SDEF: "sdef.txt",
+    sp.Kind.TALLY: "tallies.txt",
+}
+OTHER_DATA_FILE = "cards.txt"
+
+
+def print_data_cards(cards: Iterable[sp.Card], output_dir: Path, override: bool) -> None:
+    """Distribute data cards to files by kinds as :func:`mckit.parser.mcnp_section_parser.distribute_cards`."""
+    writers = {
+        file_name: CardsWriter(output_dir / file_name, override)
+        for file_name in (*DATA_FILES.values(), OTHER_DATA_FILE)
+    }
+    comment: sp.Card | None = None
+    try:
+        for card in cards:
+            if card.is_comment:
+                assert comment is None
+                comment = card
+                continue
+            writer = writers[DATA_FILES.get(card.kind, OTHER_DATA_FILE)]
+            if comment:
+                writer.write(comment)
+                comment = None
+            writer.write(card)
+        if comment:
+            writers[OTHER_DATA_FILE].write(comment)
+    finally:
+        for writer in writers.values():
+            writer.close()
 
 
 def split(output_dir: Path, mcnp_file_name: str | Path, override: bool, separators=False) -> None:
@@ -44,19 +98,12 @@ def split(output_dir: Path, mcnp_file_name: str | Path, override: bool, separato
     if isinstance(mcnp_file_name, str):
         mcnp_file_name = Path(mcnp_file_name)
     assert output_dir.is_dir()
-    with mcnp_file_name.open(encoding=MCNP_ENCODING) as fid:
-        sections: sp.InputSections = sp.parse_sections(fid)
-    print_text(sections.title, output_dir, "title.txt", override)
-    print_cards(sections.cell_cards, output_dir, "cells.txt", override)
-    print_cards(sections.surface_cards, output_dir, "surfaces.txt", override)
-    if sections.data_cards:
-        materials, transformations, sdef, tallies, others = sp.distribute_cards(sections.data_cards)
-        print_cards(materials, output_dir, "materials.txt", override)
-        print_cards(transformations, output_dir, "transformations.txt", override)
-        print_cards(sdef, output_dir, "sdef.txt", override)
-        print_cards(tallies, output_dir, "tallies.txt", override)
-        print_cards(others, output_dir, "cards.txt", override)
-    print_text(sections.remainder, output_dir, "remainder.txt", override)
+    with closing(sp.MappedInputSections(mcnp_file_name)) as sections:
+        print_text(sections.title, output_dir, "title.txt", override)
+        print_cards(sections.cell_cards(), output_dir, "cells.txt", override)
+        print_cards(sections.surface_cards(), output_dir, "surfaces.txt", override)
+        print_data_cards(sections.data_cards(), output_dir, override)
+        print_text(sections.remainder, output_dir, "remainder.txt", override)
     logger.debug("The parts of %s are saved to {}", mcnp_file_name, output_dir)
     if separators:
         write_separators(output_dir, mcnp_file_name.stem)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import shutil
 import sys
 
 from contextlib import contextmanager
@@ -154,7 +155,8 @@ def concat(output, parts_encoding, output_encoding, parts):
         for f in map(Path, parts):
             # TODO dvp: Add filtering of a part's text here. Implement as external scripts call.
             #           Should be configurable
-            print(f.read_text(encoding=parts_encoding), file=out_fid, end="")
+            with f.open(encoding=parts_encoding) as part_fid:
+                shutil.copyfileobj(part_fid, out_fid)
 
 
 # noinspection PyCompatibility
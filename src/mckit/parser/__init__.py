@@ -1,15 +1,28 @@
 from __future__ import annotations
 
 from mckit.parser.common.utils import RE_C_COMMENT, drop_c_comments
-from mckit.parser.mcnp_input_sly_parser import ParseResult, from_file, from_stream, from_text
+from mckit.parser.mcnp_input_sly_parser import (
+    LazyParseResult,
+    ParseResult,
+    from_file,
+    from_file_lazy,
+    from_stream,
+    from_text,
+    from_text_lazy,
+    reparse_text,
+)
 from mckit.parser.meshtal_parser import read_meshtal
 
 __all__ = [
     "RE_C_COMMENT",
+    "LazyParseResult",
     "ParseResult",
     "drop_c_comments",
     "from_file",
+    "from_file_lazy",
     "from_stream",
     "from_text",
+    "from_text_lazy",
     "read_meshtal",
+    "reparse_text",
 ]
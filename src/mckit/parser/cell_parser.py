@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+import re
+
 import sly
 
 import mckit.parser.common.utils as pu
@@ -22,6 +24,9 @@ from mckit.utils.indexes import Index
 
 CELL_WORDS = {"U", "MAT", "LAT", "TMP", "RHO", "VOL", "PMT"}
 
+# pattern to find references to other cells: "LIKE n BUT" and cell complement "#n"
+CELL_REFERENCE_PATTERN = re.compile(r"(?:\blike\s+(\d+)\s+but\b)|(?:#\s*(\d+))", re.IGNORECASE)
+
 
 def intern_cell_word(word: str):
     word = pu.ensure_upper(word)
@@ -378,6 +383,22 @@ class Parser(sly.Parser):
         return p[0]
 
 
+def scan_referenced_cells(text: str) -> set[int]:
+    """Find numbers of cells, which a cell card refers to, without full parsing.
+
+    The cell card refers to other cells with "LIKE n BUT" specification
+    and with complement "#n" in geometry.
+
+    Args:
+        text: cell card text
+
+    Returns:
+        Numbers of the referenced cells.
+    """
+    text = pu.drop_comments(text)
+    return {int(like or complement) for like, complement in CELL_REFERENCE_PATTERN.findall(text)}
+
+
 def parse(
     text: str,
     cells: Index | None = None,
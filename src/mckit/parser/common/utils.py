@@ -14,6 +14,8 @@ RE_LINE = re.compile(LINE)
 FLOAT = r"[+-]?((\d+\.?\d*)|(\.\d+))(?:[ed][-+]?\d+)?"
 INTEGER = r"\d+"
 RE_EMPTY_LINE = re.compile(r"\s*")
+RE_FLOAT = re.compile(FLOAT, re.IGNORECASE)
+RE_SIGNED_INTEGER = re.compile(r"[-+]?\d+")
 
 
 def ensure_lower(text: str):
@@ -88,6 +90,40 @@ def extract_comments(text) -> tuple[str, dict[int, tuple[str, ...]] | None, list
     return "\n".join(cleaned_text), res_comments, trailing_comment if trailing_comment else None
 
 
+def split_words(text: str) -> list[str]:
+    """Split cleaned card text to words for fast parsers.
+
+    Continuation mark "&" is treated as space like in the sly lexers.
+    """
+    if "&" in text:
+        text = text.replace("&", " ")
+    return text.split()
+
+
+def convert_floats(words: Iterable[str]) -> list[float] | None:
+    """Convert words to floats in bulk.
+
+    The integer words are converted via `int` as the sly lexers do.
+
+    Returns:
+        The values or None, if some word is not a float number in MCNP format
+        supported by Python float().
+    """
+    result: list[float] = []
+    append = result.append
+    for word in words:
+        if RE_SIGNED_INTEGER.fullmatch(word):
+            append(float(int(word)))
+        elif RE_FLOAT.fullmatch(word):
+            try:
+                append(float(word))
+            except ValueError:  # Fortran exponent like 1d-5
+                return None
+        else:
+            return None
+    return result
+
+
 class ParseError(ValueError):
     """Parsing exception."""
 
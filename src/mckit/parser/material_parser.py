@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+import re
+
 import sly
 
 import mckit.parser.common.utils as cmn
@@ -14,6 +16,12 @@ from mckit.parser.common.utils import drop_comments
 if TYPE_CHECKING:
     from typing import ClassVar
 
+RE_NAME = re.compile(r"m(\d+)", re.IGNORECASE)
+RE_ISOTOPE = re.compile(r"(\d+)(?:\.(\d+[cdepuy]))?", re.IGNORECASE)
+RE_FRACTION = re.compile(r"[-+]?((\d+(\.\d*)?)|(\.\d+))([eE][-+]?\d+)?")
+INTEGER_OPTIONS = {"GAS", "ESTEP", "COND"}
+LIB_OPTIONS = {"NLIB", "PLIB", "PNLIB", "ELIB"}
+
 
 class Lexer(LexerBase):
     tokens: ClassVar = {NAME, FRACTION, OPTION}
@@ -45,21 +53,7 @@ class Parser(sly.Parser):
     tokens = Lexer.tokens
 
     def build_composition(self, name, fractions, options=None) -> Composition:
-        atomic = []
-        weight = []
-
-        for el, fraction in fractions:
-            if fraction < 0.0:
-                weight.append((el, -fraction))
-            else:
-                atomic.append((el, fraction))
-
-        if options is None:
-            options = {}
-
-        options["name"] = name
-
-        return Composition(atomic=atomic, weight=weight, **options)
+        return build_composition(name, fractions, options)
 
     @_("composition_a")
     def composition(self, p):
@@ -116,8 +110,79 @@ class Parser(sly.Parser):
         return option, value
 
 
+def build_composition(name, fractions, options=None) -> Composition:
+    atomic = []
+    weight = []
+
+    for el, fraction in fractions:
+        if fraction < 0.0:
+            weight.append((el, -fraction))
+        else:
+            atomic.append((el, fraction))
+
+    if options is None:
+        options = {}
+
+    options["name"] = name
+
+    return Composition(atomic=atomic, weight=weight, **options)
+
+
+def parse_fast(text: str) -> Composition | None:  # noqa: PLR0911
+    """Parse material card text without comments splitting it to words.
+
+    Args:
+        text: the card text without comments
+
+    Returns:
+        The composition or None, if the text is not in the simple form:
+        mN isotope fraction ... [option value ...]
+    """
+    if "&" in text:
+        return None
+    if "=" in text:
+        text = text.replace("=", " ")
+    words = text.split()
+    if not words:
+        return None
+    match = RE_NAME.fullmatch(words[0])
+    if match is None:
+        return None
+    name = int(match.group(1))
+    fractions = []
+    i, length = 1, len(words)
+    while i + 1 < length:
+        isotope_match = RE_ISOTOPE.fullmatch(words[i])
+        if isotope_match is None or RE_FRACTION.fullmatch(words[i + 1]) is None:
+            break
+        isotope, lib = isotope_match.groups()
+        if lib is not None:
+            lib = cmn.ensure_lower(lib)
+        fractions.append((Element(int(isotope), lib=lib), float(words[i + 1])))
+        i += 2
+    if not fractions:
+        return None
+    options = {}
+    while i + 1 < length:
+        option, value = cmn.ensure_upper(words[i]), words[i + 1]
+        if option in INTEGER_OPTIONS:
+            if not value.isdigit():
+                return None
+            value = int(value)
+        elif option not in LIB_OPTIONS:
+            return None
+        options[option] = value
+        i += 2
+    if i < length:
+        return None
+    return build_composition(name, fractions, options or None)
+
+
 def parse(text) -> Composition:
     text = drop_comments(text)
-    lexer = Lexer()
-    parser = Parser()
-    return parser.parse(lexer.tokenize(text))
+    result = parse_fast(text)
+    if result is None:
+        lexer = Lexer()
+        parser = Parser()
+        result = parser.parse(lexer.tokenize(text))
+    return result
@@ -6,15 +6,20 @@ from __future__ import annotations
 
 from typing import TextIO
 
+import os
+
+from collections import deque
 from collections.abc import Callable, Iterable, Iterator
+from functools import cached_property, partial
 from itertools import repeat
+from multiprocessing import Pool
 from pathlib import Path
 
 from attr import attrib, attrs
 
 from mckit.card import Card
 from mckit.constants import MCNP_ENCODING
-from mckit.parser.cell_parser import Body
+from mckit.parser.cell_parser import Body, scan_referenced_cells
 from mckit.parser.cell_parser import parse as parse_cell
 from mckit.parser.common import (
     CellNotFoundError,
@@ -24,6 +29,11 @@ from mckit.parser.common import (
     SurfaceStrictIndex,
     TransformationStrictIndex,
 )
+from mckit.parser.common.cell_index import raise_on_absent_cell_strategy
+from mckit.parser.common.composition_index import raise_on_absent_composition_strategy
+from mckit.parser.common.surface_index import raise_on_absent_surface_strategy
+from mckit.parser.common.transformation_index import raise_on_absent_transformation_strategy
+from mckit.parser.common.utils import drop_comments
 from mckit.parser.material_parser import Composition
 from mckit.parser.material_parser import parse as parse_composition
 from mckit.parser.surface_parser import Surface
@@ -31,10 +41,12 @@ from mckit.parser.surface_parser import parse as parse_surface
 from mckit.parser.transformation_parser import Transformation
 from mckit.parser.transformation_parser import parse as parse_transformation
 from mckit.universe import Universe, produce_universes
-from mckit.utils.indexes import Index
+from mckit.utils.indexes import Index, LazyIndex
+from mckit.utils.named import Name
 
 from .mcnp_section_parser import Card as TextCard
 from .mcnp_section_parser import InputSections, Kind, distribute_cards, parse_sections_text
+from .snapshot import SNAPSHOTS_ENV, load_snapshot, save_snapshot, snapshot_key, snapshot_path
 
 
 @attrs
@@ -55,19 +67,175 @@ class ParseResult:
         return self.sections.title
 
 
-def from_file(path: str | Path) -> ParseResult:
+class LazyParseResult:
+    """Parse result creating cells, surfaces, compositions and transformations on demand.
+
+    The MCNP text is only split to sections and cards. The cards are indexed by their numbers.
+    An entity is parsed on the first request from the corresponding index. The entities,
+    which it depends on, are requested from the other indexes and are parsed recursively.
+
+    The properties providing lists of entities and the universe parse all the cards of
+    the corresponding kinds.
+    """
+
+    def __init__(self, sections: InputSections):
+        self.sections = sections
+        if sections.data_cards:
+            text_compositions, text_transformations, _1, _2, _3 = distribute_cards(
+                sections.data_cards
+            )
+        else:
+            text_compositions = text_transformations = None
+        self.transformations_index: LazyIndex | None = _make_lazy_index(
+            text_transformations,
+            raise_on_absent_transformation_strategy,
+            partial(_parse_card, expected_kind=Kind.TRANSFORMATION, parser=parse_transformation),
+        )
+        self.compositions_index: LazyIndex | None = _make_lazy_index(
+            text_compositions,
+            raise_on_absent_composition_strategy,
+            partial(_parse_card, expected_kind=Kind.MATERIAL, parser=parse_composition),
+        )
+        transformations = (
+            TransformationStrictIndex()
+            if self.transformations_index is None
+            else self.transformations_index
+        )
+        self.surfaces_index: LazyIndex | None = _make_lazy_index(
+            sections.surface_cards,
+            raise_on_absent_surface_strategy,
+            partial(
+                _parse_card,
+                expected_kind=Kind.SURFACE,
+                parser=partial(parse_surface, transformations=transformations),
+            ),
+        )
+        self.cells_index: LazyIndex | None = _make_lazy_index(
+            sections.cell_cards, raise_on_absent_cell_strategy, self._parse_cell_card
+        )
+
+    def _parse_cell_card(self, text_card: TextCard, comment: str | None) -> Body:
+        card: Body = parse_cell(
+            text_card.text,
+            cells=self.cells_index,
+            surfaces=self.surfaces_index,
+            compositions=self.compositions_index,
+            transformations=self.transformations_index,
+        )
+        if comment:
+            card.options["comment_above"] = comment
+        card.options["original"] = text_card.text
+        return card
+
+    @property
+    def title(self):
+        return self.sections.title
+
+    @cached_property
+    def cells(self) -> list[Body] | None:
+        return _materialize(self.cells_index)
+
+    @cached_property
+    def surfaces(self) -> list[Surface] | None:
+        return _materialize(self.surfaces_index)
+
+    @cached_property
+    def compositions(self) -> list[Composition] | None:
+        return _materialize(self.compositions_index)
+
+    @cached_property
+    def transformations(self) -> list[Transformation] | None:
+        return _materialize(self.transformations_index)
+
+    @cached_property
+    def universe(self) -> Universe:
+        return produce_universes(self.cells)
+
+
+def _make_lazy_index(
+    text_cards: list[TextCard] | None,
+    default_factory: Callable[[int], Card | None],
+    parser: Callable[[TextCard, str | None], Card],
+) -> LazyIndex | None:
+    if text_cards is None:
+        return None
+    sources = {
+        text_card.number: (text_card, comment) for text_card, comment in join_comments(text_cards)
+    }
+    return LazyIndex(sources, lambda source: parser(*source), default_factory)
+
+
+def _materialize(index: LazyIndex | None) -> list[Card] | None:
+    return None if index is None else index.materialize()
+
+
+def from_file_lazy(path: str | Path) -> LazyParseResult:
     if isinstance(path, str):
         path = Path(path)
     with path.open("r", encoding=MCNP_ENCODING) as fid:
-        return from_stream(fid)
+        return from_text_lazy(fid.read())
 
 
-def from_stream(stream: TextIO) -> ParseResult:
-    text = stream.read()
-    return from_text(text)
+def from_text_lazy(text: str) -> LazyParseResult:
+    """Split MCNP model text to cards to parse them on demand.
+
+    Args:
+        text: MCNP model text
+
+    Returns:
+        The lazy parse result.
+    """
+    return LazyParseResult(parse_sections_text(text))
+
 
+def from_file(
+    path: str | Path, workers: int | None = 1, snapshots: str | Path | None = None
+) -> ParseResult:
+    if isinstance(path, str):
+        path = Path(path)
+    with path.open("r", encoding=MCNP_ENCODING) as fid:
+        return from_stream(fid, workers=workers, snapshots=snapshots)
 
-def from_text(text: str) -> ParseResult:
+
+def from_stream(
+    stream: TextIO, workers: int | None = 1, snapshots: str | Path | None = None
+) -> ParseResult:
+    text = stream.read()
+    return from_text(text, workers=workers, snapshots=snapshots)
+
+
+def from_text(
+    text: str, workers: int | None = 1, snapshots: str | Path | None = None
+) -> ParseResult:
+    """Parse MCNP model text.
+
+    Args:
+        text: MCNP model text
+        workers: number of processes to parse compositions and surfaces with,
+                 None - use all the available CPUs, 1 (default) - parse in the current process
+        snapshots: directory to load and save snapshots of parsed models,
+                   if not specified, the environment variable MCKIT_SNAPSHOTS is used,
+                   if neither is set, the snapshots are not used
+
+    Returns:
+        The parsed model.
+    """
+    if snapshots is None:
+        snapshots = os.environ.get(SNAPSHOTS_ENV)
+    if not snapshots:
+        return _parse_text(text, workers)
+    key = snapshot_key(text)
+    path = snapshot_path(snapshots, key)
+    result = load_snapshot(path, key)
+    if result is None:
+        result = _parse_text(text, workers)
+        save_snapshot(result, path, key)
+    return result
+
+
+def _parse_text(text: str, workers: int | None) -> ParseResult:
+    if workers is None:
+        workers = os.cpu_count() or 1
     sections: InputSections = parse_sections_text(text)
     if sections.data_cards:
         # fmt: off
@@ -77,18 +245,24 @@ def from_text(text: str) -> ParseResult:
         # fmt: on
         transformations = parse_transformations(text_transformations)
         transformations_index = TransformationStrictIndex.from_iterable(transformations)
-        compositions = parse_compositions(text_compositions)
-        compositions_index = CompositionStrictIndex.from_iterable(compositions)
     else:
+        text_compositions = None
         transformations = None
         transformations_index = None
-        compositions = None
-        compositions_index = None
 
-    surfaces = (
-        None
-        if sections.surface_cards is None
-        else parse_surfaces(sections.surface_cards, transformations_index)
+    if workers > 1:
+        compositions, surfaces = _parse_compositions_and_surfaces_mp(
+            text_compositions, sections.surface_cards, transformations_index, workers
+        )
+    else:
+        compositions = None if text_compositions is None else parse_compositions(text_compositions)
+        surfaces = (
+            None
+            if sections.surface_cards is None
+            else parse_surfaces(sections.surface_cards, transformations_index)
+        )
+    compositions_index = (
+        None if compositions is None else CompositionStrictIndex.from_iterable(compositions)
     )
     surfaces_index = None if surfaces is None else SurfaceStrictIndex.from_iterable(surfaces)
     cells, cells_index = parse_cells(
@@ -111,6 +285,207 @@ def from_text(text: str) -> ParseResult:
     )
 
 
+def reparse_text(previous: ParseResult, text: str) -> ParseResult:
+    """Parse edited MCNP model text reusing the entities of the previous parse result.
+
+    The cards of the new text are matched with the previous ones by text and the comment above.
+    The entities of the matching cards are reused, if the entities they depend on are reused too.
+    So, only changed cards and their dependents are parsed:
+
+        - surfaces with changed transformation,
+        - cells with changed surfaces, composition or transformations,
+        - cells referring to changed cells with "LIKE n BUT" or "#n".
+
+    The cells with FILL option are always parsed, because their filling universes are
+    defined on producing universes. The universes consisting of the reused cells are copied
+    from the previous result without checks, so the previous result is not changed.
+
+    Args:
+        previous: the result of parsing the previous version of the text
+        text: the new MCNP model text
+
+    Returns:
+        The parse result for the new text.
+    """
+    sections: InputSections = parse_sections_text(text)
+    text_compositions, text_transformations = _distribute_data_cards(sections)
+    previous_compositions, previous_transformations = _distribute_data_cards(previous.sections)
+
+    transformations, changed_transformations = _reuse_or_parse(
+        previous_transformations,
+        previous.transformations,
+        text_transformations,
+        Kind.TRANSFORMATION,
+        parse_transformation,
+    )
+    transformations_index = (
+        None
+        if transformations is None
+        else TransformationStrictIndex.from_iterable(transformations)
+    )
+    compositions, changed_compositions = _reuse_or_parse(
+        previous_compositions,
+        previous.compositions,
+        text_compositions,
+        Kind.MATERIAL,
+        parse_composition,
+    )
+    compositions_index = (
+        None if compositions is None else CompositionStrictIndex.from_iterable(compositions)
+    )
+
+    def can_reuse_surface(text_card: TextCard, _: Surface) -> bool:
+        return extract_surface_transformation(text_card) not in changed_transformations
+
+    surfaces, changed_surfaces = _reuse_or_parse(
+        previous.sections.surface_cards,
+        previous.surfaces,
+        sections.surface_cards,
+        Kind.SURFACE,
+        partial(
+            parse_surface,
+            transformations=TransformationStrictIndex()
+            if transformations_index is None
+            else transformations_index,
+        ),
+        can_reuse=can_reuse_surface,
+    )
+    surfaces_index = None if surfaces is None else SurfaceStrictIndex.from_iterable(surfaces)
+
+    previous_cells = _index_by_card(previous.sections.cell_cards, previous.cells)
+
+    def reuse_cell(
+        text_card: TextCard, comment: str | None, cells_index: CellStrictIndex
+    ) -> Body | None:
+        cell = previous_cells.get((text_card.text, comment))
+        if cell is None or "FILL" in cell.options:
+            return None
+        if changed_transformations and "TRCL" in cell.options:
+            return None
+        if changed_surfaces and any(
+            s.name() in changed_surfaces for s in cell.shape.get_surfaces()
+        ):
+            return None
+        material = cell.material()
+        if material is not None and material.composition.name() in changed_compositions:
+            return None
+        for number in scan_referenced_cells(text_card.text):
+            referred = cells_index.get(number)
+            if referred is None or referred is not previous.cells_index.get(number):
+                return None
+        return cell
+
+    cells, cells_index = parse_cells(
+        sections.cell_cards,
+        surfaces_index,
+        compositions_index,
+        transformations_index,
+        reuse=reuse_cell,
+    )
+    universe = produce_universes(cells, _reusable_universes(previous, cells))
+    return ParseResult(
+        universe=universe,
+        cells=cells,
+        cells_index=cells_index,
+        surfaces=surfaces,
+        surfaces_index=surfaces_index,
+        compositions=compositions,
+        compositions_index=compositions_index,
+        transformations=transformations,
+        transformations_index=transformations_index,
+        sections=sections,
+    )
+
+
+def _group_by_universe(cells: Iterable[Body]) -> dict[Name, list[Body]]:
+    groups: dict[Name, list[Body]] = {}
+    for cell in cells:
+        groups.setdefault(cell.options.get("U", 0), []).append(cell)
+    return groups
+
+
+def _reusable_universes(previous: ParseResult, cells: list[Body]) -> dict[Name, Universe]:
+    """Find the previous universes, which consist of exactly the same cells."""
+    previous_groups = _group_by_universe(previous.cells)
+    previous_universes = {u.name(): u for u in previous.universe.get_universes()}
+    result = {}
+    for name, group in _group_by_universe(cells).items():
+        previous_group = previous_groups.get(name)
+        if (
+            name != 0
+            and name in previous_universes
+            and previous_group is not None
+            and len(group) == len(previous_group)
+            and all(a is b for a, b in zip(group, previous_group, strict=True))
+        ):
+            result[name] = previous_universes[name]
+    return result
+
+
+def _distribute_data_cards(
+    sections: InputSections,
+) -> tuple[list[TextCard] | None, list[TextCard] | None]:
+    if sections.data_cards:
+        text_compositions, text_transformations, _1, _2, _3 = distribute_cards(sections.data_cards)
+        return text_compositions, text_transformations
+    return None, None
+
+
+def _index_by_card(
+    text_cards: list[TextCard] | None, items: list[Card] | None
+) -> dict[tuple[str, str | None], Card]:
+    """Map the cards texts and comments above to the items parsed from them."""
+    if not text_cards or not items:
+        return {}
+    return {
+        (text_card.text, comment): item
+        for (text_card, comment), item in zip(join_comments(text_cards), items, strict=True)
+    }
+
+
+def _reuse_or_parse(
+    previous_cards: list[TextCard] | None,
+    previous_items: list[Card] | None,
+    text_cards: list[TextCard] | None,
+    expected_kind: Kind,
+    parser: Callable[[str], Card],
+    *,
+    can_reuse: Callable[[TextCard, Card], bool] | None = None,
+) -> tuple[list[Card] | None, set[int]]:
+    """Parse the cards reusing previous items for unchanged ones.
+
+    Returns:
+        The items and the names of items, which are not the same as in previous items,
+        including removed ones.
+    """
+    previous = _index_by_card(previous_cards, previous_items)
+    if text_cards is None:
+        items = None
+    else:
+        items = []
+        for text_card, comment in join_comments(text_cards):
+            item = previous.get((text_card.text, comment))
+            if item is None or (can_reuse is not None and not can_reuse(text_card, item)):
+                item = _parse_card(text_card, comment, expected_kind, parser)
+            items.append(item)
+    previous_by_name = {item.name(): item for item in previous.values()}
+    items_by_name = {} if items is None else {item.name(): item for item in items}
+    changed = {
+        name
+        for name in previous_by_name.keys() | items_by_name.keys()
+        if previous_by_name.get(name) is not items_by_name.get(name)
+    }
+    return items, changed
+
+
+def extract_surface_transformation(text_card: TextCard) -> int | None:
+    """Extract transformation number from surface card text without parsing it."""
+    words = drop_comments(text_card.text).split()
+    if 2 < len(words) and words[1].isdigit():  # name, transformation, type, ...
+        return int(words[1])
+    return None
+
+
 def join_comments(text_cards: Iterable[TextCard]):
     def _iter():
         comment: str | None = None
@@ -134,15 +509,92 @@ def parse_section(
     text_cards_with_comments = join_comments(text_cards)
 
     for text_card, comment in text_cards_with_comments:
-        assert text_card.kind is expected_kind
-        try:
-            card = parser(text_card.text)
-        except (ValueError, ParseError) as ex:
-            raise ValueError(f"Failed to parse card '{text_card}'") from ex
-        if comment:
-            card.options["comment_above"] = comment
-        # card.options['original'] = text_card.text
-        yield card
+        yield _parse_card(text_card, comment, expected_kind, parser)
+
+
+def _parse_card(
+    text_card: TextCard, comment: str | None, expected_kind: Kind, parser: Callable[[str], Card]
+) -> Card:
+    assert text_card.kind is expected_kind
+    try:
+        card = parser(text_card.text)
+    except (ValueError, ParseError) as ex:
+        raise ValueError(f"Failed to parse card '{text_card}'") from ex
+    if comment:
+        card.options["comment_above"] = comment
+    # card.options['original'] = text_card.text
+    return card
+
+
+class _ChunkParser:
+    """Picklable parser of a chunk of text cards to run in child processes."""
+
+    def __init__(self, expected_kind: Kind, parser: Callable[[str], Card]):
+        self.expected_kind = expected_kind
+        self.parser = parser
+
+    def __call__(self, chunk: list[tuple[TextCard, str | None]]) -> list[Card]:
+        return [
+            _parse_card(text_card, comment, self.expected_kind, self.parser)
+            for text_card, comment in chunk
+        ]
+
+
+def _split_to_chunks(
+    text_cards: Iterable[TextCard], workers: int
+) -> list[list[tuple[TextCard, str | None]]]:
+    """Split cards to chunks keeping comments together with the following cards.
+
+    Several chunks per worker are created to balance load.
+    """
+    text_cards_with_comments = join_comments(text_cards)
+    size = len(text_cards_with_comments)
+    chunk_size = max(1, -(-size // (4 * workers)))
+    return [text_cards_with_comments[i : i + chunk_size] for i in range(0, size, chunk_size)]
+
+
+def _parse_compositions_and_surfaces_mp(
+    text_compositions: list[TextCard] | None,
+    text_surfaces: list[TextCard] | None,
+    transformations: Index | None,
+    workers: int,
+) -> tuple[list[Composition] | None, list[Surface] | None]:
+    """Parse compositions and surfaces in multiprocessing mode.
+
+    The sections don't depend on each other, so, the chunks of the both
+    are parsed in the same pool simultaneously.
+    The cards order is preserved.
+    """
+    if transformations is None:
+        transformations = TransformationStrictIndex()
+    with Pool(processes=workers) as pool:
+        compositions_chunks = (
+            None
+            if text_compositions is None
+            else pool.map_async(
+                _ChunkParser(Kind.MATERIAL, parse_composition),
+                _split_to_chunks(text_compositions, workers),
+            )
+        )
+        surfaces_chunks = (
+            None
+            if text_surfaces is None
+            else pool.map_async(
+                _ChunkParser(Kind.SURFACE, partial(parse_surface, transformations=transformations)),
+                _split_to_chunks(text_surfaces, workers),
+            )
+        )
+        compositions = (
+            None
+            if compositions_chunks is None
+            else [c for chunk in compositions_chunks.get() for c in chunk]
+        )
+        surfaces = (
+            None
+            if surfaces_chunks is None
+            else [s for chunk in surfaces_chunks.get() for s in chunk]
+        )
+    return compositions, surfaces
 
 
 def parse_transformations(text_cards: Iterable[TextCard]) -> list[Transformation]:
@@ -181,11 +633,29 @@ def parse_cells(
     surfaces: Index,
     compositions: Index,
     transformations: Index,
+    reuse: Callable[[TextCard, str | None, CellStrictIndex], Body | None] | None = None,
 ) -> tuple[list[Body], CellStrictIndex]:
+    """Parse cell cards.
+
+    The cells referring to other cells ("LIKE n BUT" and "#n") are parsed after
+    the referred ones. The order is defined by the references found on scanning the cards texts,
+    so, every cell is parsed only once.
+
+    Args:
+        text_cards: the cell cards
+        surfaces: index of surfaces
+        compositions: index of compositions
+        transformations: index of transformations
+        reuse: optional method to provide already parsed cell for a card and its comment,
+               the cells parsed before are available in the index passed as the last argument,
+               if the method returns None, the card is parsed
+
+    Raises:
+        MissedCellsError: if some cells refer to absent cells or the references are cyclic.
+    """
     text_cards_with_comments = join_comments(text_cards)
     size = len(text_cards_with_comments)
     cells_index = CellStrictIndex()
-    cells_to_process = list(range(size))
     cells = list(repeat(None, size))
 
     def parser(text: str):
@@ -197,29 +667,70 @@ def parse_cells(
             transformations=transformations,
         )
 
-    while cells_to_process:
-        cells_to_process_length = len(cells_to_process)
-        new_cells_to_process = []
-        for i in cells_to_process:
-            text_card, comment = text_cards_with_comments[i]
-            assert text_card.kind is Kind.CELL
-            try:
-                card: Body = parser(text_card.text)
-                assert card is not None, "Failed to process cell " + text_card.text[:70]
-            except CellNotFoundError:
-                new_cells_to_process.append(i)
+    order, missed = order_cells_by_references([t for t, _ in text_cards_with_comments])
+
+    for i in order:
+        text_card, comment = text_cards_with_comments[i]
+        assert text_card.kind is Kind.CELL
+        if reuse is not None:
+            card = reuse(text_card, comment, cells_index)
+            if card is not None:
+                cells[i] = card
+                cells_index[card.name()] = card
                 continue
-            if comment:
-                card.options["comment_above"] = comment
-            card.options["original"] = text_card.text
-            cells[i] = card
-            cells_index[card.name()] = card
-        if cells_to_process_length == len(new_cells_to_process):
-            missed_cells_cards = [text_cards[i] for i in new_cells_to_process]
-            raise MissedCellsError.from_text_cards(missed_cells_cards)
-        cells_to_process = new_cells_to_process
-
-    if any(c is None for c in cells):
-        cells = list(filter(lambda c: c is not None, cells))
+        try:
+            card: Body = parser(text_card.text)
+            assert card is not None, "Failed to process cell " + text_card.text[:70]
+        except CellNotFoundError:
+            # The reference is not recognized on scanning, actually, is not expected.
+            missed.append(i)
+            continue
+        if comment:
+            card.options["comment_above"] = comment
+        card.options["original"] = text_card.text
+        cells[i] = card
+        cells_index[card.name()] = card
+
+    if missed:
+        missed_cells_cards = [text_cards_with_comments[i][0] for i in sorted(missed)]
+        raise MissedCellsError.from_text_cards(missed_cells_cards)
 
     return cells, cells_index
+
+
+def order_cells_by_references(text_cards: list[TextCard]) -> tuple[list[int], list[int]]:
+    """Define order of cells parsing, so that referred cells are parsed before referring ones.
+
+    Args:
+        text_cards: cell cards without comments
+
+    Returns:
+        Indices of cards in topological order and indices of cards,
+        which cannot be parsed because of absent or cyclic references.
+    """
+    size = len(text_cards)
+    index_by_number: dict[int, int] = {}
+    for i, text_card in enumerate(text_cards):
+        index_by_number.setdefault(extract_number(text_card), i)
+    dependents: list[list[int]] = [[] for _ in range(size)]
+    dependencies_count = [0] * size
+    for i, text_card in enumerate(text_cards):
+        for number in scan_referenced_cells(text_card.text):
+            j = index_by_number.get(number)
+            if j is None:
+                dependencies_count[i] = -1  # never will be ready
+                break
+            dependents[j].append(i)
+            dependencies_count[i] += 1
+    ready = deque(i for i in range(size) if dependencies_count[i] == 0)
+    order: list[int] = []
+    while ready:
+        i = ready.popleft()
+        order.append(i)
+        for k in dependents[i]:
+            if 0 < dependencies_count[k]:
+                dependencies_count[k] -= 1
+                if dependencies_count[k] == 0:
+                    ready.append(k)
+    missed = [i for i in range(size) if dependencies_count[i] != 0]
+    return order, missed
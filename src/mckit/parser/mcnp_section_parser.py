@@ -4,12 +4,16 @@ from __future__ import annotations
 
 from typing import TextIO
 
+import mmap
 import re
 import sys
 
 from collections.abc import Iterable, Iterator
 from dataclasses import dataclass, field
 from enum import IntEnum
+from pathlib import Path
+
+from mckit.constants import MCNP_ENCODING
 
 BLANK_LINE_PATTERN = re.compile(r"\n\s*\n", flags=re.MULTILINE)
 COMMENT_LINE_PATTERN = re.compile(r"^\s{,5}[cC]( .*)?\s*$")
@@ -25,6 +29,10 @@ CARD_PATTERN = re.compile(
     flags=re.MULTILINE | re.IGNORECASE,
 )
 
+# the same patterns to split memory mapped files
+BLANK_LINE_PATTERN_BYTES = re.compile(BLANK_LINE_PATTERN.pattern.encode(), flags=re.MULTILINE)
+CARD_PATTERN_BYTES = re.compile(CARD_PATTERN.pattern.encode(), flags=re.MULTILINE | re.IGNORECASE)
+
 # pattern to replace subsequent spaces with a single one
 SPACE_PATTERN = re.compile(r"\s+", flags=re.MULTILINE)
 
@@ -78,6 +86,8 @@ class Card:
 
     text: str
     kind: Kind | None = field(default=None)
+    span: tuple[int, int] | None = field(default=None, compare=False, repr=False)
+    """Start and end byte offsets of the card in a file, if the card is read from memory mapped file."""
 
     # noinspection PyUnusedLocal,PyUnresolvedReferences
     def __post_init__(self) -> None:
@@ -131,7 +141,7 @@ class Card:
         if self.is_surface:
             if name.isdigit():
                 return int(name)
-            assert name[0] in "%*", "Expected reflecting, white surface"
+            assert name[0] in "%*+", "Expected reflecting, white surface"
             return int(name[1:])
         if self.is_material:
             return int(name[1:])
@@ -305,6 +315,119 @@ def parse_sections_text(text: str) -> InputSections:
     return result
 
 
+class MappedInputSections:
+    """Sections of MCNP file splitting the file to cards on demand.
+
+    The file is memory mapped. Only the section boundaries are found on opening.
+    The cards are yielded lazily with their byte offsets in the file, so the memory usage
+    doesn't depend on the file size. The cards are the same as provided by :func:`parse_sections_text`.
+
+    Close the file mapping after use, for example::
+
+        with closing(MappedInputSections(path)) as sections:
+            for card in sections.cell_cards():
+                ...
+    """
+
+    def __init__(self, path: str | Path, encoding: str = MCNP_ENCODING):
+        self.path = Path(path)
+        self.encoding = encoding
+        self.message: str | None = None
+        self.title: str | None = None
+        self.is_continue = False
+        self._cells: tuple[int, int] | None = None
+        self._surfaces: tuple[int, int] | None = None
+        self._data: tuple[int, int] | None = None
+        self._remainder: list[tuple[int, int]] = []
+        with self.path.open("rb") as fid:
+            if self.path.stat().st_size == 0:
+                raise ValueError("Cannot find the MCNP model title")
+            self._map = mmap.mmap(fid.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._split_sections()
+        except Exception:
+            self.close()
+            raise
+
+    def _split_sections(self) -> None:
+        sections: list[tuple[int, int]] = []
+        start = 0
+        for separator in BLANK_LINE_PATTERN_BYTES.finditer(self._map):
+            sections.append((start, separator.start()))
+            start = separator.end()
+            if len(sections) == 5:  # the same as BLANK_LINE_PATTERN.split(text, 5)
+                break
+        sections.append((start, len(self._map)))
+
+        i = 0
+        start, end = sections[0]
+        if self._map[start : start + len("message:")].lower() == b"message:":
+            self.message = self._decode(start, end)
+            i += 1
+
+        start, end = sections[i]
+        title_end = self._map.find(b"\n", start, end)
+        if title_end < 0:
+            raise ValueError("Cannot find the MCNP model title")
+        self.title = self._decode(start, title_end)
+        i += 1
+        if not self.title:
+            raise ValueError("Cannot find the MCNP model title")
+        current = (title_end + 1, end)
+
+        self.is_continue = check_title_is_continue(self.title)
+        if self.is_continue:
+            self._data = current
+        else:
+            self._cells = current
+            if i < len(sections):
+                self._surfaces = sections[i]
+                i += 1
+                if i < len(sections):
+                    self._data = sections[i]
+                    i += 1
+        self._remainder = sections[i:]
+
+    def _decode(self, start: int, end: int) -> str:
+        text = self._map[start:end].decode(self.encoding)
+        if "\r" in text:  # the text ending may precede a line end in file
+            text = text.replace("\r\n", "\n").removesuffix("\r")
+        return text
+
+    def _iter_cards(self, span: tuple[int, int] | None, kind: Kind | None) -> Iterator[Card]:
+        if span is None:
+            return
+        for match in CARD_PATTERN_BYTES.finditer(self._map, *span):
+            start, end = match.span("comment")
+            if start < end:
+                yield self._make_card(start, end, Kind.COMMENT)
+            start, end = match.span("card")
+            if start < end:
+                yield self._make_card(start, end, kind)
+
+    def _make_card(self, start: int, end: int, kind: Kind | None) -> Card:
+        end = start + len(self._map[start:end].rstrip())
+        return Card(self._decode(start, end), kind=kind, span=(start, end))
+
+    def cell_cards(self) -> Iterator[Card]:
+        return self._iter_cards(self._cells, Kind.CELL)
+
+    def surface_cards(self) -> Iterator[Card]:
+        return self._iter_cards(self._surfaces, Kind.SURFACE)
+
+    def data_cards(self) -> Iterator[Card]:
+        return self._iter_cards(self._data, None)
+
+    @property
+    def remainder(self) -> str | None:
+        if not self._remainder:
+            return None
+        return "\n\n".join(self._decode(start, end) for start, end in self._remainder)
+
+    def close(self) -> None:
+        self._map.close()
+
+
 CONTINUE_LEN = len("continue")
 
 
@@ -0,0 +1,362 @@
+"""Binary snapshots of parsed MCNP models.
+
+A snapshot stores :class:`ParseResult` to reuse it instead of parsing the same MCNP text again.
+The snapshots are keyed by hash of the model text and mckit version.
+
+The surfaces, which prevail in MCNP models, are stored as typed arrays of their parameters.
+Their precomputed significant digits are stored as well, so loading doesn't repeat
+neither normalization nor rounding analysis of the surfaces.
+The other objects are pickled.
+
+The snapshot file layout:
+
+    magic | header length (uint32) | JSON header | arrays length (uint64) | npz arrays | pickle
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, BinaryIO
+
+import io
+import json
+import os
+import pickle
+import struct
+
+from dataclasses import dataclass
+from functools import cached_property
+from hashlib import sha256
+from logging import getLogger
+from pathlib import Path
+
+import numpy as np
+
+import mckit.version as meta
+
+from mckit.geometry import Cone as _Cone
+from mckit.geometry import Cylinder as _Cylinder
+from mckit.geometry import GQuadratic as _GQuadratic
+from mckit.geometry import Plane as _Plane
+from mckit.geometry import Sphere as _Sphere
+from mckit.geometry import Torus as _Torus
+from mckit.surface import Cone, Cylinder, GQuadratic, Plane, Sphere, Surface, Torus
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from mckit.parser.mcnp_input_sly_parser import ParseResult
+
+__all__ = ["SNAPSHOTS_ENV", "load_snapshot", "save_snapshot", "snapshot_key", "snapshot_path"]
+
+_LOG = getLogger(__name__)
+
+SNAPSHOTS_ENV = "MCKIT_SNAPSHOTS"
+"""Environment variable to define default directory for snapshots."""
+
+MAGIC = b"MCKITSNP"
+SUFFIX = ".mckit-snapshot"
+_TABLE_ID = "surfaces"
+_HEADER_LENGTH = struct.Struct("<I")
+_ARRAYS_LENGTH = struct.Struct("<Q")
+
+
+@dataclass(frozen=True)
+class _Layout:
+    """Describes how to store a surface type as rows of float and integer arrays.
+
+    Attributes:
+        code: the surface type code in snapshot
+        init: the geometry base class initializer
+        args: the names of `init` arguments
+        floats: the names and shapes of the attributes stored as floats
+        ints: the names and shapes of the attributes stored as integers,
+              the attributes not listed in `args` are assigned on loading
+    """
+
+    code: int
+    init: Callable[..., None]
+    args: tuple[str, ...]
+    floats: tuple[tuple[str, tuple[int, ...]], ...]
+    ints: tuple[tuple[str, tuple[int, ...]], ...]
+
+    @cached_property
+    def float_slices(self) -> tuple[tuple[str, int, int, tuple[int, ...]], ...]:
+        return _slices(self.floats)
+
+    @cached_property
+    def int_slices(self) -> tuple[tuple[str, int, int, tuple[int, ...]], ...]:
+        return _slices(self.ints)
+
+    @cached_property
+    def ints_to_assign(self) -> tuple[str, ...]:
+        return tuple(name for name, _ in self.ints if name not in self.args)
+
+
+def _slices(fields) -> tuple[tuple[str, int, int, tuple[int, ...]], ...]:
+    result = []
+    start = 0
+    for name, shape in fields:
+        end = start + int(np.prod(shape))
+        result.append((name, start, end, shape))
+        start = end
+    return tuple(result)
+
+
+_VECTOR = (3,)
+_SCALAR = ()
+
+_LAYOUTS: dict[type, _Layout] = {
+    Plane: _Layout(
+        0,
+        _Plane.__init__,
+        ("_v", "_k"),
+        (("_v", _VECTOR), ("_k", _SCALAR)),
+        (("_v_digits", _VECTOR), ("_k_digits", _SCALAR)),
+    ),
+    Sphere: _Layout(
+        1,
+        _Sphere.__init__,
+        ("_center", "_radius"),
+        (("_center", _VECTOR), ("_radius", _SCALAR)),
+        (("_center_digits", _VECTOR), ("_radius_digits", _SCALAR)),
+    ),
+    Cylinder: _Layout(
+        2,
+        _Cylinder.__init__,
+        ("_pt", "_axis", "_radius"),
+        (("_pt", _VECTOR), ("_axis", _VECTOR), ("_radius", _SCALAR)),
+        (("_pt_digits", _VECTOR), ("_axis_digits", _VECTOR), ("_radius_digits", _SCALAR)),
+    ),
+    Cone: _Layout(
+        3,
+        _Cone.__init__,
+        ("_apex", "_axis", "_t2", "_sheet"),
+        (("_apex", _VECTOR), ("_axis", _VECTOR), ("_t2", _SCALAR)),
+        (
+            ("_sheet", _SCALAR),
+            ("_apex_digits", _VECTOR),
+            ("_axis_digits", _VECTOR),
+            ("_t2_digits", _SCALAR),
+        ),
+    ),
+    GQuadratic: _Layout(
+        4,
+        _GQuadratic.__init__,
+        ("_m", "_v", "_k", "_factor"),
+        (("_m", (3, 3)), ("_v", _VECTOR), ("_k", _SCALAR), ("_factor", _SCALAR)),
+        (("_m_digits", (3, 3)), ("_v_digits", _VECTOR), ("_k_digits", _SCALAR)),
+    ),
+    Torus: _Layout(
+        5,
+        _Torus.__init__,
+        ("_center", "_axis", "_R", "_a", "_b"),
+        (
+            ("_center", _VECTOR),
+            ("_axis", _VECTOR),
+            ("_R", _SCALAR),
+            ("_a", _SCALAR),
+            ("_b", _SCALAR),
+        ),
+        (
+            ("_center_digits", _VECTOR),
+            ("_axis_digits", _VECTOR),
+            ("_R_digits", _SCALAR),
+            ("_a_digits", _SCALAR),
+            ("_b_digits", _SCALAR),
+        ),
+    ),
+}
+
+_TYPES_BY_CODE: dict[int, type] = {layout.code: cls for cls, layout in _LAYOUTS.items()}
+
+
+def snapshot_key(text: str) -> str:
+    """Compute snapshot key for MCNP model text.
+
+    Args:
+        text: MCNP model text
+
+    Returns:
+        The hexadecimal digest of the text and mckit version.
+    """
+    digest = sha256(meta.__version__.encode())
+    digest.update(text.encode("utf-8", errors="surrogateescape"))
+    return digest.hexdigest()
+
+
+def snapshot_path(directory: str | Path, key: str) -> Path:
+    """Define path to snapshot with the `key` in the `directory`."""
+    return Path(directory) / f"{key}{SUFFIX}"
+
+
+class _SurfaceTableWriter:
+    """Collects surfaces to typed arrays."""
+
+    def __init__(self) -> None:
+        self.indices: dict[int, int] = {}
+        self.surfaces: list[Surface] = []
+
+    def add(self, surface: Surface) -> int:
+        key = id(surface)
+        index = self.indices.get(key)
+        if index is None:
+            index = len(self.surfaces)
+            self.indices[key] = index
+            self.surfaces.append(surface)  # keeps the surface alive to avoid id reuse
+        return index
+
+    def arrays(self) -> dict[str, np.ndarray]:
+        size = len(self.surfaces)
+        codes = np.empty(size, dtype=np.uint8)
+        rows = np.empty(size, dtype=np.int64)
+        floats: dict[int, list[np.ndarray]] = {}
+        ints: dict[int, list[np.ndarray]] = {}
+        for i, surface in enumerate(self.surfaces):
+            layout = _LAYOUTS[type(surface)]
+            code = layout.code
+            codes[i] = code
+            type_floats = floats.setdefault(code, [])
+            rows[i] = len(type_floats)
+            type_floats.append(_collect(surface, layout.floats, np.float64))
+            ints.setdefault(code, []).append(_collect(surface, layout.ints, np.int64))
+        result = {"codes": codes, "rows": rows}
+        for code, values in floats.items():
+            result[f"floats_{code}"] = np.vstack(values)
+            result[f"ints_{code}"] = np.vstack(ints[code])
+        return result
+
+
+def _collect(surface: Surface, fields, dtype) -> np.ndarray:
+    return np.concatenate([np.ravel(getattr(surface, name)) for name, _ in fields]).astype(dtype)
+
+
+class _SurfaceTableReader:
+    """Creates surfaces from typed arrays."""
+
+    def __init__(self, arrays) -> None:
+        self.codes = arrays["codes"].tolist()
+        self.rows = arrays["rows"].tolist()
+        self.floats = {
+            code: arrays[f"floats_{code}"]
+            for code in _TYPES_BY_CODE
+            if f"floats_{code}" in arrays.files
+        }
+        self.ints = {code: arrays[f"ints_{code}"].tolist() for code in self.floats}
+
+    def create(self, index: int, options: dict[str, Any]) -> Surface:
+        code = self.codes[index]
+        row = self.rows[index]
+        cls = _TYPES_BY_CODE[code]
+        layout = _LAYOUTS[cls]
+        values = _extract(self.floats[code][row], layout.float_slices, float)
+        values.update(_extract(self.ints[code][row], layout.int_slices, int))
+        surface = cls.__new__(cls)
+        for name in layout.ints_to_assign:
+            setattr(surface, name, values[name])
+        Surface.__setstate__(surface, options)
+        layout.init(surface, *(values[name] for name in layout.args))
+        return surface
+
+
+def _extract(row, slices, scalar_type) -> dict[str, Any]:
+    result: dict[str, Any] = {}
+    for name, start, end, shape in slices:
+        if shape:
+            result[name] = np.array(row[start:end], dtype=scalar_type).reshape(shape)
+        else:
+            result[name] = scalar_type(row[start])
+    return result
+
+
+def _restore_surface(table: _SurfaceTableReader, index: int, options: dict[str, Any]) -> Surface:
+    return table.create(index, options)
+
+
+class _Pickler(pickle.Pickler):
+    def __init__(self, file: BinaryIO, table: _SurfaceTableWriter) -> None:
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._table = table
+
+    def persistent_id(self, obj: Any) -> str | None:
+        if obj is self._table:
+            return _TABLE_ID
+        return None
+
+    def reducer_override(self, obj: Any) -> Any:
+        if type(obj) in _LAYOUTS:
+            # The surface is memoized by pickler as any reduced object, so, it's created once on loading.
+            # The options are pickled in the stream to preserve identity of transformations.
+            return _restore_surface, (self._table, self._table.add(obj), obj.options)
+        return NotImplemented
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, file: BinaryIO, table: _SurfaceTableReader) -> None:
+        super().__init__(file)
+        self._table = table
+
+    def persistent_load(self, pid: str) -> _SurfaceTableReader:
+        if pid != _TABLE_ID:
+            raise pickle.UnpicklingError(f"Unsupported persistent object {pid}")
+        return self._table
+
+
+def save_snapshot(result: ParseResult, path: str | Path, key: str) -> None:
+    """Save parsed model to a snapshot file.
+
+    The file is written to a temporary file first and then renamed,
+    so, concurrent readers never see partially written snapshot.
+
+    Args:
+        result: the parsed model
+        path: the snapshot file
+        key: the snapshot key, see :func:`snapshot_key`
+    """
+    path = Path(path)
+    table = _SurfaceTableWriter()
+    objects = io.BytesIO()
+    _Pickler(objects, table).dump(result)
+    arrays = io.BytesIO()
+    np.savez(arrays, **table.arrays())
+    header = json.dumps({"version": meta.__version__, "key": key}).encode()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with tmp.open("wb") as fid:
+        fid.write(MAGIC)
+        fid.write(_HEADER_LENGTH.pack(len(header)))
+        fid.write(header)
+        fid.write(_ARRAYS_LENGTH.pack(arrays.getbuffer().nbytes))
+        fid.write(arrays.getbuffer())
+        fid.write(objects.getbuffer())
+    tmp.replace(path)
+
+
+def load_snapshot(path: str | Path, key: str) -> ParseResult | None:
+    """Load parsed model from a snapshot file.
+
+    Args:
+        path: the snapshot file
+        key: the expected snapshot key, see :func:`snapshot_key`
+
+    Returns:
+        The parsed model or None, if the snapshot doesn't exist, has different key,
+        is created with other mckit version or is damaged.
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        with path.open("rb") as fid:
+            if fid.read(len(MAGIC)) != MAGIC:
+                return None
+            (header_length,) = _HEADER_LENGTH.unpack(fid.read(_HEADER_LENGTH.size))
+            header = json.loads(fid.read(header_length))
+            if header.get("version") != meta.__version__ or header.get("key") != key:
+                return None
+            (arrays_length,) = _ARRAYS_LENGTH.unpack(fid.read(_ARRAYS_LENGTH.size))
+            with np.load(io.BytesIO(fid.read(arrays_length)), allow_pickle=False) as arrays:
+                table = _SurfaceTableReader(arrays)
+            return _Unpickler(fid, table).load()
+    except Exception as ex:  # noqa: BLE001 - a damaged snapshot may fail in many ways
+        _LOG.warning("Ignoring damaged snapshot %s: %r", path, ex)
+        return None  # the model is to be parsed again
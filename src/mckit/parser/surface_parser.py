@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+import re
+
 import sly
 
 import mckit.parser.common.utils as pu  # parse utils
@@ -51,6 +53,9 @@ SURFACE_TYPES = {
 }
 
 
+RE_MODIFIER = re.compile(r"\s{,5}(\*|\+)")
+
+
 def intern_surface_type(word: str):
     word = pu.ensure_upper(word)
     word, res = pu.internalize(word, SURFACE_TYPES)
@@ -97,14 +102,9 @@ class Parser(sly.Parser):
     def build_surface(
         self, name: int, kind: str, params: list[float], transform, modifier
     ) -> Surface:
-        options = {"name": name}
-        if transform is not None:
-            transformation = self.transformations[transform]
-            if transformation:
-                options["transform"] = transformation
-        if modifier is not None:
-            options["modifier"] = modifier
-        return create_surface(kind, *params, **options)
+        return build_surface(
+            name, kind, params, transform, modifier, transformations=self.transformations
+        )
 
     @_("MODIFIER  name surface_description")
     def surface(self, p):
@@ -159,16 +159,77 @@ class Parser(sly.Parser):
         return float(p.INTEGER)
 
 
+def build_surface(
+    name: int,
+    kind: str,
+    params: list[float],
+    transform: int | None,
+    modifier: str | None,
+    *,
+    transformations: Index,
+) -> Surface:
+    options = {"name": name}
+    if transform is not None:
+        transformation = transformations[transform]
+        if transformation:
+            options["transform"] = transformation
+    if modifier is not None:
+        options["modifier"] = modifier
+    return create_surface(kind, *params, **options)
+
+
+def parse_fast(text: str, transformations: Index) -> Surface | None:
+    """Parse surface card text without comments splitting it to words.
+
+    Args:
+        text: the card text without comments
+        transformations: index to find transformations
+
+    Returns:
+        The surface or None, if the text is not in the simple form:
+        [modifier]name [transformation] type parameters
+    """
+    match = RE_MODIFIER.match(text)
+    if match is None:
+        modifier = None
+    else:
+        modifier = match.group(1)
+        text = text[match.end() :]
+    words = pu.split_words(text)
+    if len(words) < 3 or not words[0].isdigit():
+        return None
+    name = int(words[0])
+    if words[1].isdigit():
+        transform = int(words[1])
+        kind_index = 2
+    else:
+        transform = None
+        kind_index = 1
+    kind = pu.ensure_upper(words[kind_index])
+    if kind not in SURFACE_TYPES:
+        return None
+    params = pu.convert_floats(words[kind_index + 1 :])
+    if not params:
+        return None
+    kind = intern_surface_type(kind)
+    return build_surface(name, kind, params, transform, modifier, transformations=transformations)
+
+
 def parse(text: str, transformations: Index | None = None) -> Surface:
     if transformations is None:
         transformations = TransformationStrictIndex()
     else:
         assert isinstance(transformations, Index)
     text = drop_c_comments(text)
-    text, comments, trailing_comments = extract_comments(text)
-    lexer = Lexer()
-    parser = Parser(transformations)
-    result = parser.parse(lexer.tokenize(text))
+    if "$" in text:
+        text, comments, trailing_comments = extract_comments(text)
+    else:
+        trailing_comments = None
+    result = parse_fast(text, transformations)
+    if result is None:
+        lexer = Lexer()
+        parser = Parser(transformations)
+        result = parser.parse(lexer.tokenize(text))
     if trailing_comments:
         result.options["comment"] = trailing_comments
     return result
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+import re
+
 import sly
 
 import mckit.parser.common.utils as cmn
@@ -13,6 +15,10 @@ from mckit.transformation import Transformation
 if TYPE_CHECKING:
     from typing import ClassVar
 
+RE_NAME = re.compile(r"(\*)?tr(\d+)", re.IGNORECASE)
+PARAMS_NUMBERS = {3, 6, 8, 12}
+PARAMS_NUMBER_WITH_M = 13
+
 
 # noinspection PyPep8Naming,PyUnboundLocalVariable,PyUnresolvedReferences,SpellCheckingInspection
 class Lexer(LexerBase):
@@ -99,12 +105,58 @@ class Parser(sly.Parser):
         return float(p.INTEGER)
 
 
+def parse_fast(text: str) -> Transformation | None:
+    """Parse transformation card text without comments splitting it to words.
+
+    Args:
+        text: the card text without comments
+
+    Returns:
+        The transformation or None, if the text is not in the simple form:
+        [*]trN translation [rotation [M]]
+    """
+    words = cmn.split_words(text)
+    if not words:
+        return None
+    match = RE_NAME.fullmatch(words[0])
+    if match is None:
+        return None
+    params = words[1:]
+    inverted = False
+    if len(params) == PARAMS_NUMBER_WITH_M:
+        m = params.pop()
+        if cmn.RE_SIGNED_INTEGER.fullmatch(m) is None:
+            return None
+        m = int(m)
+        if m not in {-1, 1}:
+            msg = f"Invalid M option value {m}"
+            raise ValueError(msg)
+        inverted = m == -1
+    elif len(params) not in PARAMS_NUMBERS:
+        return None
+    values = cmn.convert_floats(params)
+    if values is None:
+        return None
+    return Transformation(
+        translation=values[:3],
+        rotation=values[3:] or None,
+        indegrees=match.group(1) is not None,
+        inverted=inverted,
+        name=int(match.group(2)),
+    )
+
+
 def parse(text: str) -> Transformation:
     text = drop_c_comments(text)
-    text, comments, trailing_comments = extract_comments(text)
-    lexer = Lexer()
-    parser = Parser()
-    result: Transformation = parser.parse(lexer.tokenize(text))
+    if "$" in text:
+        text, comments, trailing_comments = extract_comments(text)
+    else:
+        trailing_comments = None
+    result = parse_fast(text)
+    if result is None:
+        lexer = Lexer()
+        parser = Parser()
+        result = parser.parse(lexer.tokenize(text))
     if trailing_comments:
         result.options["comment"] = trailing_comments
     return result
@@ -0,0 +1,299 @@
+"""Exact volumes and bounding boxes of shapes bounded by planes only.
+
+A shape described with planes only is decomposed to disjoint convex polyhedra.
+Each polyhedron is an intersection of half-spaces and its volume and vertices
+are found with half-space intersection and convex hull. An intersection of
+half-spaces is a polyhedron itself and doesn't need the decomposition.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from itertools import product
+
+import numpy as np
+
+from scipy.optimize import linprog
+from scipy.spatial import ConvexHull, HalfspaceIntersection, QhullError
+
+from .surface import BOX, Plane
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+    from .body import Shape
+    from .box import Box
+
+__all__ = ["convex_decomposition", "convex_polyhedron", "polyhedra_bounds", "polyhedra_volume"]
+
+MAX_POLYHEDRA = 256
+"""The maximal number of convex terms and polyhedra to decompose a shape to."""
+
+MAX_FEASIBILITY_CHECKS = 256
+"""The maximal number of linear programs solved to decompose a shape."""
+
+MIN_RADIUS = 1.0e-9
+"""Polyhedra without a ball of this radius inside are considered empty."""
+
+HalfSpace = tuple[Plane, int]
+"""A plane and a sense of the points in the half-space."""
+
+
+class _TooComplexError(ValueError):
+    """The shape has too many convex terms to decompose."""
+
+
+def convex_decomposition(shape: Shape) -> list[npt.NDArray[np.float64]] | None:
+    """Decompose a shape to disjoint convex polyhedra.
+
+    Each piece of the decomposition is checked for emptiness with a linear program,
+    which is much more expensive than the box bisection for the shapes with many terms.
+    The decomposition is abandoned, as soon as the number of the linear programs
+    is known to exceed :data:`MAX_FEASIBILITY_CHECKS`.
+
+    Args:
+        shape: the shape to decompose
+
+    Returns:
+        The half-spaces of the polyhedra or None, if the shape has surfaces other
+        than planes and BOX macrobodies or is too complex. The rows of the arrays
+        are coefficients of inequalities ``a @ x + b <= 0`` in the format
+        of :class:`scipy.spatial.HalfspaceIntersection`.
+    """
+    if not all(isinstance(s, Plane | BOX) for s in shape.get_surfaces()):
+        return None
+    try:
+        terms = _disjoint_terms(_convex_terms(shape), _FeasibilityChecks())
+    except _TooComplexError:
+        return None
+    return [_halfspaces(term) for term in terms]
+
+
+def convex_polyhedron(shape: Shape) -> list[npt.NDArray[np.float64]] | None:
+    """Get the polyhedron of a shape, which is an intersection of half-spaces.
+
+    Unlike :func:`convex_decomposition`, no linear programs are solved,
+    so this is as cheap as the shape structure check.
+
+    Args:
+        shape: the shape to convert
+
+    Returns:
+        The half-spaces of the polyhedron in the format of :func:`convex_decomposition`
+        or None, if the shape is not an intersection of half-spaces of planes and
+        insides of BOX macrobodies.
+    """
+    args = shape.args if shape.opc == "I" else [shape]
+    if not all(a.opc in {"S", "C"} for a in args):
+        return None
+    if not all(isinstance(s, Plane | BOX) for s in shape.get_surfaces()):
+        return None
+    args_terms = [_convex_terms(a) for a in args]
+    if any(len(arg_terms) != 1 for arg_terms in args_terms):
+        return None  # outside of a box is a union
+    term = frozenset().union(*(arg_terms[0] for arg_terms in args_terms))
+    if _has_opposite_half_spaces(term):
+        return []
+    return [_halfspaces(term)]
+
+
+def polyhedra_volume(polyhedra: list[npt.NDArray[np.float64]], box: Box) -> float | None:
+    """Compute volume of disjoint polyhedra inside a box.
+
+    Returns:
+        The volume or None, if a polyhedron is numerically degenerate.
+    """
+    volume = 0.0
+    for points in _vertices(polyhedra, box):
+        if points is None:
+            return None
+        volume += ConvexHull(points).volume
+    return volume
+
+
+def polyhedra_bounds(
+    polyhedra: list[npt.NDArray[np.float64]], box: Box
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]] | None:
+    """Find bounds of disjoint polyhedra inside a box along the box axes.
+
+    Returns:
+        Minimal and maximal coordinates of the polyhedra vertices in the box basis
+        with respect to the box center or None, if the polyhedra are empty or
+        numerically degenerate.
+    """
+    basis = np.array([box.ex, box.ey, box.ez])
+    lower = np.full(3, np.inf)
+    upper = np.full(3, -np.inf)
+    for points in _vertices(polyhedra, box):
+        if points is None:
+            return None
+        coordinates = (points - box.center) @ basis.T
+        np.minimum(lower, coordinates.min(axis=0), out=lower)
+        np.maximum(upper, coordinates.max(axis=0), out=upper)
+    if np.any(lower > upper):
+        return None
+    return lower, upper
+
+
+def _convex_terms(shape: Shape) -> list[frozenset[HalfSpace]]:
+    """Convert shape to union of intersections of half-spaces."""
+    opc = shape.opc
+    if opc in {"S", "C"}:
+        surface = shape.args[0]
+        sense = 1 if opc == "S" else -1
+        if isinstance(surface, BOX):
+            planes = surface.surfaces
+            if sense > 0:  # outside of the box
+                return [frozenset([(p, 1)]) for p in planes]
+            return [frozenset((p, -1) for p in planes)]
+        return [frozenset([(surface, sense)])]
+    if opc == "E":
+        return []
+    if opc == "R":
+        return [frozenset()]
+    args_terms = [_convex_terms(a) for a in shape.args]
+    if opc == "U":
+        terms = [t for arg_terms in args_terms for t in arg_terms]
+    else:
+        size = 1
+        for arg_terms in args_terms:
+            size *= len(arg_terms)
+        if size > MAX_POLYHEDRA:
+            raise _TooComplexError
+        terms = [frozenset().union(*combination) for combination in product(*args_terms)]
+        terms = [t for t in terms if not _has_opposite_half_spaces(t)]
+    if len(terms) > MAX_POLYHEDRA:
+        raise _TooComplexError
+    return terms
+
+
+def _has_opposite_half_spaces(term: frozenset[HalfSpace]) -> bool:
+    return any((plane, -sense) in term for plane, sense in term)
+
+
+class _FeasibilityChecks:
+    """Feasibility checks of convex terms limited in number."""
+
+    def __init__(self) -> None:
+        self.left = MAX_FEASIBILITY_CHECKS
+
+    def reserve(self, count: int) -> None:
+        """Fail in advance, if the checks are known to exceed the limit."""
+        if count > self.left:
+            raise _TooComplexError
+
+    def __call__(self, term: frozenset[HalfSpace]) -> bool:
+        if not term:
+            return True
+        self.reserve(1)
+        self.left -= 1
+        center = _chebyshev_center(_halfspaces(term))
+        return center is not None and center[1] > MIN_RADIUS
+
+
+def _disjoint_terms(
+    terms: list[frozenset[HalfSpace]], is_feasible: _FeasibilityChecks
+) -> list[frozenset[HalfSpace]]:
+    """Subtract preceding terms from each term to make the results disjoint.
+
+    Every term is checked, and subtracting an overlapping term from a nonempty one takes
+    a check at least, so, the number of checks is estimated before running them.
+    """
+    is_feasible.reserve(len(terms) + _overlapping_pairs(terms))
+    result: list[frozenset[HalfSpace]] = []
+    for i, term in enumerate(terms):
+        if not is_feasible(term):
+            continue
+        rest = [term]
+        for other in terms[:i]:
+            rest = [piece for r in rest for piece in _subtract(r, other, is_feasible)]
+            if len(result) + len(rest) > MAX_POLYHEDRA:
+                raise _TooComplexError
+        result.extend(rest)
+    return result
+
+
+def _overlapping_pairs(terms: list[frozenset[HalfSpace]]) -> int:
+    """Count pairs of terms, which are neither separated by a plane nor contain one another."""
+    return sum(
+        not _are_separated(term, other) and not other <= term
+        for i, term in enumerate(terms)
+        for other in terms[:i]
+    )
+
+
+def _are_separated(term: frozenset[HalfSpace], other: frozenset[HalfSpace]) -> bool:
+    return any((plane, -sense) in term for plane, sense in other)
+
+
+def _subtract(
+    term: frozenset[HalfSpace],
+    other: frozenset[HalfSpace],
+    is_feasible: _FeasibilityChecks,
+) -> list[frozenset[HalfSpace]]:
+    """Split difference of the convex terms to disjoint convex terms."""
+    if _are_separated(term, other):
+        return [term]  # the terms don't intersect
+    result = []
+    common: frozenset[HalfSpace] = frozenset()
+    for plane, sense in other:
+        if (plane, sense) in term:
+            continue
+        piece = term | common | {(plane, -sense)}
+        if is_feasible(piece):
+            result.append(piece)
+        common |= {(plane, sense)}
+    return result
+
+
+def _halfspaces(term: frozenset[HalfSpace]) -> npt.NDArray[np.float64]:
+    """Rows of inequalities ``a @ x + b <= 0`` for the half-spaces."""
+    rows = np.array([[*plane._v, plane._k] for plane, _ in term]).reshape(-1, 4)
+    senses = np.array([sense for _, sense in term], dtype=float)
+    return rows * -senses[:, np.newaxis]
+
+
+def _box_halfspaces(box: Box) -> npt.NDArray[np.float64]:
+    rows = np.empty((6, 4))
+    for i, (axis, half_width) in enumerate(
+        zip((box.ex, box.ey, box.ez), 0.5 * box.dimensions, strict=True)
+    ):
+        offset = np.dot(axis, box.center)
+        rows[2 * i, :3] = axis
+        rows[2 * i, 3] = -offset - half_width
+        rows[2 * i + 1, :3] = -axis
+        rows[2 * i + 1, 3] = offset - half_width
+    return rows
+
+
+def _chebyshev_center(
+    halfspaces: npt.NDArray[np.float64],
+) -> tuple[npt.NDArray[np.float64], float] | None:
+    """Find the center and radius of the largest ball inside the half-spaces.
+
+    The radius is limited with 1, so, unbounded half-spaces are not a problem.
+    """
+    normals = halfspaces[:, :3]
+    norms = np.linalg.norm(normals, axis=1)
+    a_ub = np.hstack((normals, norms[:, np.newaxis]))
+    c = np.array([0.0, 0.0, 0.0, -1.0])
+    bounds = [(None, None)] * 3 + [(0.0, 1.0)]
+    solution = linprog(c, A_ub=a_ub, b_ub=-halfspaces[:, 3], bounds=bounds, method="highs")
+    if not solution.success:
+        return None
+    return solution.x[:3], solution.x[3]
+
+
+def _vertices(polyhedra: list[npt.NDArray[np.float64]], box: Box):
+    """Yield vertices of nonempty polyhedra inside the box or None for degenerate ones."""
+    box_halfspaces = _box_halfspaces(box)
+    for polyhedron in polyhedra:
+        halfspaces = np.vstack((polyhedron, box_halfspaces))
+        center = _chebyshev_center(halfspaces)
+        if center is None or center[1] <= MIN_RADIUS:
+            continue
+        try:
+            yield HalfspaceIntersection(halfspaces, center[0]).intersections
+        except QhullError:
+            yield None
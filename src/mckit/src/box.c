@@ -11,18 +11,6 @@ char enable_box_cache = 0;
 static double perm[NCOR][NDIM] = {{-1, -1, -1}, {-1, -1, 1}, {-1, 1, -1}, {-1, 1, 1},
                                   {1, -1, -1},  {1, -1, 1},  {1, 1, -1},  {1, 1, 1}};
 
-// Finds the highest set bit.
-static inline char high_bit(uint64_t value)
-{
-    char result = 0;
-    while (value != 0)
-    {
-        value >>= 1;
-        ++result;
-    }
-    return result;
-}
-
 int box_init(Box *box, const double *center, const double *ex, const double *ey, const double *ez, double xdim,
              double ydim, double zdim)
 {
@@ -72,8 +60,15 @@ int box_init(Box *box, const double *center, const double *ex, const double *ey,
         }
     }
 
+    box->axis_aligned = 1;
+    for (i = 0; i < NDIM; ++i)
+    {
+        if (box->ex[i] != (i == 0) || box->ey[i] != (i == 1) || box->ez[i] != (i == 2))
+            box->axis_aligned = 0;
+    }
+
     box->rng = NULL;
-    box->subdiv = 1; // Means that it is the most outer box for now.
+    box_path_init(&box->subdiv); // Means that it is the most outer box for now.
 
     return BOX_SUCCESS;
 }
@@ -161,11 +156,6 @@ int box_split(const Box *box, Box *box1, Box *box2, int dir, double ratio)
     cblas_daxpy(NDIM, -0.5 * dims2[dir], basis[dir], 1, center1, 1);
     cblas_daxpy(NDIM, 0.5 * dims1[dir], basis[dir], 1, center2, 1);
 
-    // subdivision index.
-    char hb = high_bit(box->subdiv);
-    uint64_t ones = ~0;
-    uint64_t mask = (ones) >> (BIT_LEN - 1) << (hb - 1);
-    uint64_t start_bit = mask << 1;
     // create new boxes.
     int status;
     status = box_init(box1, center1, box->ex, box->ey, box->ez, dims1[0], dims1[1], dims1[2]);
@@ -176,15 +166,20 @@ int box_split(const Box *box, Box *box1, Box *box2, int dir, double ratio)
     if (status == BOX_FAILURE)
         return BOX_FAILURE;
 
-    if (box->subdiv & HIGHEST_BIT)
+    // subdivision path.
+    int depth = box->subdiv.depth;
+    box1->subdiv = box->subdiv;
+    box2->subdiv = box->subdiv;
+    if (depth < BOX_PATH_MAX_DEPTH)
     {
-        box1->subdiv = box->subdiv;
-        box2->subdiv = box->subdiv;
+        uint64_t bit = 1ull << depth % BIT_LEN;
+        box1->subdiv.bits[depth / BIT_LEN] &= ~bit;
+        box2->subdiv.bits[depth / BIT_LEN] |= bit;
+        box1->subdiv.depth = box2->subdiv.depth = depth + 1;
     }
     else
     {
-        box1->subdiv = box->subdiv & (~mask) | start_bit;
-        box2->subdiv = box->subdiv | start_bit;
+        box1->subdiv.depth = box2->subdiv.depth = BOX_PATH_MAX_DEPTH + 1;
     }
 
     return BOX_SUCCESS;
@@ -254,24 +249,90 @@ int box_check_intersection(const Box *box1, const Box *box2)
     return result;
 }
 
-int box_is_in(const Box *in_box, uint64_t out_subdiv)
+void box_path_init(BoxPath *path)
 {
-    uint64_t out = out_subdiv;
-    uint64_t in = in_box->subdiv;
-
-    if (out == in)
-        return 0;
+    for (int i = 0; i < BOX_PATH_WORDS; ++i)
+        path->bits[i] = 0;
+    path->depth = 0;
+}
 
-    uint64_t mask = ~0;
-    char out_stop = high_bit(out);
+int box_is_in(const Box *in_box, const BoxPath *out_subdiv)
+{
+    const BoxPath *out = out_subdiv;
+    const BoxPath *in = &in_box->subdiv;
 
-    mask >>= BIT_LEN + 1 - out_stop;
+    if (!box_path_is_known(out) || !box_path_is_known(in))
+        return -1;
 
-    if ((in & (~mask)) == 0)
+    if (in->depth < out->depth)
         return -1; // inner box actually is bigger one.
 
-    if (((out ^ in) & mask) == 0)
-        return +1;
+    int words = out->depth / BIT_LEN;
+    for (int i = 0; i < words; ++i)
+    {
+        if (out->bits[i] != in->bits[i])
+            return -1;
+    }
+
+    int rest = out->depth % BIT_LEN;
+    if (rest > 0)
+    {
+        uint64_t mask = ~0ull >> (BIT_LEN - rest);
+        if (((out->bits[words] ^ in->bits[words]) & mask) != 0)
+            return -1;
+    }
 
-    return -1;
+    return in->depth == out->depth ? 0 : +1;
+}
+
+void box_cache_init(BoxCache *cache)
+{
+    for (int i = 0; i < BOX_CACHE_SIZE; ++i)
+        cache->entries[i].volume = 0;
+    cache->hits = 0;
+    cache->misses = 0;
+}
+
+int box_cache_lookup(BoxCache *cache, const Box *box)
+{
+    if (!box->axis_aligned)
+        return 0;
+    for (int i = 0; i < BOX_CACHE_SIZE; ++i)
+    {
+        const BoxCacheEntry *entry = cache->entries + i;
+        if (entry->volume == 0)
+            continue;
+        int j;
+        for (j = 0; j < NDIM; ++j)
+        {
+            if (box->lb[j] < entry->lb[j] || entry->ub[j] < box->ub[j])
+                break;
+        }
+        if (j == NDIM)
+        {
+            ++cache->hits;
+            return entry->result;
+        }
+    }
+    ++cache->misses;
+    return 0;
+}
+
+void box_cache_store(BoxCache *cache, const Box *box, int result)
+{
+    if (!box->axis_aligned || result == 0)
+        return;
+    BoxCacheEntry *entry = cache->entries;
+    for (int i = 1; i < BOX_CACHE_SIZE; ++i)
+    {
+        if (cache->entries[i].volume < entry->volume)
+            entry = cache->entries + i;
+    }
+    for (int j = 0; j < NDIM; ++j)
+    {
+        entry->lb[j] = box->lb[j];
+        entry->ub[j] = box->ub[j];
+    }
+    entry->volume = box->volume;
+    entry->result = result;
 }
@@ -15,12 +15,26 @@
 #define BOX_SPLIT_AUTODIR (-1)
 
 #define BIT_LEN 64
-#define HIGHEST_BIT (1ull << BIT_LEN - 1)
+#define BOX_PATH_WORDS 4
+#define BOX_PATH_MAX_DEPTH (BOX_PATH_WORDS * BIT_LEN)
+#define BOX_PATH_NONE (-1)
 
 #include "mkl_vsl.h"
 
+typedef struct BoxPath BoxPath;
 typedef struct Box Box;
 
+/// Location of a box in the tree of subdivisions of the most outer box.
+///
+/// The boxes deeper than BOX_PATH_MAX_DEPTH are not identified: all of them
+/// have depth BOX_PATH_MAX_DEPTH + 1. 256 subdivisions are more than enough to
+/// reach the precision of double values in all the three dimensions.
+struct BoxPath
+{
+    uint64_t bits[BOX_PATH_WORDS]; ///< bit k is set if the box is in the second half at k-th subdivision
+    int depth;                     ///< the number of subdivisions, BOX_PATH_NONE means no box
+};
+
 struct Box
 {
     double center[NDIM];         // center of the box
@@ -32,10 +46,37 @@ struct Box
     double ub[NDIM];             // upper bounds
     double corners[NCOR * NDIM]; // corners
     double volume;               // volume
-    uint64_t subdiv;             // Box location. The most outer (parent) box
+    BoxPath subdiv;              // Box location. The most outer (parent) box has depth 0.
+    char axis_aligned;           // The box edges are parallel to the coordinate axes.
     VSLStreamStatePtr rng;       // Random generator. Allocated when it is needed.
 };
 
+#define BOX_CACHE_SIZE 8
+
+typedef struct BoxCacheEntry BoxCacheEntry;
+typedef struct BoxCache BoxCache;
+
+/// Axis aligned box with known nonzero test_box result.
+struct BoxCacheEntry
+{
+    double lb[NDIM]; ///< lower bounds
+    double ub[NDIM]; ///< upper bounds
+    double volume;   ///< volume of the box, 0 marks empty entry
+    int result;      ///< test_box result
+};
+
+/// Cache of nonzero test_box results for several boxes.
+///
+/// Unlike subdivision codes, the box bounds identify a box between test_box calls and
+/// cache resets. A nonzero result is valid for any box inside the stored one.
+/// When the cache is full, the smallest box is replaced.
+struct BoxCache
+{
+    BoxCacheEntry entries[BOX_CACHE_SIZE];
+    uint64_t hits;   ///< the number of lookups answered by the cache
+    uint64_t misses; ///< the number of lookups not answered
+};
+
 extern char enable_box_cache;
 
 /// Initializes box structure.
@@ -105,21 +146,51 @@ int box_check_intersection(const Box *box1, const Box *box2);
 /**
  * Compare two boxes.
  *
- * subdiv denotes subdivision. It is 64 bit integer value. The elder bit marks
- * the number of subdivision generations. 0 means first half of the box, 1 -
- * second half.
+ * subdiv denotes subdivision. It is the path from the most outer box: the number
+ * of subdivision generations and the bits for each generation. 0 means first half
+ * of the box, 1 - second half.
  *
  *
  * @param in_box
- * @param out_subdiv the code of subdivisions of outer box. The box struct
+ * @param out_subdiv the path of subdivisions of outer box. The box struct
  * itself is not used because box itself may not exist when check is needed
  * (because of cache purposes).
  *
  * @return     +1 if in_box lies actually inside the out_box;
  *              0 if in_box equals out_box;
- *             -1 if in_box lies outside of the out_box;
+ *             -1 if in_box lies outside of the out_box or any of the boxes is not identified.
  *
  */
-int box_is_in(const Box *in_box, uint64_t out_subdiv);
+int box_is_in(const Box *in_box, const BoxPath *out_subdiv);
+
+/// Sets the path to the most outer box.
+void box_path_init(BoxPath *path);
+
+/// Marks the path as not denoting any box.
+static inline void box_path_reset(BoxPath *path)
+{
+    path->depth = BOX_PATH_NONE;
+}
+
+/// Checks if the path identifies a box, that is it's set and is not too deep.
+static inline int box_path_is_known(const BoxPath *path)
+{
+    return 0 <= path->depth && path->depth <= BOX_PATH_MAX_DEPTH;
+}
+
+/// Clears cache entries and hit/miss counters.
+void box_cache_init(BoxCache *cache);
+
+/**
+ * Finds a cached result for the box.
+ *
+ * @param cache
+ * @param box the box to test, only axis aligned boxes are looked up
+ * @return the result cached for a box containing the `box` or 0, if there's no such box.
+ */
+int box_cache_lookup(BoxCache *cache, const Box *box);
+
+/// Stores nonzero result of test_box for axis aligned box.
+void box_cache_store(BoxCache *cache, const Box *box, int result);
 
 #endif
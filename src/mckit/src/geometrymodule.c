@@ -492,14 +492,26 @@ static PyObject *surfobj_test_box(SurfaceObject *self, PyObject *box)
         return NULL;
     }
 
-    self->surf.last_box = 0;
+    box_path_reset(&self->surf.last_box);
     int result = surface_test_box(&self->surf, &((BoxObject *)box)->box);
 
     return Py_BuildValue("i", result);
 }
 
+static PyObject *box_cache_stat(const BoxCache *cache)
+{
+    return Py_BuildValue("KK", (unsigned long long)cache->hits, (unsigned long long)cache->misses);
+}
+
+static PyObject *surfobj_box_cache_stat(SurfaceObject *self, PyObject *Py_UNUSED(ignored))
+{
+    return box_cache_stat(&self->surf.box_cache);
+}
+
 static PyMethodDef surfobj_methods[] = {{"test_box", (PyCFunction)surfobj_test_box, METH_O, SURF_TEST_BOX_DOC},
                                         {"test_points", (PyCFunction)surfobj_test_points, METH_O, SURF_TEST_POINTS_DOC},
+                                        {"box_cache_stat", (PyCFunction)surfobj_box_cache_stat, METH_NOARGS,
+                                         BOX_CACHE_STAT_DOC},
                                         {NULL}};
 
 static int planeobj_init(PlaneObject *self, PyObject *args, PyObject *kwds)
@@ -1002,6 +1014,7 @@ static PyObject *shapeobj_bounding_box(ShapeObject *self, PyObject *args, PyObje
 static PyObject *shapeobj_volume(ShapeObject *self, PyObject *args, PyObject *kwds);
 static PyObject *shapeobj_collect_statistics(ShapeObject *self, PyObject *args);
 static PyObject *shapeobj_get_stat_table(ShapeObject *self);
+static PyObject *shapeobj_box_cache_stat(ShapeObject *self, PyObject *Py_UNUSED(ignored));
 static void shapeobj_dealloc(ShapeObject *self);
 
 static char *opcodes[] = {"I", "C", "E", "U", "S", "R"};
@@ -1054,6 +1067,7 @@ static PyMethodDef shapeobj_methods[] = {
     {"bounding_box", (PyCFunctionWithKeywords)shapeobj_bounding_box, METH_VARARGS | METH_KEYWORDS, ""},
     {"collect_statistics", (PyCFunction)shapeobj_collect_statistics, METH_VARARGS, ""},
     {"get_stat_table", (PyCFunction)shapeobj_get_stat_table, METH_NOARGS, ""},
+    {"box_cache_stat", (PyCFunction)shapeobj_box_cache_stat, METH_NOARGS, BOX_CACHE_STAT_DOC},
     {"test_points", (PyCFunction)shapeobj_test_points, METH_O,
      "Tests senses of the points with respect to the surface."},
     {NULL}};
@@ -1385,6 +1399,11 @@ static PyObject *shapeobj_collect_statistics(ShapeObject *self, PyObject *args)
     Py_RETURN_NONE;
 }
 
+static PyObject *shapeobj_box_cache_stat(ShapeObject *self, PyObject *Py_UNUSED(ignored))
+{
+    return box_cache_stat(&self->shape.box_cache);
+}
+
 static PyObject *shapeobj_get_stat_table(ShapeObject *self)
 {
     size_t nrows = 0, ncols = 0;
@@ -4,6 +4,7 @@
 
 #include "shape.h"
 #include "surface.h"
+#include <math.h>
 #include <stdlib.h>
 
 #define is_final(opc) (opc == COMPLEMENT || opc == IDENTITY)
@@ -53,8 +54,9 @@ int shape_init(Shape *shape, char opc, size_t alen, const void *args)
     shape->opc = opc;
     shape->alen = alen;
     shape->stats = rbtree_create(stat_compare);
-    shape->last_box = 0;
+    box_path_reset(&shape->last_box);
     shape->last_box_result = 0;
+    box_cache_init(&shape->box_cache);
     if (is_final(opc))
     {
         shape->args.surface = (Surface *)args;
@@ -105,9 +107,9 @@ void shape_dealloc(Shape *shape)
  */
 int shape_test_box(Shape *shape, const Box *box, char collect, int *zero_surfaces)
 {
-    if (shape->last_box != 0)
+    if (box_path_is_known(&shape->last_box))
     {
-        int bc = box_is_in(box, shape->last_box);
+        int bc = box_is_in(box, &shape->last_box);
         // if it is the box already tested (bc == 0) then returns cached result;
         // if it is inner box - then returns cached result only if it is not 0.
         // For inner box result may be different.
@@ -124,11 +126,28 @@ int shape_test_box(Shape *shape, const Box *box, char collect, int *zero_surface
             return shape->last_box_result;
     }
 
+    // The results cached by boxes bounds are used only if statistics is not collected:
+    // skipping tests of subshapes would change the statistics.
+    char use_box_cache = (collect == 0 && is_composite(shape->opc));
+    if (use_box_cache)
+    {
+        int cached = box_cache_lookup(&shape->box_cache, box);
+        if (cached != 0)
+        {
+            if (box_path_is_known(&box->subdiv))
+            {
+                shape->last_box = box->subdiv;
+                shape->last_box_result = cached;
+            }
+            return cached;
+        }
+    }
+
     int result;
 
     if (is_final(shape->opc))
     {
-        char already = (box->subdiv == (shape->args.surface)->last_box);
+        char already = (box_is_in(box, &(shape->args.surface)->last_box) == 0);
 
         result = surface_test_box(shape->args.surface, box);
 
@@ -182,19 +201,21 @@ int shape_test_box(Shape *shape, const Box *box, char collect, int *zero_surface
             free(sub);
     }
     // Cache test result;
-    if (collect >= 0 && !(box->subdiv & HIGHEST_BIT))
+    if (collect >= 0 && box_path_is_known(&box->subdiv))
     {
         shape->last_box = box->subdiv;
         shape->last_box_result = result;
     }
+    if (use_box_cache)
+        box_cache_store(&shape->box_cache, box, result);
     return result;
 }
 
-int set_zero_surface_pointers(Shape *shape, int n, Surface **zs, uint64_t subdiv)
+int set_zero_surface_pointers(Shape *shape, int n, Surface **zs, const Box *box)
 {
     if (is_final(shape->opc))
     {
-        if (shape->args.surface->last_box == subdiv && shape->args.surface->last_box_result == 0)
+        if (box_is_in(box, &shape->args.surface->last_box) == 0 && shape->args.surface->last_box_result == 0)
         {
             char already = 0;
             for (int i = 0; i < n; ++i)
@@ -213,12 +234,61 @@ int set_zero_surface_pointers(Shape *shape, int n, Surface **zs, uint64_t subdiv
     {
         for (int i = 0; i < shape->alen; ++i)
         {
-            n = set_zero_surface_pointers(shape->args.shapes[i], n, zs, subdiv);
+            n = set_zero_surface_pointers(shape->args.shapes[i], n, zs, box);
         }
     }
     return n;
 }
 
+/**
+ * Finds the split position suggested by undecided surfaces of the shape.
+ *
+ * The shape and the surfaces are undecided if the cached result of the last test is 0 for the box.
+ * Among several positions the one closest to the middle of the box is chosen.
+ *
+ * @param shape Shape tested against the box.
+ * @param box Box to be split.
+ * @param dir INOUT: the best splitting direction.
+ * @param ratio INOUT: the best splitting ratio.
+ */
+static void find_split_position(const Shape *shape, const Box *box, int *dir, double *ratio)
+{
+    if (box_is_in(box, &shape->last_box) != 0 || shape->last_box_result != BOX_CAN_INTERSECT_SHAPE)
+        return;
+    if (is_final(shape->opc))
+    {
+        int d;
+        double r;
+        if (surface_split_position(shape->args.surface, box, &d, &r) &&
+            (*dir == BOX_SPLIT_AUTODIR || fabs(r - 0.5) < fabs(*ratio - 0.5)))
+        {
+            *dir = d;
+            *ratio = r;
+        }
+    }
+    else if (is_composite(shape->opc))
+    {
+        for (int i = 0; i < shape->alen; ++i)
+            find_split_position(shape->args.shapes[i], box, dir, ratio);
+    }
+}
+
+/**
+ * Chooses the direction and the ratio to split the box, that intersects the shape.
+ *
+ * The box is split at a plane crossing it, if any, because this decides the plane
+ * for both of the parts. If there's no such plane, the box is halved along its
+ * longest dimension.
+ *
+ * The function relies on the results cached by the preceding shape_test_box call for the box.
+ */
+static void shape_choose_split(const Shape *shape, const Box *box, int *dir, double *ratio)
+{
+    *dir = BOX_SPLIT_AUTODIR;
+    *ratio = 0.5;
+    find_split_position(shape, box, dir, ratio);
+}
+
 // Tests box location with respect to the shape. It tries to find out
 // if the box really intersects the shape with desired accuracy.
 // Returns BOX_INSIDE_SHAPE | BOX_CAN_INTERSECT_SHAPE | BOX_OUTSIDE_SHAPE
@@ -246,7 +316,7 @@ int shape_ultimate_test_box(Shape *shape,   // Pointer to shape
             for (int i = 0; i < zero_surfaces; ++i)
                 zs[i] = NULL;
 
-            int k = set_zero_surface_pointers(shape, 0, zs, box->subdiv);
+            int k = set_zero_surface_pointers(shape, 0, zs, box);
             int n = 1 << zero_surfaces;
             for (int i = 0; i < n; ++i)
             {
@@ -263,12 +333,22 @@ int shape_ultimate_test_box(Shape *shape,   // Pointer to shape
     if (result == BOX_CAN_INTERSECT_SHAPE && box->volume > min_vol)
     {
         Box box1, box2;
-        box_split(box, &box1, &box2, BOX_SPLIT_AUTODIR, 0.5);
+        int dir = BOX_SPLIT_AUTODIR;
+        double ratio = 0.5;
+        // The statistics are collected from the smallest boxes at the surfaces intersections.
+        // Their location is not changed.
+        if (collect == 0)
+            shape_choose_split(shape, box, &dir, &ratio);
+        box_split(box, &box1, &box2, dir, ratio);
         int result1 = shape_ultimate_test_box(shape, &box1, min_vol, collect);
+        // Undecided part makes the result undecided. The other part is still tested for the statistics.
+        if (result1 == BOX_CAN_INTERSECT_SHAPE && collect == 0)
+            return result;
         int result2 = shape_ultimate_test_box(shape, &box2, min_vol, collect);
-        if (result1 != BOX_CAN_INTERSECT_SHAPE && result2 != BOX_CAN_INTERSECT_SHAPE)
-            return result1; // No matter what value (result1 or result2) is
-                            // returned because they will be equal.
+        // The parts may lie on the different sides of the shape boundary,
+        // if the box is split at a surface.
+        if (result1 != BOX_CAN_INTERSECT_SHAPE && result1 == result2)
+            return result1;
     }
     return result;
 }
@@ -318,9 +398,89 @@ int shape_test_points(const Shape *shape,   // test shape
     return SHAPE_SUCCESS;
 }
 
+/**
+    Find conservative bounds of the shape along the box axes.
+
+    The bounds of surfaces are narrowed by intersections and widened by unions.
+
+    @param shape Shape to bound
+    @param box Box, which axes and center define the coordinates
+    @param lower OUT: lower bounds of coordinates with respect to the box center
+    @param upper OUT: upper bounds of coordinates with respect to the box center
+ */
+static void shape_bounds(const Shape *shape, const Box *box, double *lower, double *upper)
+{
+    int dim;
+    if (is_final(shape->opc))
+    {
+        surface_bounds(shape->args.surface, shape->opc == COMPLEMENT ? -1 : +1, box, lower, upper);
+        return;
+    }
+    char is_union = (shape->opc == UNION || shape->opc == EMPTY);
+    for (dim = 0; dim < NDIM; ++dim)
+    {
+        lower[dim] = is_union ? INFINITY : -INFINITY;
+        upper[dim] = is_union ? -INFINITY : INFINITY;
+    }
+    if (!is_composite(shape->opc))
+        return;
+    double arg_lower[NDIM], arg_upper[NDIM];
+    for (size_t i = 0; i < shape->alen; ++i)
+    {
+        shape_bounds(shape->args.shapes[i], box, arg_lower, arg_upper);
+        char is_empty = 0;
+        for (dim = 0; dim < NDIM; ++dim)
+            is_empty |= (arg_lower[dim] > arg_upper[dim]);
+        if (is_union && is_empty)
+            continue; // empty argument doesn't widen the union
+        for (dim = 0; dim < NDIM; ++dim)
+        {
+            if (is_union)
+            {
+                lower[dim] = fmin(lower[dim], arg_lower[dim]);
+                upper[dim] = fmax(upper[dim], arg_upper[dim]);
+            }
+            else
+            {
+                lower[dim] = fmax(lower[dim], arg_lower[dim]);
+                upper[dim] = fmin(upper[dim], arg_upper[dim]);
+            }
+        }
+    }
+}
+
+/**
+    Narrow the box to the bounds of the shape.
+
+    The box is left unchanged if the bounds are empty inside the box.
+ */
+static void narrow_box(Box *box, const double *lower, const double *upper)
+{
+    const double *basis[NDIM] = {box->ex, box->ey, box->ez};
+    double center[NDIM], lo[NDIM], hi[NDIM];
+    int dim;
+    for (dim = 0; dim < NDIM; ++dim)
+    {
+        lo[dim] = fmax(lower[dim], -0.5 * box->dims[dim]);
+        hi[dim] = fmin(upper[dim], 0.5 * box->dims[dim]);
+        if (lo[dim] >= hi[dim])
+            return;
+    }
+    for (int i = 0; i < NDIM; ++i)
+    {
+        center[i] = box->center[i];
+        for (dim = 0; dim < NDIM; ++dim)
+            center[i] += 0.5 * (lo[dim] + hi[dim]) * basis[dim][i];
+    }
+    box_init(box, center, box->ex, box->ey, box->ez, hi[0] - lo[0], hi[1] - lo[1], hi[2] - lo[2]);
+}
+
 /**
     Compute a bounding box, that bounds the shape.
 
+    The box is first narrowed to the analytic bounds of the shape, then it is
+    reduced by bisection.
+
     @param shape    Shape to de bound
     @param box INOUT: Start box. It is modified to obtain bounding box.
     @param tol Absolute tolerance. When change of box dimensions become smaller
@@ -334,6 +494,9 @@ int shape_bounding_box(const Shape *shape, Box *box, double tol)
     int dim, tl;
     double min_vol = tol * tol * tol;
     Box box1, box2;
+    double bounds_lower[NDIM], bounds_upper[NDIM];
+    shape_bounds(shape, box, bounds_lower, bounds_upper);
+    narrow_box(box, bounds_lower, bounds_upper);
     for (dim = 0; dim < NDIM; ++dim)
     {
         lower = 0;
@@ -361,7 +524,7 @@ int shape_bounding_box(const Shape *shape, Box *box, double tol)
                 upper = box2.dims[dim];
         }
     }
-    box->subdiv = 1;
+    box_path_init(&box->subdiv);
     return SHAPE_SUCCESS;
 }
 
@@ -387,7 +550,10 @@ double shape_volume(const Shape *shape, const Box *box, double min_vol)
     if (box->volume > min_vol)
     { // Shape intersects the box
         Box box1, box2;
-        box_split(box, &box1, &box2, BOX_SPLIT_AUTODIR, 0.5);
+        int dir;
+        double ratio;
+        shape_choose_split(shape, box, &dir, &ratio);
+        box_split(box, &box1, &box2, dir, ratio);
         double vol1 = shape_volume(shape, &box1, min_vol);
         double vol2 = shape_volume(shape, &box2, min_vol);
         return vol1 + vol2;
@@ -407,10 +573,10 @@ double shape_volume(const Shape *shape, const Box *box, double min_vol)
  */
 void shape_reset_cache(Shape *shape)
 {
-    shape->last_box = 0;
+    box_path_reset(&shape->last_box);
     if (is_final(shape->opc))
     {
-        shape->args.surface->last_box = 0;
+        box_path_reset(&shape->args.surface->last_box);
     }
     else if (is_composite(shape->opc))
     {
@@ -434,7 +600,7 @@ void shape_reset_stat(Shape *shape)
         free(s->arr);
         free(s);
     }
-    shape->last_box = 0;
+    box_path_reset(&shape->last_box);
     if (is_composite(shape->opc) && shape->args.shapes != NULL)
     {
         for (int i = 0; i < shape->alen; ++i)
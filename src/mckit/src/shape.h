@@ -48,8 +48,9 @@ struct Shape
         Shape **shapes;
     } args;              ///< Pointer to arguments. It can be either Shape or Surface
                          ///< structures
-    uint64_t last_box;   ///< Subdivision code of last tested box
+    BoxPath last_box;    ///< Subdivision path of last tested box
     int last_box_result; ///< Result of last test_box call.
+    BoxCache box_cache;  ///< Nonzero results for recently tested boxes.
     RBTree *stats;       ///< Statistics about argument results.
 };
 
@@ -35,3 +35,11 @@
     "    0 if there are both points with positive and negative sense inside"                                           \
     "    the box"                                                                                                      \
     "    -1 if every point inside the box has negative sense."
+
+#define BOX_CACHE_STAT_DOC                                                                                             \
+    "Statistics of the box test results cache."                                                                        \
+    ""                                                                                                                 \
+    "Returns"                                                                                                          \
+    "-------"                                                                                                          \
+    "stat : tuple[int, int]"                                                                                           \
+    "    The numbers of cache hits and misses."
@@ -1,6 +1,7 @@
 #include "surface.h"
 #include "mkl.h"
 #include "nlopt.h"
+#include <float.h>
 #include <math.h>
 #include <stdlib.h>
 
@@ -13,8 +14,18 @@
 #endif
 
 #define surface_INIT(surf)                                                                                             \
-    (surf)->last_box = 0;                                                                                              \
-    (surf)->last_box_result = 0;
+    box_path_reset(&(surf)->last_box);                                                                                 \
+    (surf)->last_box_result = 0;                                                                                       \
+    box_cache_init(&(surf)->box_cache);
+
+// Points are considered lying on a plane, if their deviations from the plane are less
+// than this number of rounding errors.
+#define PLANE_TOL_FACTOR 64
+
+// Minimal thickness of the parts of a box split at a surface with respect to the longest box dimension.
+#ifndef SPLIT_MIN_RATIO
+#define SPLIT_MIN_RATIO 0.125
+#endif
 
 static double _max(double a, double b)
 {
@@ -367,11 +378,43 @@ void surface_test_points(const Surface *surf, size_t npts, const double *points,
     }
 }
 
+/**
+ * Tests the box against the plane by the box corners.
+ *
+ * The corners lying on the plane within rounding errors are not taken into account.
+ * So, the boxes obtained by splitting a box exactly at the plane lie on the
+ * different sides of the plane.
+ */
+static int plane_test_box(const Plane *plane, const Box *box)
+{
+    double scale = fabs(plane->offset);
+    for (int i = 0; i < NDIM; ++i)
+        scale += fabs(plane->norm[i]) * (fabs(box->center[i]) + box->dims[i]);
+    double tol = PLANE_TOL_FACTOR * DBL_EPSILON * scale;
+
+    int mins = 1, maxs = -1;
+    for (int i = 0; i < NCOR; ++i)
+    {
+        double fval = plane_func(NDIM, box->corners + i * NDIM, NULL, (void *)plane);
+        if (fval > tol)
+            maxs = 1;
+        else if (fval < -tol)
+            mins = -1;
+    }
+    if (mins < 0 && maxs > 0)
+        return 0;
+    if (mins < 0)
+        return -1;
+    if (maxs > 0)
+        return +1;
+    return 0; // The box is degenerate and lies on the plane.
+}
+
 int surface_test_box(Surface *surf, const Box *box)
 {
-    if (surf->last_box != 0)
+    if (box_path_is_known(&surf->last_box))
     {
-        int bc = box_is_in(box, surf->last_box);
+        int bc = box_is_in(box, &surf->last_box);
         // if it is the box already tested (bc == 0) then returns cached result;
         // if it is inner box - then returns cached result only if it is not 0.
         // For inner box result may be different.
@@ -379,28 +422,51 @@ int surface_test_box(Surface *surf, const Box *box)
             return surf->last_box_result;
     }
 
-    // First, test corner points of the box. If they have different senses,
-    // then surface definitely intersects the box.
-    char corner_tests[NCOR];
-    surface_test_points(surf, NCOR, box->corners, corner_tests);
-    int mins = 1, maxs = -1, i;
+    // The test of a plane is cheaper than the cache lookup.
+    if (surf->type != PLANE)
+    {
+        int cached = box_cache_lookup(&surf->box_cache, box);
+        if (cached != 0)
+        {
+            if (box_path_is_known(&box->subdiv))
+            {
+                surf->last_box = box->subdiv;
+                surf->last_box_result = cached;
+            }
+            return cached;
+        }
+    }
 
-    for (i = 0; i < NCOR; ++i)
+    int sign, i;
+    if (surf->type == PLANE)
     {
-        if (corner_tests[i] < mins)
-            mins = corner_tests[i];
-        if (corner_tests[i] > maxs)
-            maxs = corner_tests[i];
+        // The test of corner points is sufficient for the plane.
+        sign = plane_test_box((const Plane *)surf, box);
     }
-    // sign == 0 only if both -1 and +1 present in corner_tests.
-    int sign = mins + maxs;
-    if (sign == 2)
-        sign = 1;
-    else if (sign == -2)
-        sign = -1;
+    else
+    {
+        // First, test corner points of the box. If they have different senses,
+        // then surface definitely intersects the box.
+        char corner_tests[NCOR];
+        surface_test_points(surf, NCOR, box->corners, corner_tests);
+        int mins = 1, maxs = -1;
 
-    // The test performed above is sufficient for the plane.
-    // But for other surfaces further tests must be done if sign != 0.
+        for (i = 0; i < NCOR; ++i)
+        {
+            if (corner_tests[i] < mins)
+                mins = corner_tests[i];
+            if (corner_tests[i] > maxs)
+                maxs = corner_tests[i];
+        }
+        // sign == 0 only if both -1 and +1 present in corner_tests.
+        sign = mins + maxs;
+        if (sign == 2)
+            sign = 1;
+        else if (sign == -2)
+            sign = -1;
+    }
+
+    // For other surfaces further tests must be done if sign != 0.
     if (sign != 0 && surf->type != PLANE)
     {
         // Additional tests for degenerate torus.
@@ -456,11 +522,198 @@ int surface_test_box(Surface *surf, const Box *box)
         nlopt_destroy(opt);
     }
     // Cache test result;
-    if (!(box->subdiv & HIGHEST_BIT))
+    if (box_path_is_known(&box->subdiv))
     {
         surf->last_box = box->subdiv;
         surf->last_box_result = sign;
     }
+    if (surf->type != PLANE)
+        box_cache_store(&surf->box_cache, box, sign);
 
     return sign;
 }
+
+int surface_split_position(const Surface *surf, const Box *box, int *dir, double *ratio)
+{
+    if (surf->type != PLANE)
+        return 0;
+
+    const Plane *plane = (const Plane *)surf;
+    const double *basis[NDIM] = {box->ex, box->ey, box->ez};
+    double norm2 = cblas_ddot(NDIM, plane->norm, 1, plane->norm, 1);
+    for (int d = 0; d < NDIM; ++d)
+    {
+        double proj = cblas_ddot(NDIM, plane->norm, 1, basis[d], 1);
+        if (proj * proj < (1 - PLANE_TOL_FACTOR * DBL_EPSILON) * norm2)
+            continue; // The plane is not parallel to the box faces.
+        double deviation = plane_func(NDIM, box->center, NULL, (void *)plane);
+        double r = 0.5 - deviation / (proj * box->dims[d]);
+        // Thin parts reach the minimal volume long before their other dimensions are small enough.
+        double longest = _max(box->dims[0], _max(box->dims[1], box->dims[2]));
+        if (fmin(r, 1 - r) * box->dims[d] < SPLIT_MIN_RATIO * longest)
+            return 0;
+        *dir = d;
+        *ratio = r;
+        return 1;
+    }
+    return 0;
+}
+
+/// Coordinate of the point along the direction with respect to the box center.
+static double box_coordinate(const Box *box, const double *point, const double *dir)
+{
+    return cblas_ddot(NDIM, point, 1, dir, 1) - cblas_ddot(NDIM, box->center, 1, dir, 1);
+}
+
+static void cross_product(const double *a, const double *b, double *result)
+{
+    result[0] = a[1] * b[2] - a[2] * b[1];
+    result[1] = a[2] * b[0] - a[0] * b[2];
+    result[2] = a[0] * b[1] - a[1] * b[0];
+}
+
+/// The half-space of a plane is bounded along the box axes parallel to the plane normal.
+static void plane_bounds(const Plane *plane, int sense, const Box *box, double *lower, double *upper)
+{
+    const double *basis[NDIM] = {box->ex, box->ey, box->ez};
+    double norm2 = cblas_ddot(NDIM, plane->norm, 1, plane->norm, 1);
+    double deviation = plane_func(NDIM, box->center, NULL, (void *)plane);
+    for (int d = 0; d < NDIM; ++d)
+    {
+        double proj = cblas_ddot(NDIM, plane->norm, 1, basis[d], 1);
+        if (proj * proj < (1 - PLANE_TOL_FACTOR * DBL_EPSILON) * norm2)
+            continue;
+        // Plane function along the axis is deviation + proj * t.
+        double t = -deviation / proj;
+        if (sense * proj > 0)
+            lower[d] = t;
+        else
+            upper[d] = t;
+    }
+}
+
+static void sphere_bounds(const Sphere *sphere, const Box *box, double *lower, double *upper)
+{
+    const double *basis[NDIM] = {box->ex, box->ey, box->ez};
+    for (int d = 0; d < NDIM; ++d)
+    {
+        double t = box_coordinate(box, sphere->center, basis[d]);
+        lower[d] = t - sphere->radius;
+        upper[d] = t + sphere->radius;
+    }
+}
+
+/// The infinite cylinder is bounded only along the box axes normal to the cylinder axis.
+static void cylinder_bounds(const Cylinder *cyl, const Box *box, double *lower, double *upper)
+{
+    const double *basis[NDIM] = {box->ex, box->ey, box->ez};
+    double norm2 = cblas_ddot(NDIM, cyl->axis, 1, cyl->axis, 1);
+    for (int d = 0; d < NDIM; ++d)
+    {
+        double proj = cblas_ddot(NDIM, cyl->axis, 1, basis[d], 1);
+        if (proj * proj > PLANE_TOL_FACTOR * DBL_EPSILON * norm2)
+            continue;
+        double t = box_coordinate(box, cyl->point, basis[d]);
+        lower[d] = t - cyl->radius;
+        upper[d] = t + cyl->radius;
+    }
+}
+
+/// The extent of a finite cylinder is the extent of its bases.
+static void RCC_bounds(const RCC *rcc, const Box *box, double *lower, double *upper)
+{
+    const double *basis[NDIM] = {box->ex, box->ey, box->ez};
+    const Cylinder *cyl = rcc->cyl;
+    const Plane *caps[2] = {rcc->top, rcc->bot};
+    double axis[NDIM], ends[2 * NDIM];
+    double length = cblas_dnrm2(NDIM, cyl->axis, 1);
+    for (int i = 0; i < NDIM; ++i)
+        axis[i] = cyl->axis[i] / length;
+    for (int j = 0; j < 2; ++j)
+    {
+        double cosine = cblas_ddot(NDIM, caps[j]->norm, 1, axis, 1);
+        if (cosine == 0)
+            return;
+        double shift = -plane_func(NDIM, cyl->point, NULL, (void *)caps[j]) / cosine;
+        cblas_dcopy(NDIM, cyl->point, 1, ends + j * NDIM, 1);
+        cblas_daxpy(NDIM, shift, axis, 1, ends + j * NDIM, 1);
+    }
+    for (int d = 0; d < NDIM; ++d)
+    {
+        double proj = cblas_ddot(NDIM, axis, 1, basis[d], 1);
+        double radius = cyl->radius * sqrt(_max(0, 1 - proj * proj));
+        double t0 = box_coordinate(box, ends, basis[d]);
+        double t1 = box_coordinate(box, ends + NDIM, basis[d]);
+        lower[d] = fmin(t0, t1) - radius;
+        upper[d] = _max(t0, t1) + radius;
+    }
+}
+
+/// The BOX is the set of points with n_k.x in [lo_k, hi_k], where n_k are the normals
+/// of the planes 2k. The coordinate along the axis e is linear in n_k.x with the
+/// coefficients e.(n_(k+1) x n_(k+2)) / det.
+static void BOX_bounds(const BOX *mbox, const Box *box, double *lower, double *upper)
+{
+    const double *basis[NDIM] = {box->ex, box->ey, box->ez};
+    const double *normals[NDIM];
+    double lo[NDIM], hi[NDIM], cofactors[NDIM * NDIM];
+    for (int k = 0; k < NDIM; ++k)
+    {
+        const Plane *outer = mbox->planes[2 * k];
+        const Plane *inner = mbox->planes[2 * k + 1];
+        double norm2 = cblas_ddot(NDIM, outer->norm, 1, outer->norm, 1);
+        double scale = -cblas_ddot(NDIM, inner->norm, 1, outer->norm, 1) / norm2;
+        if (scale <= 0)
+            return;
+        double center = cblas_ddot(NDIM, outer->norm, 1, box->center, 1);
+        normals[k] = outer->norm;
+        hi[k] = -outer->offset - center;
+        lo[k] = inner->offset / scale - center;
+    }
+    for (int k = 0; k < NDIM; ++k)
+        cross_product(normals[(k + 1) % NDIM], normals[(k + 2) % NDIM], cofactors + k * NDIM);
+    double det = cblas_ddot(NDIM, normals[0], 1, cofactors, 1);
+    if (det == 0)
+        return;
+    for (int d = 0; d < NDIM; ++d)
+    {
+        lower[d] = upper[d] = 0;
+        for (int k = 0; k < NDIM; ++k)
+        {
+            double w = cblas_ddot(NDIM, basis[d], 1, cofactors + k * NDIM, 1) / det;
+            lower[d] += fmin(w * lo[k], w * hi[k]);
+            upper[d] += _max(w * lo[k], w * hi[k]);
+        }
+    }
+}
+
+void surface_bounds(const Surface *surf, int sense, const Box *box, double *lower, double *upper)
+{
+    for (int d = 0; d < NDIM; ++d)
+    {
+        lower[d] = -INFINITY;
+        upper[d] = INFINITY;
+    }
+    if (surf->type == PLANE)
+    {
+        plane_bounds((const Plane *)surf, sense, box, lower, upper);
+        return;
+    }
+    if (sense > 0)
+        return; // Outer sides of closed surfaces are unbounded.
+    switch (surf->type)
+    {
+    case SPHERE:
+        sphere_bounds((const Sphere *)surf, box, lower, upper);
+        break;
+    case CYLINDER:
+        cylinder_bounds((const Cylinder *)surf, box, lower, upper);
+        break;
+    case MRCC:
+        RCC_bounds((const RCC *)surf, box, lower, upper);
+        break;
+    case MBOX:
+        BOX_bounds((const BOX *)surf, box, lower, upper);
+        break;
+    }
+}
@@ -37,8 +37,9 @@ enum SurfType
 struct Surface
 {
     char type;           ///< surface type
-    uint64_t last_box;   ///< subdivision code of last tested box
+    BoxPath last_box;    ///< subdivision path of last tested box
     int last_box_result; ///< last test_box result
+    BoxCache box_cache;  ///< nonzero test_box results for recently tested boxes
 };
 
 struct Plane
@@ -145,4 +146,32 @@ int surface_test_box(Surface *surf, ///< surface to test
                      const Box *box ///< box to test
 );
 
+/**
+ * Finds the position to split the box at the surface, so that the parts lie on the
+ * different sides of the surface.
+ *
+ * Only planes parallel to the box faces are split at.
+ *
+ * @param surf Surface intersecting the box.
+ * @param box Box to be split.
+ * @param dir OUT: splitting direction.
+ * @param ratio OUT: ratio of the box to be split off as in box_split.
+ * @return 1 if the position is found, 0 otherwise.
+ */
+int surface_split_position(const Surface *surf, const Box *box, int *dir, double *ratio);
+
+/**
+ * Finds conservative bounds of the surface side along the box axes.
+ *
+ * The bounds are known analytically for planes parallel to the box faces, spheres,
+ * cylinders normal to the box axes, RCC and BOX macrobodies. Otherwise, they are infinite.
+ *
+ * @param surf Surface to bound.
+ * @param sense The side of the surface: +1 or -1.
+ * @param box Box, which axes and center define the coordinates.
+ * @param lower OUT: lower bounds of the coordinates with respect to the box center.
+ * @param upper OUT: upper bounds of the coordinates with respect to the box center.
+ */
+void surface_bounds(const Surface *surf, int sense, const Box *box, double *lower, double *upper);
+
 #endif
@@ -4,8 +4,12 @@ from __future__ import annotations
 
 from typing import Any, cast
 
+import itertools
+
 from abc import abstractmethod
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
+from functools import cached_property, reduce
+from operator import xor
 
 # noinspection PyPackageRequirements
 import numpy as np
@@ -15,7 +19,6 @@ import numpy.typing as npt
 
 import mckit
 
-from mckit.box import GLOBAL_BOX
 
 # fmt:off
 # noinspection PyUnresolvedReferences,PyPackageRequirements
@@ -42,7 +45,12 @@ from .utils import (
     significant_array,
     significant_digits,
 )
-from .utils.tolerance import DEFAULT_TOLERANCE_ESTIMATOR, FLOAT_TOLERANCE, MaybeClose
+from .utils.tolerance import (
+    DEFAULT_TOLERANCE_ESTIMATOR,
+    FLOAT_TOLERANCE,
+    MaybeClose,
+    tolerance_estimator,
+)
 
 # fmt:on
 
@@ -63,6 +71,7 @@ __all__ = [
     "Surface",
     "Torus",
     "create_surface",
+    "transform_surfaces",
 ]
 
 
@@ -184,11 +193,11 @@ def _create_torus(axis, options, params) -> Torus:
     return Torus([x0, y0, z0], axis, R, a, b, **options)
 
 
-def _create_gquadratic(options, params) -> GQuadratic:
+def _create_gquadratic(options, params) -> Surface:
     A, B, C, D, E, F, G, H, J, k = params
     m = np.array([[A, 0.5 * D, 0.5 * F], [0.5 * D, B, 0.5 * E], [0.5 * F, 0.5 * E, C]])
     v = np.array([G, H, J])
-    return GQuadratic(m, v, k, **options)
+    return _classify_gquadratic(m, v, k, options) or GQuadratic(m, v, k, **options)
 
 
 def _create_cone(axis, kind, options, params) -> Cone:
@@ -224,12 +233,74 @@ def _create_sphere(axis, kind, options, params) -> Sphere:
     return Sphere(r0, R, **options)
 
 
-def _create_sq(options: dict[str, Any], params: npt.NDArray) -> GQuadratic:
+def _create_sq(options: dict[str, Any], params: npt.NDArray) -> Surface:
     A, B, C, D, E, F, G, x0, y0, z0 = params
     m = np.diag([A, B, C])
     v = 2 * np.array([D - A * x0, E - B * y0, F - C * z0])
     k = A * x0**2 + B * y0**2 + C * z0**2 - 2 * (D * x0 + E * y0 + F * z0) + G
-    return GQuadratic(m, v, k, **options)
+    return _classify_gquadratic(m, v, k, options) or GQuadratic(m, v, k, **options)
+
+
+GQ_CLASSIFICATION_TOLERANCE = 1.0e-9
+"""Relative tolerance to recognize a sphere, cylinder or cone in a generic quadratic surface."""
+
+
+def _classify_gquadratic(  # noqa: PLR0911
+    m: npt.ArrayLike, v: npt.ArrayLike, k: float, options: dict[str, Any]
+) -> Sphere | Cylinder | Cone | None:
+    """Represent generic quadratic surface with a sphere, cylinder or cone, if possible.
+
+    The eigenvalues w0 <= w1 <= w2 of the matrix ``m`` are equal for a sphere.
+    A cylinder has w0 == 0, w1 == w2, and a cone has w0 < 0, w1 == w2.
+    The surface should be negative inside as the specialized surfaces are.
+
+    Args:
+        m: matrix of coefficients of quadratic terms
+        v: coefficients of linear terms
+        k: free term
+        options: options for the new surface
+
+    Returns:
+        The specialized surface or None, if the quadratic surface is not one of them
+        within GQ_CLASSIFICATION_TOLERANCE.
+    """
+    tol = GQ_CLASSIFICATION_TOLERANCE
+    m = np.asarray(m, dtype=float)
+    v = np.asarray(v, dtype=float)
+    w, u = np.linalg.eigh(m)
+    scale = w[2]
+    if scale <= 0.0 or w[1] < (1.0 - tol) * scale:
+        return None
+    ratio = w[0] / scale
+    if abs(ratio - 1.0) <= tol:
+        canonical = np.ones(3)
+    elif abs(ratio) <= tol:
+        canonical = np.array([0.0, 1.0, 1.0])
+    elif ratio < 0.0:
+        canonical = np.array([ratio, 1.0, 1.0])
+    else:
+        return None
+    canonical *= scale
+    # The center of a sphere, the apex of a cone or the point on a cylinder axis nearest to origin.
+    basis = u[:, canonical != 0.0]
+    center = -0.5 * basis @ ((basis.T @ v) / canonical[canonical != 0.0])
+    canonical_m = (u * canonical) @ u.T
+    if np.abs(m - canonical_m).max() > tol * scale:
+        return None
+    if np.abs(v + 2.0 * canonical_m @ center).max() > tol * max(np.abs(v).max(), scale):
+        return None
+    center_k = center @ canonical_m @ center
+    axis = u[:, 0]
+    if ratio < -tol:
+        if abs(k - center_k) > tol * max(abs(k), scale):
+            return None
+        return Cone(center, axis, -ratio, **options)
+    radius2 = (center_k - k) / scale
+    if radius2 <= tol * max(abs(k), abs(center_k)) / scale:
+        return None  # imaginary or degenerate
+    if canonical[0] == 0.0:
+        return Cylinder(center, axis, np.sqrt(radius2), **options)
+    return Sphere(center, np.sqrt(radius2), **options)
 
 
 def _create_plane(
@@ -244,40 +315,312 @@ def _create_plane(
 
 
 def create_replace_dictionary(
-    surfaces: set[Surface],
+    surfaces: Iterable[Surface],
     unique: set[Surface] | None = None,
-    box=GLOBAL_BOX,
     tol: float = 1.0e-10,
 ) -> dict[Surface, tuple[Surface, int]]:
     """Creates surface replace dictionary for equal surfaces removing.
 
+    The surfaces parameters are quantized to buckets, which are much wider than tolerance.
+    A surface is compared with :meth:`Surface.is_close_to` only to the surfaces from its bucket
+    and the neighbouring buckets, if the parameters are close to the buckets boundaries.
+    The surfaces without numeric parameters to quantize, are compared for equality.
+
     Args:
-        surfaces : A set of surfaces to be checked.
+        surfaces: Surfaces to be checked.
         unique:  A set of surfaces that are assumed to be unique. If not None, then
-                `surfaces` are checked for coincidence with one of them.
-        box : Box
-            A box, which is used for comparison.
-        tol : float
-            Tolerance
+                 `surfaces` are checked for coincidence with one of them.
+                 The new unique surfaces are added to the set.
+        tol: Relative and absolute tolerance for the surfaces parameters.
 
     Returns:
         A replacement dictionary. surface -> (replace_surface, sense). Sense is +1
         if surfaces have the same direction of normals. -1 otherwise.
     """
-    replace = {}
     unique_surfaces = set() if unique is None else unique
-    for s in surfaces:
-        for us in unique_surfaces:
-            # noinspection PyUnresolvedReferences
-            t = s.equals(us, box=box, tol=tol)  # type: ignore[attr-defined]
-            if t != 0:
-                replace[s] = (us, t)
-                break
-        else:
+    candidates = [(s, *_bucket_parameters(s)) for s in unique_surfaces]
+    candidates.extend((s, *_bucket_parameters(s)) for s in surfaces if s not in unique_surfaces)
+    scale = max((np.abs(p).max() for _, _, p in candidates if p is not None), default=1.0)
+    buckets = _Buckets(_BUCKET_WIDTH_FACTOR * tol * max(scale, 1.0), tol)
+    estimator = tolerance_estimator(rtol=tol, atol=tol)
+    equal: dict[Surface, Surface] = {}
+    replace: dict[Surface, tuple[Surface, int]] = {}
+    for i, (s, kind, params) in enumerate(candidates):
+        if params is None:
+            found = equal.setdefault(s, s)
+            if found is not s:
+                replace[s] = (found, 1)
+            continue
+        if i >= len(unique_surfaces):
+            match = _find_close_surface(s, kind, params, buckets, estimator)
+            if match is not None:
+                replace[s] = match
+                continue
             unique_surfaces.add(s)
+        buckets.add(kind, params, s)
     return replace
 
 
+_BUCKET_WIDTH_FACTOR = 1024.0
+
+
+class _Buckets:
+    """Surfaces grouped by kind and quantized parameters."""
+
+    def __init__(self, width: float, tol: float) -> None:
+        self.width = width
+        self.tol = tol
+        self.buckets: dict[tuple[Any, ...], list[Surface]] = {}
+
+    def add(self, kind: tuple[Any, ...], params: npt.NDArray[np.float64], surface: Surface) -> None:
+        cells = np.floor(params / self.width).astype(int)
+        self.buckets.setdefault((*kind, *cells.tolist()), []).append(surface)
+
+    def neighbours(
+        self, kind: tuple[Any, ...], params: npt.NDArray[np.float64]
+    ) -> Iterable[Surface]:
+        """Surfaces from the buckets, which may contain surfaces close to the `params`."""
+        scaled = params / self.width
+        cells = np.floor(scaled)
+        # The distance to the boundaries, which can be crossed within tolerance, with a margin.
+        delta = 2.0 * self.tol * np.maximum(np.abs(params), 1.0) / self.width
+        lower = scaled - cells < delta
+        upper = cells + 1.0 - scaled < delta
+        options = []
+        for c, lo, up in zip(cells.astype(int).tolist(), lower, upper, strict=True):
+            option = [c]
+            if lo:
+                option.append(c - 1)
+            if up:
+                option.append(c + 1)
+            options.append(option)
+        for key in itertools.product(*options):
+            yield from self.buckets.get((*kind, *key), ())
+
+
+def _bucket_parameters(
+    surface: Surface,
+) -> tuple[tuple[Any, ...], npt.NDArray[np.float64] | None]:
+    """The exact part of the surface key and the parameters to quantize."""
+    cls = type(surface)
+    get_parameters = _BUCKET_PARAMETERS.get(cls)
+    if get_parameters is None or surface.transformation is not None:
+        return (cls,), None
+    kind = (cls, surface._sheet) if cls is Cone else (cls,)
+    return kind, get_parameters(surface)
+
+
+def _find_close_surface(
+    surface: Surface,
+    kind: tuple[Any, ...],
+    params: npt.NDArray[np.float64],
+    buckets: _Buckets,
+    estimator: Callable[[Any, Any], bool],
+) -> tuple[Surface, int] | None:
+    for candidate in buckets.neighbours(kind, params):
+        if surface.is_close_to(candidate, estimator):
+            return candidate, 1
+    if type(surface) is Plane:
+        reversed_plane = None
+        for candidate in buckets.neighbours(kind, -params):
+            if reversed_plane is None:
+                reversed_plane = surface.reverse()
+            if reversed_plane.is_close_to(candidate, estimator):
+                return candidate, -1
+    return None
+
+
+def transform_surfaces(
+    surfaces: Iterable[Surface], tr: Transformation
+) -> dict[Surface, Surface | mckit.Shape]:
+    """Transforms surfaces in bulk.
+
+    The parameters of spheres, cylinders and one-sheet cones are transformed
+    with one matrix product per surface type. Planes are compared exactly, so, they are
+    transformed one by one as in :meth:`Plane.transform`, only their significant digits
+    are computed at once. The other surfaces are transformed one by one.
+
+    Args:
+        surfaces: The surfaces to transform.
+        tr: Transformation to be applied.
+
+    Returns:
+        The map of the surfaces to the results of their transformation.
+    """
+    if tr is None:
+        return {s: s.transform(tr) for s in surfaces}
+    groups: dict[type, list[Surface]] = {Plane: [], Sphere: [], Cylinder: [], Cone: []}
+    result: dict[Surface, Surface | mckit.Shape] = {}
+    for s in surfaces:
+        group = groups.get(type(s))
+        if group is None or s.transformation is not None or (type(s) is Cone and s._sheet):
+            result[s] = s.transform(tr)
+        else:
+            group.append(s)
+    planes = groups[Plane]
+    if planes:
+        normals, offsets = _transform_plane_parameters(
+            np.array([p._v for p in planes]), np.array([p._k for p in planes]), tr
+        )
+        k_digits = _significant_array(offsets).tolist()
+        v_digits = _significant_array(normals)
+        for p, v, k, kd, vd in zip(planes, normals, offsets, k_digits, v_digits, strict=True):
+            digits = {"_k_digits": kd, "_v_digits": vd}
+            args = (internalize_ort(v)[0], k.item())
+            result[p] = _create_with_digits(Plane, args, digits, p.clean_options())
+    spheres = groups[Sphere]
+    if spheres:
+        centers = _transform_sphere_parameters(np.array([sp._center for sp in spheres]), tr)
+        center_digits = _significant_array(centers)
+        for sp, c, cd in zip(spheres, centers, center_digits, strict=True):
+            digits = {"_center_digits": cd, "_radius_digits": sp._radius_digits}
+            result[sp] = _create_with_digits(Sphere, (c, sp._radius), digits, sp.options)
+    cylinders = groups[Cylinder]
+    if cylinders:
+        points, axes = _transform_cylinder_parameters(
+            np.array([c._pt for c in cylinders]), np.array([c._axis for c in cylinders]), tr
+        )
+        axis_digits = _significant_array(axes)
+        pt_digits = _significant_array(points)
+        for c, pt, axis, ad, pd in zip(
+            cylinders, points, axes, axis_digits, pt_digits, strict=True
+        ):
+            digits = {"_axis_digits": ad, "_pt_digits": pd, "_radius_digits": c._radius_digits}
+            result[c] = _create_with_digits(Cylinder, (pt, axis, c._radius), digits, c.options)
+    cones = groups[Cone]
+    if cones:
+        apexes, axes, _ = _transform_cone_parameters(
+            np.array([c._apex for c in cones]),
+            np.array([c._axis for c in cones]),
+            np.zeros(len(cones), dtype=int),
+            tr,
+        )
+        axis_digits = _significant_array(axes)
+        apex_digits = _significant_array(apexes)
+        for c, apex, axis, ad, pd in zip(
+            cones, apexes, axes, axis_digits, apex_digits, strict=True
+        ):
+            digits = {"_axis_digits": ad, "_apex_digits": pd, "_t2_digits": c._t2_digits}
+            result[c] = _create_with_digits(Cone, (apex, axis, c._t2, 0), digits, c.options)
+    return result
+
+
+def _transform_plane_parameters(
+    normals: npt.NDArray[np.float64], offsets: npt.NDArray[np.float64], tr: Transformation
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    """Transform the parameters of planes.
+
+    The planes are transformed one by one with :meth:`Transformation.apply2plane`,
+    so, the results are exactly the same as in ``Plane(v, k, transform=tr)``:
+    planes are compared exactly, and the matrix products for all the planes
+    at once may differ in the last bits.
+    """
+    params = [
+        _normalize_plane(*tr.apply2plane(v, k)) for v, k in zip(normals, offsets, strict=True)
+    ]
+    return np.array([v for v, _ in params]).reshape(-1, 3), np.array([k for _, k in params])
+
+
+def _transform_sphere_parameters(
+    centers: npt.NDArray[np.float64], tr: Transformation
+) -> npt.NDArray[np.float64]:
+    return tr.apply2point(centers)
+
+
+def _transform_cylinder_parameters(
+    points: npt.NDArray[np.float64], axes: npt.NDArray[np.float64], tr: Transformation
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    """Transform and normalize the parameters of cylinders as `Cylinder.__init__()` does."""
+    points = tr.apply2point(points)
+    axes = tr.apply2vector(axes)
+    _normalize_axes(axes)
+    points -= axes * np.einsum("ni,ni->n", points, axes)[:, np.newaxis]
+    return points, axes
+
+
+def _transform_cone_parameters(
+    apexes: npt.NDArray[np.float64],
+    axes: npt.NDArray[np.float64],
+    sheets: npt.NDArray[np.int_],
+    tr: Transformation,
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64], npt.NDArray[np.int_]]:
+    """Transform and normalize the parameters of cones as `Cone.__init__()` does."""
+    apexes = tr.apply2point(apexes)
+    axes = tr.apply2vector(axes)
+    flipped = _normalize_axes(axes)
+    return apexes, axes, np.where(flipped, -sheets, sheets)
+
+
+def _transform_gq_parameters(
+    m: npt.NDArray[np.float64],
+    v: npt.NDArray[np.float64],
+    k: npt.NDArray[np.float64],
+    tr: Transformation,
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    """Apply :meth:`Transformation.apply2gq` to all the surfaces at once."""
+    u = tr._u
+    t = tr._t
+    m = np.einsum("ij,njk,lk->nil", u, m, u)
+    v = v @ np.transpose(u) - 2.0 * m @ t
+    k = k - v @ t - np.einsum("i,nij,j->n", t, m, t)
+    return m, v, k
+
+
+def _significant_array(values: npt.NDArray[np.float64]) -> npt.NDArray[np.int_]:
+    return significant_array(
+        values, constants.FLOAT_TOLERANCE, resolution=constants.FLOAT_TOLERANCE
+    )
+
+
+def _create_with_digits(
+    cls: type[Surface], args: tuple[Any, ...], digits: dict[str, Any], options: dict[str, Any]
+) -> Surface:
+    """Create a surface with precomputed significant digits skipping its `__init__()`.
+
+    The parameters in `args` should be already normalized as `__init__()` does.
+    """
+    instance = cls.__new__(cls, *args)
+    instance.__dict__.update(digits)
+    Surface.__init__(instance, **options)
+    _GEOMETRY_TYPES[cls].__init__(instance, *args)
+    return instance
+
+
+def _normalize_plane(v: npt.NDArray[np.float64], k: float) -> tuple[npt.NDArray[np.float64], float]:
+    v, is_ort = internalize_ort(v)
+    if not is_ort:
+        length = np.linalg.norm(v)
+        v /= length
+        k /= length
+    return v, k
+
+
+def _normalize_axis(axis: npt.NDArray[np.float64]) -> tuple[npt.NDArray[np.float64], bool]:
+    """Normalize the axis in place directing the maximum component to positive side.
+
+    Returns:
+        The axis and if it's flipped.
+    """
+    axis /= np.linalg.norm(axis)
+    max_dir = np.argmax(np.abs(axis))
+    if axis[max_dir] < 0:
+        axis *= -1
+        return axis, True
+    return axis, False
+
+
+def _normalize_axes(axes: npt.NDArray[np.float64]) -> npt.NDArray[np.bool_]:
+    """Normalize the axes in place as :func:`_normalize_axis` does for each one.
+
+    Returns:
+        Which of the axes are flipped.
+    """
+    axes /= np.linalg.norm(axes, axis=1)[:, np.newaxis]
+    flipped = axes[np.arange(len(axes)), np.argmax(np.abs(axes), axis=1)] < 0
+    axes[flipped] *= -1
+    return flipped
+
+
 def _drop_empty_transformation(options: dict[str, Any]) -> None:
     if "transform" in options and not options["transform"]:  # empty transformation option
         del options["transform"]
@@ -372,6 +715,27 @@ class Surface(Card, MaybeClose):
     def __setstate__(self, state):
         self.options = state
 
+    def _round_parameters(self) -> tuple[float, ...]:
+        """Rounded parameters defining the surface for hashing and comparison."""
+        raise NotImplementedError
+
+    @cached_property
+    def _rounded(self) -> tuple[float, ...]:
+        """Rounded parameters computed on the first use.
+
+        The value is cached in the instance dictionary, so it's not pickled
+        and is valid for any way of the surface creation.
+        """
+        return self._round_parameters()
+
+    @cached_property
+    def _hash_value(self) -> int:
+        return reduce(xor, map(hash, self._rounded), 0)
+
+    def _rounded_equal(self, other: Surface) -> bool:
+        """Compare cached hashes and then rounded parameters."""
+        return self._hash_value == other._hash_value and self._rounded == other._rounded
+
 
 def internalize_ort(v: np.ndarray) -> tuple[np.ndarray, bool]:
     if v is EX or np.array_equal(v, EX):
@@ -641,11 +1005,7 @@ class Plane(Surface, _Plane):
         else:
             v = np.asarray(normal, dtype=float)
             k = offset
-        v, is_ort = internalize_ort(v)
-        if not is_ort:
-            length = np.linalg.norm(v)
-            v /= length
-            k /= length
+        v, k = _normalize_plane(v, k)
         self._k_digits = significant_digits(
             k, constants.FLOAT_TOLERANCE, resolution=constants.FLOAT_TOLERANCE
         )
@@ -744,16 +1104,16 @@ class Plane(Surface, _Plane):
             (other._k, other._v, other.transformation),
         )
 
+    def _round_parameters(self) -> tuple[float, ...]:
+        return self._get_k(), *self._get_v().tolist()
+
     def __hash__(self):
-        result = hash(self._get_k())
-        for v in self._get_v():
-            result ^= hash(v)
-        return result
+        return self._hash_value
 
     def __eq__(self, other):
         if self is other:
             return True
-        if not isinstance(other, Plane):
+        if not isinstance(other, Plane) or self._hash_value != other._hash_value:
             return False
         return are_equal(
             (self._k, self._v, self.transformation),
@@ -761,11 +1121,20 @@ class Plane(Surface, _Plane):
         )
 
     def __getstate__(self):
-        return self._v, self._k, Surface.__getstate__(self)
+        return self._v, self._k, self._k_digits, self._v_digits, Surface.__getstate__(self)
 
     def __setstate__(self, state):
-        v, k, options = state
-        self.__init__(v, k, **options)
+        if len(state) == 3:  # the format of the previous versions
+            v, k, options = state
+            self.__init__(v, k, **options)
+            return
+        # Don't call __init__(): the normal is already normalized and
+        # repeated normalization may change the last bits of the values.
+        v, k, k_digits, v_digits, options = state
+        self._k_digits = k_digits
+        self._v_digits = v_digits
+        Surface.__setstate__(self, options)
+        _Plane.__init__(self, v, k)
 
     def __repr__(self):
         return f"Plane({self._v}, {self._k}, {self.options if self.options else ''})"
@@ -826,19 +1195,16 @@ class Sphere(Surface, _Sphere):
         _Sphere.__init__(instance, self._center, self._radius)
         return instance
 
+    def _round_parameters(self) -> tuple[float, ...]:
+        return *self._get_center().tolist(), self._get_radius()
+
     def __hash__(self):
-        result = hash(self._get_radius())
-        for c in self._get_center():
-            result ^= hash(c)
-        return result
+        return self._hash_value
 
     def __eq__(self, other):
-        if not isinstance(other, Sphere):
-            return False
-        for x, y in zip(self._get_center(), other._get_center(), strict=False):
-            if x != y:
-                return False
-        return self._get_radius() == other._get_radius()
+        if self is other:
+            return True
+        return isinstance(other, Sphere) and self._rounded_equal(other)
 
     def __repr__(self):
         return f"Sphere({self._center}, {self._radius}, {self.options if self.options else ''})"
@@ -957,10 +1323,7 @@ class Cylinder(Surface, _Cylinder):
         else:
             pt = np.asarray(pt, dtype=float)
             axis = np.asarray(axis, dtype=float)
-        axis /= np.linalg.norm(axis)
-        max_dir = np.argmax(np.abs(axis))
-        if axis[max_dir] < 0:
-            axis *= -1
+        axis, _ = _normalize_axis(axis)
         self._axis_digits = significant_array(
             axis, constants.FLOAT_TOLERANCE, resolution=constants.FLOAT_TOLERANCE
         )
@@ -986,26 +1349,16 @@ class Cylinder(Surface, _Cylinder):
     def __repr__(self):
         return f"Cylinder({self._pt}, {self._axis}, {self._radius}, {self.options if self.options else ''})"
 
+    def _round_parameters(self) -> tuple[float, ...]:
+        return *self._get_pt().tolist(), *self._get_axis().tolist(), self._get_radius()
+
     def __hash__(self):
-        result = hash(self._get_radius())
-        for c in self._get_pt():
-            result ^= hash(c)
-        for a in self._get_axis():
-            result ^= hash(a)
-        return result
+        return self._hash_value
 
     def __eq__(self, other):
         if self is other:
             return True
-        if not isinstance(other, Cylinder):
-            return False
-        for x, y in zip(self._get_pt(), other._get_pt(), strict=False):
-            if x != y:
-                return False
-        for x, y in zip(self._get_axis(), other._get_axis(), strict=False):
-            if x != y:
-                return False
-        return self._get_radius() == other._get_radius()
+        return isinstance(other, Cylinder) and self._rounded_equal(other)
 
     def is_close_to(
         self,
@@ -1014,7 +1367,7 @@ class Cylinder(Surface, _Cylinder):
     ) -> bool:
         if self is other:
             return True
-        if not isinstance(other, Cone):
+        if not isinstance(other, Cylinder):
             return False
         return estimator(
             (self._radius, self._pt, self._axis, self.transformation),
@@ -1151,11 +1504,8 @@ class Cone(Surface, _Cone):
         if tr:
             apex = tr.apply2point(apex)
             axis = tr.apply2vector(axis)
-        axis = np.asarray(axis, dtype=float)
-        axis /= np.linalg.norm(axis)
-        maxdir = np.argmax(np.abs(axis))
-        if axis[maxdir] < 0:
-            axis *= -1
+        axis, flipped = _normalize_axis(np.asarray(axis, dtype=float))
+        if flipped:
             sheet *= -1
         apex = np.asarray(apex, dtype=float)
         self._axis_digits = significant_array(
@@ -1207,29 +1557,21 @@ class Cone(Surface, _Cone):
         apex, axis, t2, sheet, options = state
         self.__init__(apex, axis, t2, sheet, **options)
 
+    def _round_parameters(self) -> tuple[float, ...]:
+        return (
+            *self._get_apex().tolist(),
+            *self._get_axis().tolist(),
+            self._get_t2(),
+            self._sheet,
+        )
+
     def __hash__(self):
-        result = hash(self._get_t2()) ^ hash(self._sheet)
-        for c in self._get_apex():
-            result ^= hash(c)
-        for a in self._get_axis():
-            result ^= hash(a)
-        return result
+        return self._hash_value
 
     def __eq__(self, other):
-        # noinspection DuplicatedCode
         if self is other:
             return True
-
-        if not isinstance(other, Cone):
-            return False
-
-        for x, y in zip(self._get_apex(), other._get_apex(), strict=False):
-            if x != y:
-                return False
-        for x, y in zip(self._get_axis(), other._get_axis(), strict=False):
-            if x != y:
-                return False
-        return self._get_t2() == other._get_t2() and self._sheet == other._sheet
+        return isinstance(other, Cone) and self._rounded_equal(other)
 
     def _get_axis(self):
         return round_array(self._axis, self._axis_digits)
@@ -1375,24 +1717,16 @@ class GQuadratic(Surface, _GQuadratic):
         _GQuadratic.__init__(instance, self._m, self._v, self._k, self._factor)
         return instance
 
+    def _round_parameters(self) -> tuple[float, ...]:
+        return *self._get_m().ravel().tolist(), *self._get_v().tolist(), self._get_k()
+
     def __hash__(self) -> int:
-        result = hash(self._get_k())
-        for v in self._get_v():
-            result ^= hash(v)
-        for x in self._get_m().ravel():
-            result ^= hash(x)
-        return result
+        return self._hash_value
 
     def __eq__(self, other) -> bool:
-        if not isinstance(other, GQuadratic):
-            return False
-        for x, y in zip(self._get_v(), other._get_v(), strict=False):
-            if x != y:
-                return False
-        for x, y in zip(self._get_m().ravel(), other._get_m().ravel(), strict=False):
-            if x != y:
-                return False
-        return self._get_k() == other._get_k()
+        if self is other:
+            return True
+        return isinstance(other, GQuadratic) and self._rounded_equal(other)
 
     def _get_m(self) -> np.ndarray:
         return round_array(self._m, self._m_digits)
@@ -1437,12 +1771,15 @@ class GQuadratic(Surface, _GQuadratic):
         options = self.clean_options()
         return GQuadratic(m, v, k, **options)
 
-    def round(self) -> GQuadratic:
+    def round(self) -> Surface:
         temp = self.apply_transformation()
+        options = self.clean_options()
+        specialized = _classify_gquadratic(temp._m, temp._v, temp._k, options)
+        if specialized is not None:
+            return specialized.round()
         m, v = map(round_array, [temp._m, temp._v])
         k = round_scalar(temp._k)
-        # TODO dvp: handle cases when the surface can be represented with specialized quadratic surface: Cone etc.
-        return GQuadratic(m, v, k, **self.clean_options())
+        return GQuadratic(m, v, k, **options)
 
     def __repr__(self) -> str:
         options = str(self.options) if self.options else ""
@@ -1520,28 +1857,22 @@ class Torus(Surface, _Torus):
         _Torus.__init__(instance, self._center, self._axis, self._R, self._a, self._b)
         return instance
 
+    def _round_parameters(self) -> tuple[float, ...]:
+        return (
+            *self._get_center().tolist(),
+            *self._get_axis().tolist(),
+            self._get_r(),
+            self._get_a(),
+            self._get_b(),
+        )
+
     def __hash__(self):
-        result = hash(self._get_r()) ^ hash(self._get_a()) ^ hash(self._get_b())
-        for c in self._get_center():
-            result ^= hash(c)
-        for a in self._get_axis():
-            result ^= hash(a)
-        return result
+        return self._hash_value
 
     def __eq__(self, other):
-        if not isinstance(other, Torus):
-            return False
-        for x, y in zip(self._get_center(), other._get_center(), strict=False):
-            if x != y:
-                return False
-        for x, y in zip(self._get_axis(), other._get_axis(), strict=False):
-            if x != y:
-                return False
-        return (
-            self._get_r() == other._get_r()
-            and self._get_a() == other._get_a()
-            and self._get_b() == other._get_b()
-        )
+        if self is other:
+            return True
+        return isinstance(other, Torus) and self._rounded_equal(other)
 
     def _get_axis(self):
         return round_array(self._axis, self._axis_digits)
@@ -1637,3 +1968,20 @@ class Torus(Surface, _Torus):
     def __repr__(self):
         return f"Torus({self._center}, {self._axis}, {self._R}, \
             {self._a}, {self._b}, {self.options if self.options else ''}"
+
+
+_GEOMETRY_TYPES = {
+    Plane: _Plane,
+    Sphere: _Sphere,
+    Cylinder: _Cylinder,
+    Cone: _Cone,
+    GQuadratic: _GQuadratic,
+}
+_BUCKET_PARAMETERS: dict[type[Surface], Callable[[Any], npt.NDArray[np.float64]]] = {
+    Plane: lambda s: np.append(s._v, s._k),
+    Sphere: lambda s: np.append(s._center, s._radius),
+    Cylinder: lambda s: np.concatenate((s._pt, s._axis, [s._radius])),
+    Cone: lambda s: np.concatenate((s._apex, s._axis, [s._t2])),
+    GQuadratic: lambda s: np.concatenate((s._m.ravel(), s._v, [s._k])),
+    Torus: lambda s: np.concatenate((s._center, s._axis, [s._R, s._a, s._b])),
+}
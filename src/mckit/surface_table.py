@@ -0,0 +1,363 @@
+"""Surfaces of a model stored in contiguous arrays grouped by type.
+
+The parameters of planes, spheres, cylinders, cones and generic quadratic
+surfaces are stacked to arrays per surface type, so, testing points, transforming
+and comparing all the surfaces costs a few array operations per type instead
+of a call per surface. The other surfaces are kept as objects.
+The surfaces keep their indices in the table, and the :class:`Surface` objects
+are created from the arrays only on access.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import numpy.typing as npt
+
+from .surface import (
+    Cone,
+    Cylinder,
+    GQuadratic,
+    Plane,
+    Sphere,
+    Surface,
+    _create_with_digits,
+    _significant_array,
+    _transform_cone_parameters,
+    _transform_cylinder_parameters,
+    _transform_gq_parameters,
+    _transform_plane_parameters,
+    _transform_sphere_parameters,
+    internalize_ort,
+)
+from .utils import round_array
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+    from .transformation import Transformation
+
+__all__ = ["SurfaceTable"]
+
+_PARAMETERS: dict[type[Surface], tuple[str, ...]] = {
+    Plane: ("_v", "_k"),
+    Sphere: ("_center", "_radius"),
+    Cylinder: ("_pt", "_axis", "_radius"),
+    Cone: ("_apex", "_axis", "_t2", "_sheet"),
+    GQuadratic: ("_m", "_v", "_k", "_factor"),
+}
+"""Attributes of the surfaces stored in arrays in the order of constructor arguments."""
+
+_COMPARED: dict[type[Surface], tuple[str, ...]] = {
+    Plane: ("_k", "_v"),
+    Sphere: ("_center", "_radius"),
+    Cylinder: ("_pt", "_axis", "_radius"),
+    Cone: ("_apex", "_axis", "_t2", "_sheet"),
+    GQuadratic: ("_m", "_v", "_k"),
+}
+"""Parameters defining equality of the surfaces, see ``Surface._round_parameters()``."""
+
+_UNROUNDED = frozenset(["_sheet", "_factor"])
+"""Parameters without significant digits."""
+
+_CHUNK_SIZE = 1 << 20
+"""The maximal number of surface and point pairs to evaluate at once."""
+
+
+class _Group:
+    """Parameters of the surfaces of one type stacked along the first axis.
+
+    Args:
+        indices: The indices of the surfaces in the table.
+        params: The arrays of the surfaces attributes.
+        digits: The arrays of significant digits of the attributes.
+    """
+
+    __slots__ = ("digits", "indices", "params")
+
+    def __init__(
+        self,
+        indices: npt.NDArray[np.intp],
+        params: dict[str, npt.NDArray[Any]],
+        digits: dict[str, npt.NDArray[np.int_]],
+    ) -> None:
+        self.indices = indices
+        self.params = params
+        self.digits = digits
+
+    @classmethod
+    def from_surfaces(
+        cls, surface_type: type[Surface], indices: npt.NDArray[np.intp], surfaces: list[Surface]
+    ) -> _Group:
+        members = [surfaces[i] for i in indices]
+        params = {}
+        digits = {}
+        for name in _PARAMETERS[surface_type]:
+            params[name] = np.array([getattr(s, name) for s in members])
+            if name not in _UNROUNDED:
+                digits[name] = np.array([getattr(s, name + "_digits") for s in members])
+        return cls(indices, params, digits)
+
+    def create(self, surface_type: type[Surface], position: int, options: dict) -> Surface:
+        args = tuple(_item(self.params[name][position]) for name in _PARAMETERS[surface_type])
+        if surface_type is Plane:
+            args = (internalize_ort(args[0])[0], *args[1:])
+        digits = {name + "_digits": _item(values[position]) for name, values in self.digits.items()}
+        return _create_with_digits(surface_type, args, digits, options)
+
+    def comparison_keys(self, surface_type: type[Surface]) -> npt.NDArray[np.float64]:
+        """Rows of parameters equal for equal surfaces."""
+        columns = []
+        for name in _COMPARED[surface_type]:
+            values = self.params[name]
+            if surface_type is not Plane and name not in _UNROUNDED:
+                values = round_array(values, self.digits[name])
+            columns.append(values.reshape(len(values), -1))
+        return np.hstack(columns) + 0.0  # -0.0 and 0.0 are to be equal
+
+
+def _item(value: npt.NDArray[Any]) -> Any:
+    return value.item() if value.ndim == 0 else value.copy()
+
+
+class SurfaceTable:
+    """Surfaces stored in arrays grouped by type.
+
+    Args:
+        surfaces: The surfaces to store. The surfaces keep their order, that is,
+            the index of a surface in the table is its index in the sequence.
+
+    Examples:
+        >>> table = SurfaceTable([Plane([1, 0, 0], -1, name=1), Sphere([0, 0, 0], 2, name=2)])
+        >>> table.test_points([[0, 0, 0], [1.5, 0, 0]]).tolist()
+        [[-1, 1], [-1, -1]]
+        >>> table[1]
+        Sphere([0. 0. 0.], 2.0, {'name': 2})
+    """
+
+    def __init__(self, surfaces: Iterable[Surface]) -> None:
+        self._surfaces: list[Surface | None] = list(surfaces)
+        self._options = [s.options for s in self._surfaces]
+        self._types: list[type[Surface]] = [type(s) for s in self._surfaces]
+        self._positions = np.zeros(len(self._surfaces), dtype=np.intp)
+        members: dict[type[Surface], list[int]] = {}
+        others = []
+        for i, s in enumerate(self._surfaces):
+            surface_type = type(s)
+            if surface_type in _PARAMETERS and s.transformation is None:
+                indices = members.setdefault(surface_type, [])
+                self._positions[i] = len(indices)
+                indices.append(i)
+            else:
+                others.append(i)
+        self._others = np.array(others, dtype=np.intp)
+        self._groups: dict[type[Surface], _Group] = {
+            surface_type: _Group.from_surfaces(
+                surface_type, np.array(indices, dtype=np.intp), self._surfaces
+            )
+            for surface_type, indices in members.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    def __iter__(self) -> Iterator[Surface]:
+        return (self[i] for i in range(len(self)))
+
+    def __getitem__(self, index: int) -> Surface:
+        surface = self._surfaces[index]
+        if surface is None:
+            surface_type = self._types[index]
+            surface = self._groups[surface_type].create(
+                surface_type, self._positions[index], self._options[index]
+            )
+            self._surfaces[index] = surface
+        return surface
+
+    def names(self) -> list[Any]:
+        """The names of the surfaces in the table order."""
+        return [options.get("name", None) for options in self._options]
+
+    def test_points(self, points: npt.ArrayLike) -> npt.NDArray[np.int8]:
+        """Checks the senses of the points with respect to all the surfaces.
+
+        Args:
+            points: The point or an array of points, shape (3,) or (n, 3).
+
+        Returns:
+            The senses: +1 if a point is outside a surface, -1 otherwise.
+            The array has shape (surfaces,) for a single point or (surfaces, n).
+        """
+        points = np.asarray(points, dtype=float)
+        flat = points.reshape(-1, 3)
+        result = np.empty((len(self), len(flat)), dtype=np.int8)
+        for surface_type, group in self._groups.items():
+            function = _FUNCTIONS[surface_type]
+            step = max(1, _CHUNK_SIZE // len(group.indices))
+            for start in range(0, len(flat), step):
+                values = function(group.params, flat[start : start + step])
+                result[group.indices, start : start + step] = np.where(np.signbit(values), -1, 1)
+        for i in self._others:
+            result[i] = self._surfaces[i].test_points(flat)
+        return result if points.ndim > 1 else result[:, 0]
+
+    def transform(self, tr: Transformation) -> SurfaceTable:
+        """Transforms all the surfaces.
+
+        The surfaces keep their indices. In contrast to :meth:`Cone.transform`
+        one-sheet cones remain cones.
+
+        Args:
+            tr: Transformation to be applied.
+
+        Returns:
+            The table of the transformed surfaces.
+        """
+        table = SurfaceTable.__new__(SurfaceTable)
+        table._surfaces = [None] * len(self)
+        table._options = list(self._options)
+        table._types = self._types
+        table._positions = self._positions
+        table._others = self._others
+        table._groups = {}
+        for surface_type, group in self._groups.items():
+            params, digits = _TRANSFORMATIONS[surface_type](group, tr)
+            table._groups[surface_type] = _Group(group.indices, params, digits)
+        for i in self._others:
+            surface = _transform_other(self._surfaces[i], tr)
+            table._surfaces[i] = surface
+            table._options[i] = surface.options
+        return table
+
+    def equal_indices(self) -> npt.NDArray[np.intp]:
+        """Finds equal surfaces.
+
+        Returns:
+            The index of the first equal surface for each surface in the table.
+        """
+        result = np.arange(len(self))
+        for surface_type, group in self._groups.items():
+            _, first, inverse = np.unique(
+                group.comparison_keys(surface_type),
+                axis=0,
+                return_index=True,
+                return_inverse=True,
+            )
+            result[group.indices] = group.indices[first[inverse.ravel()]]
+        seen: dict[Surface, int] = {}
+        for i in self._others:
+            result[i] = seen.setdefault(self._surfaces[i], i)
+        return result
+
+
+def _transform_other(surface: Surface, tr: Transformation) -> Surface:
+    if isinstance(surface, Cone):  # keep a one-sheet cone a cone
+        cone = surface.apply_transformation()
+        return Cone(cone._apex, cone._axis, cone._t2, cone._sheet, transform=tr, **cone.options)
+    return surface.transform(tr)
+
+
+def _plane_function(params: dict, points: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    return params["_v"] @ points.T + params["_k"][:, np.newaxis]
+
+
+def _sphere_function(params: dict, points: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    a = points - params["_center"][:, np.newaxis, :]
+    return np.einsum("npi,npi->np", a, a) - (params["_radius"] ** 2)[:, np.newaxis]
+
+
+def _cylinder_function(params: dict, points: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    a = points - params["_pt"][:, np.newaxis, :]
+    an = np.einsum("npi,ni->np", a, params["_axis"])
+    radius2 = (params["_radius"] ** 2)[:, np.newaxis]
+    return np.einsum("npi,npi->np", a, a) - an**2 - radius2
+
+
+def _cone_function(params: dict, points: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    a = points - params["_apex"][:, np.newaxis, :]
+    an = np.einsum("npi,ni->np", a, params["_axis"])
+    sheet = params["_sheet"][:, np.newaxis]
+    an[(sheet != 0) & (sheet * an < 0)] = 0.0  # the other sheet is cut off
+    return np.einsum("npi,npi->np", a, a) - an**2 * (1.0 + params["_t2"])[:, np.newaxis]
+
+
+def _gq_function(params: dict, points: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    y = np.einsum("nij,pj->npi", params["_m"], points) + params["_v"][:, np.newaxis, :]
+    values = np.einsum("npi,pi->np", y, points) + params["_k"][:, np.newaxis]
+    return values * params["_factor"][:, np.newaxis]
+
+
+_FUNCTIONS: dict[
+    type[Surface], Callable[[dict, npt.NDArray[np.float64]], npt.NDArray[np.float64]]
+] = {
+    Plane: _plane_function,
+    Sphere: _sphere_function,
+    Cylinder: _cylinder_function,
+    Cone: _cone_function,
+    GQuadratic: _gq_function,
+}
+"""The functions of the surfaces, which are positive outside."""
+
+
+_Transformed = tuple[dict[str, npt.NDArray[Any]], dict[str, npt.NDArray[np.int_]]]
+
+
+def _transform_planes(group: _Group, tr: Transformation) -> _Transformed:
+    normals, offsets = _transform_plane_parameters(group.params["_v"], group.params["_k"], tr)
+    params = {"_v": normals, "_k": offsets}
+    digits = {"_v": _significant_array(normals), "_k": _significant_array(offsets)}
+    return params, digits
+
+
+def _transform_spheres(group: _Group, tr: Transformation) -> _Transformed:
+    centers = _transform_sphere_parameters(group.params["_center"], tr)
+    params = {"_center": centers, "_radius": group.params["_radius"]}
+    digits = {"_center": _significant_array(centers), "_radius": group.digits["_radius"]}
+    return params, digits
+
+
+def _transform_cylinders(group: _Group, tr: Transformation) -> _Transformed:
+    points, axes = _transform_cylinder_parameters(group.params["_pt"], group.params["_axis"], tr)
+    params = {"_pt": points, "_axis": axes, "_radius": group.params["_radius"]}
+    digits = {
+        "_pt": _significant_array(points),
+        "_axis": _significant_array(axes),
+        "_radius": group.digits["_radius"],
+    }
+    return params, digits
+
+
+def _transform_cones(group: _Group, tr: Transformation) -> _Transformed:
+    apexes, axes, sheets = _transform_cone_parameters(
+        group.params["_apex"], group.params["_axis"], group.params["_sheet"], tr
+    )
+    params = {"_apex": apexes, "_axis": axes, "_t2": group.params["_t2"], "_sheet": sheets}
+    digits = {
+        "_apex": _significant_array(apexes),
+        "_axis": _significant_array(axes),
+        "_t2": group.digits["_t2"],
+    }
+    return params, digits
+
+
+def _transform_gqs(group: _Group, tr: Transformation) -> _Transformed:
+    m, v, k = _transform_gq_parameters(
+        group.params["_m"], group.params["_v"], group.params["_k"], tr
+    )
+    params = {"_m": m, "_v": v, "_k": k, "_factor": group.params["_factor"]}
+    digits = {
+        "_m": _significant_array(m),
+        "_v": _significant_array(v),
+        "_k": _significant_array(k),
+    }
+    return params, digits
+
+
+_TRANSFORMATIONS: dict[type[Surface], Callable[[_Group, Transformation], _Transformed]] = {
+    Plane: _transform_planes,
+    Sphere: _transform_spheres,
+    Cylinder: _transform_cylinders,
+    Cone: _transform_cones,
+    GQuadratic: _transform_gqs,
+}
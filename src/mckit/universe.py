@@ -27,7 +27,8 @@ from .body import Body, Shape
 from .box import GLOBAL_BOX, Box
 from .card import Card
 from .material import Composition, Material
-from .surface import Plane, Surface
+from .surface import Plane, Surface, create_replace_dictionary, transform_surfaces
+from .surface_table import SurfaceTable
 from .transformation import Transformation
 from .utils import accept, on_unknown_acceptor
 
@@ -45,7 +46,7 @@ __all__ = [
 ]
 
 from .utils.indexes import IndexOfNamed, StatisticsCollector
-from .utils.named import Name, default_name_key
+from .utils.named import Name
 
 ZERO_NAME = Name(0)
 
@@ -124,6 +125,12 @@ def surface_selector(surface_names):
     return selector
 
 
+def _surface_order_key(surface: Surface) -> tuple[bool, Name]:
+    """Sort key ordering surfaces by name with unnamed surfaces last."""
+    name = surface.name()
+    return name is None, name or 0
+
+
 class Universe:
     """Describes universe - a set of cells.
 
@@ -205,6 +212,7 @@ class Universe:
         if common_materials is None:
             common_materials = set()
         self._common_materials = common_materials
+        self._registries: _Registries | None = None
 
         self.add_cells(cells, name_rule=name_rule)
 
@@ -252,41 +260,44 @@ class Universe:
         if isinstance(cells, Body):
             cells = [cells]
 
-        surfs = self.get_surfaces()
-        surf_replace = {s: s for s in surfs}
-        comps = self._common_materials.union(self.get_compositions())
-        comp_replace = {c: c for c in comps}
-        cell_names: set[int] = {default_name_key(c) for c in self}
-        surf_names: set[int] = {default_name_key(s) for s in surfs}
-        comp_names: set[int] = {default_name_key(c) for c in comps}
+        registries = self._get_registries()
+        cell_names = registries.cells
 
         for cell in cells:
             if cell.shape.is_empty():
                 continue
 
-            new_shape = self._get_cell_replaced_shape(cell, surf_replace, surf_names, name_rule)
+            new_shape = self._get_cell_replaced_shape(cell, registries, name_rule)
 
             new_cell = Body(new_shape, **cell.options)
             mat = new_cell.material()
 
             if mat:
                 new_comp = Universe._update_replace_dict(
-                    mat.composition, comp_replace, comp_names, name_rule, "Material"
+                    mat.composition, registries.compositions, name_rule, "Material"
                 )
                 new_cell.options["MAT"] = Material(composition=new_comp, density=mat.density)
 
-            if name_rule == "keep" and cell.name() in cell_names:
+            if name_rule == "keep" and cell.name() in cell_names.names:
                 msg = f"Cell name clash: {cell.name()}"
                 raise NameClashError(msg)
 
-            if name_rule == "new" or (name_rule == "clash" and cell.name() in cell_names):
-                new_name = max(cell_names, default=0) + 1
-                new_cell.rename(new_name)
+            if name_rule == "new" or (name_rule == "clash" and cell.name() in cell_names.names):
+                new_cell.rename(cell_names.next_name)
 
-            cell_names.add(new_cell.name())
+            cell_names.add_name(new_cell.name())
             new_cell.options["U"] = self
             self._cells.append(new_cell)
 
+    def _get_registries(self) -> _Registries:
+        if self._registries is None:
+            self._registries = _Registries(self)
+        return self._registries
+
+    def _reset_registries(self) -> None:
+        """Drop the registries after changes, which cannot be tracked incrementally."""
+        self._registries = None
+
     def set_common_materials(self, common_materials):
         """Sets common materials for this one and all nested universes.
 
@@ -308,6 +319,7 @@ class Universe:
             A set of common_materials
         """
         self._common_materials = common_materials
+        self._reset_registries()
         cmd = {m: m for m in common_materials}
         for c in self:
             mat = c.material()
@@ -319,37 +331,38 @@ class Universe:
     @staticmethod
     def _get_cell_replaced_shape(
         cell: Body,
-        surf_replace: dict[Surface, Surface],
-        surf_names: set[int],
+        registries: _Registries,
         name_rule: Literal["keep", "new", "clash"],
     ) -> Shape:
         cell_surfs = cell.shape.get_surfaces()
         replace_dict = {}
         for s in cell_surfs:
             if isinstance(s, Plane):
-                rev_s = Plane(-s._v, -s._k)
-                if rev_s in surf_replace.keys():
+                rev_s = registries.find_reversed_plane(s)
+                if rev_s is not None:
                     # dvp: use reverse of a Plane, if already present
-                    rev_s = surf_replace[rev_s]
                     replace_dict[s] = Shape("C", rev_s)
                     continue
             replace_dict[s] = Universe._update_replace_dict(
-                s, surf_replace, surf_names, name_rule, "Surface"
+                s, registries.surfaces, name_rule, "Surface", registries.add_surface
             )
         return cell.shape.replace_surfaces(replace_dict)
 
     @staticmethod
     def _update_replace_dict(
         entity: Replaceable,
-        replace: dict[Replaceable, Replaceable],
-        names: set[int],
+        registry: _Registry,
         rule: Literal["keep", "new", "clash"],
         err_desc: str,
+        add: Callable[[Replaceable], None] | None = None,
     ) -> Replaceable:
-        if entity in replace.keys():
-            return replace[entity]
+        replace = registry.entities
+        found = replace.get(entity)
+        if found is not None:
+            return found
 
         new_entity = entity.copy()
+        names = registry.names
 
         if rule == "keep" and new_entity.name() in names:
             msg = f"{err_desc} name clash: {entity.name()}"
@@ -362,11 +375,12 @@ class Universe:
             raise NameClashError(msg)
 
         if rule == "new" or (rule == "clash" and new_entity.name() in names):
-            new_name = max(names, default=0) + 1
-            new_entity.rename(new_name)
+            new_entity.rename(registry.next_name)
 
-        replace[new_entity] = new_entity
-        names.add(new_entity.name())
+        if add is None:
+            registry.add(new_entity)
+        else:
+            add(new_entity)
 
         return new_entity
 
@@ -399,6 +413,7 @@ class Universe:
         cell: Body | int = None,
         universe: Universe | int = None,
         predicate: Callable[[Body], bool] | None = None,
+        prune: bool = False,
     ) -> None:
         """Applies fill operations to all or selected cells or universes.
 
@@ -415,6 +430,9 @@ class Universe:
             predicate:
                 Function that accepts Body instance and return True, if this cell
                 must be filled.
+            prune:
+                Drop the filler cells, which bounding boxes don't intersect bounding
+                box of the cell being filled. See `Body.fill()`.
         """
         if not cell and not universe and not predicate:
 
@@ -438,10 +456,12 @@ class Universe:
         del_indices = []
         for i, c in enumerate(self):
             if predicate(c):
-                extra_cells.extend(c.fill())
+                extra_cells.extend(c.fill(prune=prune))
                 del_indices.append(i)
         for i in reversed(del_indices):
             self._cells.pop(i)
+        if del_indices:
+            self._reset_registries()
         self.add_cells(extra_cells, name_rule="new")
 
     def bounding_box(
@@ -501,6 +521,31 @@ class Universe:
             common_materials=self._common_materials,
         )
 
+    def _detached_copy(self) -> Universe:
+        """Makes a copy of the universe not sharing cells, surfaces and compositions with it.
+
+        Unlike copy(), the cells are not checked for names and surfaces clashes,
+        they are consistent already. The universe should not contain filled cells.
+        """
+        surfaces: dict[int, Surface] = {}
+        compositions = {c: c.copy() for c in self.get_compositions()}
+        result = Universe(
+            [],
+            name=self._name,
+            verbose_name=self._verbose_name,
+            comment=self._comment,
+        )
+        for c in self:
+            new_cell = Body(c.shape._copy_with_surfaces(surfaces), **c.options)
+            mat = new_cell.material()
+            if mat:
+                new_cell.options["MAT"] = Material(
+                    composition=compositions[mat.composition], density=mat.density
+                )
+            new_cell.options["U"] = result
+            result._cells.append(new_cell)
+        return result
+
     def find_common_materials(self):
         """Finds common materials among universes included.
 
@@ -530,6 +575,18 @@ class Universe:
                 surfs.update(c.options["FILL"]["universe"].get_surfaces(inner))
         return surfs
 
+    def surface_table(self, inner: bool = False) -> SurfaceTable:
+        """Gets all surfaces of the universe stored in arrays.
+
+        Args:
+            inner:  Whether to take surfaces of inner universes. Default: False -
+                    take surfaces of this universe only.
+
+        Returns:
+            The table of the surfaces ordered by name, unnamed surfaces go last.
+        """
+        return SurfaceTable(sorted(self.get_surfaces(inner), key=_surface_order_key))
+
     def get_surfaces_list(self, inner: bool = False):
         def reducer(surfaces_list, cell):
             surfaces_list.extend(cell.shape.get_surfaces())
@@ -570,6 +627,37 @@ class Universe:
                 universes.update(u.get_universes())
         return universes
 
+    def merge_close_surfaces(self, tol: float = 1.0e-10) -> dict[Surface, tuple[Surface, int]]:
+        """Replaces the surfaces close to other surfaces of this universe.
+
+        Modifies current universe. The surface with the least name is kept from the close ones.
+        The planes are also merged with the close planes of reversed direction.
+        Inner universes are not processed.
+
+        Args:
+            tol: Relative and absolute tolerance for the surfaces parameters.
+
+        Returns:
+            The applied replacement dictionary, see :func:`create_replace_dictionary`.
+        """
+        replace = create_replace_dictionary(
+            sorted(self.get_surfaces(), key=_surface_order_key), tol=tol
+        )
+        if replace:
+            replace_dict = {
+                s: us if sense > 0 else Shape("C", us) for s, (us, sense) in replace.items()
+            }
+            self._cells = [
+                c
+                if replace.keys().isdisjoint(c.shape.get_surfaces())
+                else Body(
+                    c.shape.replace_surfaces(replace_dict), **filter_dict(c.options, "original")
+                )
+                for c in self
+            ]
+            self._reset_registries()
+        return replace
+
     def name(self) -> Name:
         """Gets numeric name of the universe."""
         return self._name
@@ -666,6 +754,7 @@ class Universe:
                 if m not in self._common_materials:
                     m.rename(start_mat)
                     start_mat += 1
+        self._reset_registries()
 
     def check_clashes(self) -> None:
         result = self.name_clashes()
@@ -781,6 +870,7 @@ class Universe:
         _LOG.info(f"{len(self._cells) - len(new_cells)} empty cells were deleted.")
 
         self._cells = new_cells
+        self._reset_registries()
 
     def test_points(self, points: npt.ArrayLike[float]) -> npt.NDArray[int]:
         """Finds cell to which each point belongs to.
@@ -807,7 +897,8 @@ class Universe:
         Returns:
              a new universe with applied transformation.
         """
-        new_cells = [c.transform(tr) for c in self]
+        transformed_surfaces = transform_surfaces(self.get_surfaces(), tr)
+        new_cells = [c.transform(tr, transformed_surfaces) for c in self]
         return Universe(
             new_cells,
             name=self._name,
@@ -816,13 +907,28 @@ class Universe:
             comment=self._comment,
         )
 
-    def apply_transformation(self) -> Universe:
+    def apply_transformation(
+        self,
+        instancing: bool = False,
+        cache: dict[tuple[Universe, Transformation | None], Universe] | None = None,
+    ) -> Universe:
         """Applies transformations specified in cells.
 
+        A filling universe is transformed once for each transformation it is filled with,
+        the cells filled the same way share the transformed universe.
+
+        Args:
+            instancing: Keep FILL transformations for output instead of applying them,
+                so a filling universe is transformed only once.
+            cache: The filling universes and transformations mapped to the transformed
+                universes, shared with the outer universes.
+
         Returns:
              a new universe.
         """
-        new_cells = [c.apply_transformation() for c in self]
+        if cache is None:
+            cache = {}
+        new_cells = [c.apply_transformation(instancing, cache) for c in self]
         return Universe(
             new_cells,
             name=self._name,
@@ -841,13 +947,70 @@ class Universe:
         return self._comment
 
 
+class _Registry:
+    """Entities of a universe with their names and the next free name.
+
+    The entities are mapped to themselves to find equal ones.
+    """
+
+    def __init__(self, entities: Iterable[Any] = ()) -> None:
+        self.entities: dict[Any, Any] = {}
+        self.names: set[int] = set()
+        self.next_name = 1
+        for entity in entities:
+            self.add(entity)
+
+    def add(self, entity: Any) -> None:
+        self.entities[entity] = entity
+        self.add_name(entity.name())
+
+    def add_name(self, name: int) -> None:
+        self.names.add(name)
+        if self.next_name <= name:
+            self.next_name = name + 1
+
+
+class _Registries:
+    """Cells names, surfaces and compositions of a universe.
+
+    The registries are updated incrementally on adding cells to the universe.
+    """
+
+    def __init__(self, universe: Universe) -> None:
+        self.cells = _Registry()
+        for c in universe:
+            self.cells.add_name(c.name())
+        self.surfaces = _Registry()
+        self.reversed_planes: dict[Plane, Plane] = {}
+        for s in universe.get_surfaces():
+            self.add_surface(s)
+        self.compositions = _Registry(universe._common_materials.union(universe.get_compositions()))
+
+    def add_surface(self, surface: Surface) -> None:
+        self.surfaces.add(surface)
+        if isinstance(surface, Plane) and surface.transformation is None:
+            self.reversed_planes[surface.reverse()] = surface
+
+    def find_reversed_plane(self, plane: Plane) -> Plane | None:
+        """Find the registered plane with the opposite normal.
+
+        The transformation of the given plane is ignored, only the registered planes
+        without transformation are considered.
+        """
+        if plane.transformation is not None:
+            plane = Plane(plane._v, plane._k)
+        return self.reversed_planes.get(plane)
+
+
 @attrs
 class _UniverseCellsGroup:
     universe: Universe = attrib()
     cells: list[Body] = attrib()
 
 
-def produce_universes(cells: Iterable[Body]) -> Universe:
+def produce_universes(
+    cells: Iterable[Body], universes: dict[Name, Universe] | None = None
+) -> Universe:
     """Creates groups from cells.
 
     The function groups all the cells by 'universe' option value,
@@ -857,27 +1020,39 @@ def produce_universes(cells: Iterable[Body]) -> Universe:
     ----------
     cells : Iterable[Body]
         Cells to process.
+    universes : dict, optional
+        Ready universes to use for the groups with the given names instead of
+        creating new ones from the cells. The universes are copied, so they are
+        not changed, but their cells are not checked for name clashes again.
 
     Returns:
     -------
     universe : Universe
         The top level universe with name = 0.
     """
+    if universes is None:
+        universes = {}
     groups: dict[Name, _UniverseCellsGroup] = {}
     for c in cells:
         universe_no: Name = c.options.get("U", 0)
         if universe_no in groups:
             groups[universe_no].cells.append(c)
         else:
-            new_group = _UniverseCellsGroup(universe=Universe([], universe_no), cells=[c])
+            ready_universe = universes.get(universe_no)
+            if ready_universe is None:
+                universe = Universe([], universe_no)
+            else:
+                universe = ready_universe._detached_copy()
+            new_group = _UniverseCellsGroup(universe=universe, cells=[c])
             groups[universe_no] = new_group
     for c in cells:
         fill: dict[str, Any] = c.options.get("FILL", None)
         if fill is not None:
             fill_universe_no = fill["universe"]
             fill["universe"] = groups[fill_universe_no].universe
-    for group in groups.values():
-        group.universe.add_cells(group.cells, name_rule="keep")
+    for universe_no, group in groups.items():
+        if universe_no not in universes:
+            group.universe.add_cells(group.cells, name_rule="keep")
     top_universe = groups[0].universe
     top_universe.set_common_materials(top_universe.find_common_materials())
     return top_universe
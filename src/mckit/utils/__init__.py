@@ -15,6 +15,7 @@ from mckit.utils.misc import (
     MAX_DIGITS,
     are_equal,
     compute_hash,
+    decades_array,
     deepcopy,
     filter_dict,
     get_decades,
@@ -40,6 +41,7 @@ __all__ = [
     "check_if_all_paths_exist",
     "check_if_path_exists",
     "compute_hash",
+    "decades_array",
     "deepcopy",
     "filter_dict",
     "get_decades",
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import TypeVar
+from typing import Any, TypeVar
 
 from collections.abc import Callable, Iterable
 from functools import reduce
@@ -68,6 +68,66 @@ class IgnoringIndex(Index[Key, Item]):
         Index.__init__(self, ignore, **kwargs)
 
 
+class LazyIndex(Index[Key, Item]):
+    """Index creating items from their sources on the first request.
+
+    An item is created with `factory` from the source found by the key in `sources`.
+    If there's no source for a key, then `default_factory` is used as in `Index`.
+    The factory may request other items from this or other lazy indexes,
+    so, dependencies are resolved recursively.
+    On cyclic request of the same key, `default_factory` is used as well.
+
+    Attrs:
+        _sources: the items sources by keys
+        _factory: method to create an item from its source
+        _pending: the keys of the items being created
+    """
+
+    def __init__(
+        self,
+        sources: dict[Key, Any],
+        factory: Callable[[Any], Item],
+        default_factory: FactoryMethodWithKey | None = None,
+    ) -> None:
+        """Create `LazyIndex`.
+
+        Args:
+            sources: the items sources by keys
+            factory: method to create an item from its source
+            default_factory: factory method to call on absent `key`
+        """
+        super().__init__(default_factory)
+        self._sources = sources
+        self._factory = factory
+        self._pending: set[Key] = set()
+
+    @property
+    def sources(self) -> dict[Key, Any]:
+        """The sources of all the items, both created and not."""
+        return self._sources
+
+    def __missing__(self, key: Key) -> Item | None:
+        """Create the item by `key`, if there's source for it and the key is not being created."""
+        source = self._sources.get(key)
+        if source is None or key in self._pending:
+            return super().__missing__(key)
+        self._pending.add(key)
+        try:
+            item = self._factory(source)
+        finally:
+            self._pending.discard(key)
+        self[key] = item
+        return item
+
+    def materialize(self) -> list[Item]:
+        """Create all the items.
+
+        Returns:
+            The items in the order of the sources.
+        """
+        return [self[key] for key in self._sources]
+
+
 class NumberedItemNotFoundError(KeyError):
     """Error to raise, when an item is not found in an `Index`."""
 
@@ -19,6 +19,14 @@ from ..constants import FLOAT_TOLERANCE
 
 MAX_DIGITS = np.finfo(float).precision
 
+# Vectorized rounding is exact with the powers of ten, which are exactly representable by floats.
+_MAX_EXACT_POWER_OF_TEN = 22
+_POWERS_OF_TEN = np.array([float(10**i) for i in range(_MAX_EXACT_POWER_OF_TEN + 1)])
+_MAX_EXACT_INTEGER = float(2**52)
+_HALF_INTEGER_MARGIN = 2.0 * np.finfo(float).eps
+# Below this size the scalar functions are faster than the vectorized ones.
+_MIN_VECTORIZED_SIZE = 32
+
 if TYPE_CHECKING:
     from numpy.typing import NDArray
 
@@ -78,14 +86,58 @@ def get_decades(value: float) -> int:
     return int(decades)
 
 
+def decades_array(array: FloatArray) -> IntArray:
+    """Vectorized version of :func:`get_decades`.
+
+    Args:
+        array: values to check
+
+    Returns:
+        Number of decades for each value.
+    """
+    values = np.abs(np.asarray(array, dtype=float))
+    with np.errstate(divide="ignore"):
+        decimal_power = np.where(values != 0.0, np.log10(values), 0.0)
+    decades = np.trunc(decimal_power).astype(int)
+    decades[decimal_power < 0.0] -= 1
+    return decades
+
+
 def significant_array(
     array: FloatArray, reltol: float = FLOAT_TOLERANCE, resolution: float | None = None
 ) -> IntArray:
-    """Compute the minimum numbers of significant digits to achieve desired tolerance."""
-    result = np.empty_like(array, dtype=int)
-    for index in zip(*map(np.ravel, np.indices(array.shape)), strict=False):
-        value = array[index].item()
-        result[index] = significant_digits(value, reltol, resolution)
+    """Compute the minimum numbers of significant digits to achieve desired tolerance.
+
+    The binary search of :func:`significant_digits` is run for all the values at once.
+    The results are the same as for :func:`significant_digits` applied to each value.
+    """
+    values = np.asarray(array, dtype=float)
+    if values.size < _MIN_VECTORIZED_SIZE:
+        result = np.empty(values.shape, dtype=int)
+        for index, value in np.ndenumerate(values):
+            result[index] = significant_digits(value.item(), reltol, resolution)
+        return result
+    magnitudes = np.abs(values)
+    nonzero = magnitudes != 0.0
+    if resolution:
+        nonzero &= magnitudes >= resolution
+    low = np.minimum(decades_array(values), 0)
+    high = np.full(values.shape, MAX_DIGITS)
+    d = magnitudes.copy()
+    active = nonzero & (high - low > 1)
+    while active.any():
+        value = values[active]
+        p = np.rint(0.5 * (high[active] + low[active])).astype(int)
+        v = _round_to_digits(value, p)
+        da = np.maximum(magnitudes[active], np.abs(v))
+        d[active] = da
+        coarse = np.abs(value - v) > reltol * da
+        low[active] = np.where(coarse, p, low[active])
+        high[active] = np.where(coarse, high[active], p)
+        active = nonzero & (high - low > 1)
+    v = _round_to_digits(values, low)
+    result = np.where(np.abs(values - v) < reltol * d, low, high)
+    result[~nonzero] = 0
     return result
 
 
@@ -107,6 +159,8 @@ def round_scalar(value: float, digits: int | None = None) -> float:
 def round_array(array: FloatArray, digits_array: IntArray | None = None) -> ndarray:
     """Rounds array to desired precision.
 
+    The result is the same as for :func:`round_scalar` applied to each value.
+
     Args:
         array:   Array of values.
         digits_array:   Array of corresponding significant digits.
@@ -114,12 +168,42 @@ def round_array(array: FloatArray, digits_array: IntArray | None = None) -> ndar
     Returns:
         Rounded array.
     """
+    array = np.asarray(array, dtype=float)
     if digits_array is None:
         digits_array = significant_array(array, FLOAT_TOLERANCE, FLOAT_TOLERANCE)
-    result: ndarray = np.empty_like(array)
-    for index in zip(*map(np.ravel, np.indices(array.shape)), strict=False):
-        digits: int = digits_array[index].item()
-        result[index] = round_scalar(array[index].item(), digits)
+    digits_array = np.asarray(digits_array)
+    if array.size < _MIN_VECTORIZED_SIZE:
+        result: ndarray = np.empty_like(array)
+        for index, value in np.ndenumerate(array):
+            result[index] = round(value.item(), digits_array[index].item())
+        return result
+    return _round_to_digits(array, digits_array)
+
+
+def _round_to_digits(values: FloatArray, digits: IntArray) -> FloatArray:
+    """Round values as the builtin `round()` does, but for all the values at once.
+
+    The scaled value is rounded to integer and scaled back with exact powers of ten,
+    which gives correctly rounded result, as `round()` does, unless the scaled value
+    is too close to a half-integer. Such values, the values not fitting in the
+    integer range of floats and too large `digits` are rounded one by one.
+    """
+    digits = np.broadcast_to(digits, values.shape)
+    positive = digits >= 0
+    scales = _POWERS_OF_TEN[np.minimum(np.abs(digits), _MAX_EXACT_POWER_OF_TEN)]
+    with np.errstate(invalid="ignore", over="ignore"):
+        scaled = np.where(positive, values * scales, values / scales)
+        integers = np.rint(scaled)
+        result = np.where(positive, integers / scales, integers * scales)
+        fractions = np.abs(scaled - np.trunc(scaled))
+        exact = (
+            (np.abs(digits) <= _MAX_EXACT_POWER_OF_TEN)
+            & (np.abs(scaled) < _MAX_EXACT_INTEGER)
+            & (np.abs(fractions - 0.5) > np.abs(scaled) * _HALF_INTEGER_MARGIN)
+        )
+    if not exact.all():
+        for index in zip(*np.nonzero(~exact), strict=True):
+            result[index] = round(values[index].item(), digits[index].item())
     return result
 
 
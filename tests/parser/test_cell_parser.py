@@ -173,6 +173,21 @@ def test_found_failures(text, expected):
     assert actual.name() == expected
 
 
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("1 0 -1", set()),
+        ("2 LIKE 1 BUT TRCL=1", {1}),
+        ("3 like 2 but mat=1 rho=-1.0", {2}),
+        ("4 0 -1 #2 # 3 #(1 -2)", {2, 3}),
+        ("5 0 -1 $ #7 is not a reference in comment\nc #8 either\n      #9", {9}),
+    ],
+)
+def test_scan_referenced_cells(text, expected):
+    actual = clp.scan_referenced_cells(text)
+    assert actual == expected
+
+
 def create_dummy_surface_index(surfaces: list[int]) -> Index:
     return SurfaceStrictIndex.from_iterable(map(DummySurface, surfaces))
 
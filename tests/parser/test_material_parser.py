@@ -115,5 +115,28 @@ def test_composition_parser(text, expected):
     assert result.options == expected.options
 
 
+@pytest.mark.parametrize(
+    "text",
+    [
+        "m1 1001.21c -1.0",
+        "M1000\n 1001.21C -1.0\n gas 1",
+        "m1 1001 0.1 1002 .9",
+        "m3 1001 0.1 1002 0.9e-1 gas=1 nlib=21c PLIB 04p",
+    ],
+)
+def test_fast_parser_is_equivalent_to_sly(text):
+    actual = mp.parse_fast(text)
+    expected = mp.Parser().parse(mp.Lexer().tokenize(text))
+    assert actual == expected
+    assert actual.options == expected.options
+
+
+@pytest.mark.parametrize(
+    "text", ["m1", "m1 1001 0.1 &\n 1002 0.9", "m1 1001 0.1 gas", "m1 1001 0.1 xlib 1"]
+)
+def test_fast_parser_falls_back_on_unusual_syntax(text):
+    assert mp.parse_fast(text) is None
+
+
 if __name__ == "__main__":
     pytest.main()
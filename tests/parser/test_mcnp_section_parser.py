@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from contextlib import closing
 from io import StringIO
 
 import pytest
@@ -368,3 +369,61 @@ def test_print(text, expected):
         expected = text.strip()
     actual = out.getvalue().strip()
     assert actual == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "test\n1 0 1\n",
+        """message: a message
+
+test
+c some comment
+c second line
+1 0 1 $bla bla bla
+     2 $continuation
+c trailing comment
+2
+    0 -1  $something
+c z-z-zz-z-z-z
+
+1 so 1
+
+m1 1001 1.0
+c comment
+tr1 1 2 3
+sdef
+c last comment
+
+remainder 1
+
+remainder 2
+""",
+        "continue\nctme 3000\n",
+        "test\r\n1 0 1\r\n     imp:n=1\r\n\r\n1 so 1\r\n",
+    ],
+)
+def test_mapped_input_sections(tmp_path, text):
+    path = tmp_path / "model.i"
+    path.write_bytes(text.encode())
+    expected = sp.parse_sections_text(text.replace("\r\n", "\n"))
+    with closing(sp.MappedInputSections(path)) as actual:
+        assert actual.message == expected.message
+        assert actual.title == expected.title
+        assert actual.is_continue == expected.is_continue
+        assert list(actual.cell_cards()) == (expected.cell_cards or [])
+        assert list(actual.surface_cards()) == (expected.surface_cards or [])
+        data_cards = list(actual.data_cards())
+        assert data_cards == (expected.data_cards or [])
+        assert actual.remainder == expected.remainder
+    content = path.read_bytes()
+    for card in data_cards:
+        start, end = card.span
+        assert content[start:end].decode() == card.text
+
+
+def test_mapped_input_sections_without_title(tmp_path):
+    path = tmp_path / "model.i"
+    path.write_bytes(b"")
+    with pytest.raises(ValueError, match="Cannot find the MCNP model title"):
+        sp.MappedInputSections(path)
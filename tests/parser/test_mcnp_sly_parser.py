@@ -4,7 +4,19 @@ from typing import NamedTuple
 
 import pytest
 
-from mckit.parser.mcnp_input_sly_parser import ParseResult, from_file, from_text
+import mckit.parser.mcnp_input_sly_parser as sly_parser
+
+from mckit.parser.common import CellNotFoundError
+from mckit.parser.mcnp_input_sly_parser import (
+    MissedCellsError,
+    ParseResult,
+    from_file,
+    from_file_lazy,
+    from_text,
+    from_text_lazy,
+    reparse_text,
+)
+from mckit.universe import Universe
 from mckit.utils import path_resolver
 
 file_resolver = path_resolver("tests.parser")
@@ -295,3 +307,270 @@ def test_mcnp_parser(parse_file, expected):
     # assert expected['cells'] == result.cells
     # assert expected['surfaces'] == result.surfaces
     # assert expected['data'] == result.data
+
+
+@pytest.mark.parametrize("parse_file", ["data/parser1.txt", "data/parser2.txt"])
+def test_parsing_with_workers(parse_file):
+    parse_file = file_resolver(parse_file)
+    expected: ParseResult = from_file(parse_file)
+    actual: ParseResult = from_file(parse_file, workers=2)
+    assert actual.title == expected.title
+    assert actual.surfaces == expected.surfaces
+    assert actual.compositions == expected.compositions
+    assert [s.options for s in actual.surfaces] == [s.options for s in expected.surfaces]
+    assert [c.name() for c in actual.cells] == [c.name() for c in expected.cells]
+    assert [c.shape for c in actual.cells] == [c.shape for c in expected.cells]
+    assert len(actual.universe) == len(expected.universe)
+
+
+def test_like_but_chain_is_parsed_once(monkeypatch):
+    text = """like-but chain in reverse order
+5 like 4 but imp:n=5
+4 like 3 but imp:n=4
+3 like 2 but imp:n=3
+2 like 1 but imp:n=2
+1 0 -1 imp:n=1
+6 0 1 #5 imp:n=0
+
+1 so 100
+"""
+    parsed = []
+    original_parse_cell = sly_parser.parse_cell
+
+    def parse_cell(text, **kwargs):
+        parsed.append(text)
+        return original_parse_cell(text, **kwargs)
+
+    monkeypatch.setattr(sly_parser, "parse_cell", parse_cell)
+    result: ParseResult = from_text(text)
+    assert len(parsed) == 6, "Every cell should be parsed exactly once"
+    assert [c.name() for c in result.cells] == [5, 4, 3, 2, 1, 6]
+    assert [c.options["IMPN"] for c in result.cells] == [5, 4, 3, 2, 1, 0]
+    assert result.cells[0].shape == result.cells[4].shape
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        (
+            """missed cell
+1 0 -1 imp:n=1
+2 like 3 but imp:n=2
+4 like 2 but imp:n=2
+5 0 1 imp:n=0
+
+1 so 100
+""",
+            [2, 4],
+        ),
+        (
+            """cyclic references
+c comment to shift cards indices
+1 0 -1 #2 imp:n=1
+c another comment
+2 0 -1 #1 imp:n=1
+3 0 1 imp:n=0
+
+1 so 100
+""",
+            [1, 2],
+        ),
+    ],
+)
+def test_missed_cells(text, expected):
+    with pytest.raises(MissedCellsError) as ex:
+        from_text(text)
+    assert ex.value.missed_cells == expected
+
+
+@pytest.mark.parametrize("parse_file", ["data/parser1.txt", "data/parser2.txt"])
+def test_lazy_parsing(parse_file):
+    parse_file = file_resolver(parse_file)
+    expected: ParseResult = from_file(parse_file)
+    actual = from_file_lazy(parse_file)
+    assert actual.title == expected.title
+    assert actual.surfaces == expected.surfaces
+    assert [s.options for s in actual.surfaces] == [s.options for s in expected.surfaces]
+    assert actual.compositions == expected.compositions
+    assert actual.transformations == expected.transformations
+    assert [c.name() for c in actual.cells] == [c.name() for c in expected.cells]
+    assert [c.shape for c in actual.cells] == [c.shape for c in expected.cells]
+    assert len(actual.universe) == len(expected.universe)
+
+
+def test_lazy_parsing_creates_only_requested_entities(monkeypatch):
+    text = """lazy parsing
+1 1 -1.0 -1 imp:n=1
+2 0 1 -2 imp:n=1
+3 like 2 but imp:n=3
+4 0 2 imp:n=0
+
+1 so 10
+2 so 20
+3 so 30
+
+m1 1001 1.0
+m2 8016 1.0
+"""
+    parsed = []
+    original_parse_cell = sly_parser.parse_cell
+
+    def parse_cell(text, **kwargs):
+        parsed.append(text)
+        return original_parse_cell(text, **kwargs)
+
+    monkeypatch.setattr(sly_parser, "parse_cell", parse_cell)
+    result = from_text_lazy(text)
+    assert not parsed
+    assert list(result.cells_index.sources) == [1, 2, 3, 4]
+    cell = result.cells_index[3]
+    assert cell.options["IMPN"] == 3
+    assert sorted(result.cells_index) == [2, 3]
+    assert sorted(result.surfaces_index) == [1, 2]
+    assert not result.compositions_index
+    assert result.cells_index[1].material().composition is result.compositions_index[1]
+    assert len(parsed) == 3
+
+
+def test_lazy_parsing_of_cyclic_references():
+    text = """cyclic references
+1 0 -1 #2 imp:n=1
+2 0 -1 #1 imp:n=1
+
+1 so 100
+"""
+    result = from_text_lazy(text)
+    with pytest.raises(CellNotFoundError, match="Cell #1 is not found"):
+        _ = result.cells_index[1]
+
+
+REPARSE_TEXT = """reparse
+1 1 -1.0 -1 imp:n=1
+2 0 1 -2 imp:n=1
+3 like 2 but imp:n=3
+4 0 -3 imp:n=1
+5 0 2 3 imp:n=0
+
+1 so 10
+2 so 20
+3 1 px 30
+
+m1 1001 1.0
+tr1 1 0 0
+"""
+
+
+@pytest.mark.parametrize(
+    "old, new, expected_parsed",
+    [
+        ("tr1 1 0 0", "tr1 2 0 0", [4, 5]),
+        ("2 so 20", "2 so 25", [2, 3, 5]),
+        ("1 so 10", "1 so 10 $ changed comment", [1, 2, 3]),
+        ("m1 1001 1.0", "m1 1002 1.0", [1]),
+        ("2 0 1 -2 imp:n=1", "2 0 1 -2 imp:n=2", [2, 3]),
+        ("4 0 -3 imp:n=1", "4 0 -3 imp:n=4", [4]),
+    ],
+)
+def test_reparse_text(monkeypatch, old, new, expected_parsed):
+    previous = from_text(REPARSE_TEXT)
+    text = REPARSE_TEXT.replace(old, new)
+    parsed = []
+    original_parse_cell = sly_parser.parse_cell
+
+    def parse_cell(text, **kwargs):
+        parsed.append(int(text.split(maxsplit=1)[0]))
+        return original_parse_cell(text, **kwargs)
+
+    monkeypatch.setattr(sly_parser, "parse_cell", parse_cell)
+    actual = reparse_text(previous, text)
+    assert sorted(parsed) == expected_parsed
+    for name, cell in actual.cells_index.items():
+        assert (cell is previous.cells_index[name]) == (name not in expected_parsed)
+    expected = from_text(text)
+    assert actual.surfaces == expected.surfaces
+    assert actual.compositions == expected.compositions
+    assert actual.transformations == expected.transformations
+    assert [c.name() for c in actual.cells] == [c.name() for c in expected.cells]
+    assert [c.shape for c in actual.cells] == [c.shape for c in expected.cells]
+    assert [c.options.get("IMPN") for c in actual.cells] == [
+        c.options.get("IMPN") for c in expected.cells
+    ]
+    assert len(actual.universe) == len(expected.universe)
+    for surface in actual.surfaces:
+        for cell in actual.cells:
+            for s in cell.shape.get_surfaces():
+                if s.name() == surface.name():
+                    assert s is surface
+
+
+@pytest.mark.parametrize("parse_file", ["data/parser1.txt", "data/parser2.txt"])
+def test_reparse_unchanged_text(parse_file):
+    text = file_resolver(parse_file).read_text()
+    previous = from_text(text)
+    actual = reparse_text(previous, text)
+    assert all(a is e for a, e in zip(actual.surfaces, previous.surfaces, strict=True))
+    assert [c.name() for c in actual.cells] == [c.name() for c in previous.cells]
+    assert len(actual.universe) == len(previous.universe)
+
+
+REPARSE_UNIVERSES_TEXT = """reparse universes
+1 0 -1 fill=1 imp:n=1
+2 0 1 -4 fill=2 imp:n=1
+3 0 4 imp:n=0
+10 0 -2 u=1 imp:n=1
+11 0 2 u=1 imp:n=1
+20 0 -3 u=2 imp:n=1
+21 0 3 u=2 imp:n=1
+
+1 so 100
+2 so 10
+3 so 20
+4 so 200
+"""
+
+
+@pytest.mark.parametrize(
+    "old, new, reused",
+    [
+        ("11 0 2 u=1 imp:n=1", "11 0 2 u=1 imp:n=2", {2}),
+        ("21 0 3 u=2 imp:n=1", "21 0 3 u=2 imp:n=2", {1}),
+        ("3 0 4 imp:n=0", "3 0 4 imp:n=0 $ changed", {1, 2}),
+    ],
+)
+def test_reparse_reuses_unchanged_universes(monkeypatch, old, new, reused):
+    previous = from_text(REPARSE_UNIVERSES_TEXT)
+    previous_universes = {u.name(): u for u in previous.universe.get_universes()}
+    text = REPARSE_UNIVERSES_TEXT.replace(old, new)
+    copied = []
+    original_detached_copy = Universe._detached_copy
+
+    def detached_copy(universe):
+        copied.append(universe)
+        return original_detached_copy(universe)
+
+    monkeypatch.setattr(Universe, "_detached_copy", detached_copy)
+    actual = reparse_text(previous, text)
+    actual_universes = {u.name(): u for u in actual.universe.get_universes()}
+    assert actual_universes.keys() == previous_universes.keys()
+    assert {u.name() for u in copied} == reused
+    assert all(u is previous_universes[u.name()] for u in copied)
+    expected = from_text(text)
+    for universe in expected.universe.get_universes():
+        actual_universe = actual_universes[universe.name()]
+        assert [c.name() for c in actual_universe] == [c.name() for c in universe]
+        assert [c.options.get("IMPN") for c in actual_universe] == [
+            c.options.get("IMPN") for c in universe
+        ]
+
+
+def test_reparse_keeps_previous_universes():
+    previous = from_text(REPARSE_UNIVERSES_TEXT)
+    text = REPARSE_UNIVERSES_TEXT.replace("21 0 3 u=2 imp:n=1", "21 0 3 u=2 imp:n=2")
+    actual = reparse_text(previous, text)
+    actual_universes = {u.name(): u for u in actual.universe.get_universes()}
+    actual_universes[1].rename(start_cell=100, start_surf=50)
+    assert [c.name() for c in actual_universes[1]] == [100, 101]
+    previous_universes = {u.name(): u for u in previous.universe.get_universes()}
+    assert [c.name() for c in previous_universes[1]] == [10, 11]
+    assert sorted(s.name() for s in previous_universes[1].get_surfaces()) == [2]
+    assert all(c.options["U"] is previous_universes[1] for c in previous_universes[1])
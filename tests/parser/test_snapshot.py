@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import pytest
+
+import mckit.parser.mcnp_input_sly_parser as sly_parser
+
+from mckit.parser.mcnp_input_sly_parser import from_file, from_text
+from mckit.parser.snapshot import (
+    SNAPSHOTS_ENV,
+    load_snapshot,
+    save_snapshot,
+    snapshot_key,
+    snapshot_path,
+)
+from mckit.utils import path_resolver
+
+file_resolver = path_resolver("tests.parser")
+
+
+@pytest.fixture
+def parsed():
+    path = file_resolver("data/parser2.txt")
+    text = path.read_text()
+    return text, from_text(text)
+
+
+def test_snapshot_roundtrip(tmp_path, parsed):
+    text, expected = parsed
+    key = snapshot_key(text)
+    path = snapshot_path(tmp_path, key)
+    save_snapshot(expected, path, key)
+    actual = load_snapshot(path, key)
+    assert actual.title == expected.title
+    assert len(actual.surfaces) == len(expected.surfaces)
+    for a, e in zip(actual.surfaces, expected.surfaces, strict=True):
+        assert type(a) is type(e)
+        assert a == e
+        assert hash(a) == hash(e)
+        assert a.options == e.options
+        assert a.mcnp_words() == e.mcnp_words()
+    for a, e in zip(actual.cells, expected.cells, strict=True):
+        assert a.name() == e.name()
+        assert a.shape == e.shape
+    assert actual.compositions == expected.compositions
+    assert actual.transformations == expected.transformations
+    assert len(actual.universe) == len(expected.universe)
+
+
+def test_snapshot_preserves_surfaces_identity(tmp_path, parsed):
+    text, expected = parsed
+    key = snapshot_key(text)
+    path = snapshot_path(tmp_path, key)
+    save_snapshot(expected, path, key)
+    actual = load_snapshot(path, key)
+    surfaces = {id(s) for s in actual.surfaces}
+    for cell in actual.cells:
+        assert all(id(s) in surfaces for s in cell.shape.get_surfaces())
+    assert actual.surfaces_index[1] is actual.surfaces[0]
+    transformations = {id(t) for t in actual.transformations}
+    for surface in actual.surfaces:
+        transformation = surface.transformation
+        if transformation is not None:
+            assert id(transformation) in transformations
+
+
+@pytest.mark.parametrize("damage", [b"", b"MCKITSNP", b"garbage"])
+def test_damaged_snapshot_is_ignored(tmp_path, damage):
+    path = tmp_path / "damaged"
+    path.write_bytes(damage)
+    assert load_snapshot(path, "key") is None
+
+
+@pytest.mark.parametrize("size", [200, 0.5, 0.9, -1])
+def test_truncated_snapshot_is_ignored(tmp_path, parsed, size):
+    text, expected = parsed
+    key = snapshot_key(text)
+    path = snapshot_path(tmp_path, key)
+    save_snapshot(expected, path, key)
+    data = path.read_bytes()
+    path.write_bytes(data[: size if isinstance(size, int) else int(size * len(data))])
+    assert load_snapshot(path, key) is None
+
+
+def test_corrupted_snapshot_is_ignored(tmp_path, parsed):
+    text, expected = parsed
+    key = snapshot_key(text)
+    path = snapshot_path(tmp_path, key)
+    save_snapshot(expected, path, key)
+    data = bytearray(path.read_bytes())
+    middle = len(data) // 2
+    data[middle : middle + 64] = bytes(64)
+    path.write_bytes(data)
+    assert load_snapshot(path, key) is None
+
+
+def test_from_text_parses_again_damaged_snapshot(tmp_path):
+    text = "test\n1 0 -1\n\n1 so 1\n"
+    expected = from_text(text, snapshots=tmp_path)
+    (path,) = tmp_path.iterdir()
+    path.write_bytes(path.read_bytes()[:200])
+    actual = from_text(text, snapshots=tmp_path)
+    assert actual.surfaces == expected.surfaces
+
+
+def test_snapshot_with_other_key_is_ignored(tmp_path, parsed):
+    text, expected = parsed
+    key = snapshot_key(text)
+    path = snapshot_path(tmp_path, key)
+    save_snapshot(expected, path, key)
+    assert load_snapshot(path, snapshot_key(text + "\n")) is None
+
+
+def test_from_file_uses_snapshots(tmp_path, monkeypatch):
+    path = file_resolver("data/parser1.txt")
+    expected = from_file(path, snapshots=tmp_path)
+    assert len(list(tmp_path.iterdir())) == 1
+
+    def fail(*_args):
+        raise AssertionError("The model should be loaded from snapshot")
+
+    monkeypatch.setattr(sly_parser, "_parse_text", fail)
+    actual = from_file(path, snapshots=tmp_path)
+    assert [c.name() for c in actual.cells] == [c.name() for c in expected.cells]
+    assert actual.surfaces == expected.surfaces
+
+
+def test_snapshots_directory_from_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv(SNAPSHOTS_ENV, str(tmp_path))
+    from_text("test\n1 0 -1\n\n1 so 1\n")
+    assert len(list(tmp_path.iterdir())) == 1
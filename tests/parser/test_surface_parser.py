@@ -105,5 +105,38 @@ def test_absent_surface_with_dummy_strategy(text, expected):
     assert actual == expected
 
 
+@pytest.mark.parametrize(
+    "text",
+    [
+        "1 PX 0",
+        "+2 py 2",
+        "*1 P 1.5 1.4 1.3 1.2",
+        "1 1 SX 4 +5.0",
+        "3 c/z 1.0e+01 -2 .5",
+        "4 gq 1 1 1 0 0 0 0 0 0 -1",
+        "158214   RPP  +558.36 +902.00  &\n -428.58 -105.42 &\n +438.70 +662.54",
+    ],
+)
+def test_fast_parser_is_equivalent_to_sly(text):
+    transformations = ti.TransformationDummyIndex()
+    actual = srp.parse_fast(text, transformations)
+    expected = srp.Parser(transformations).parse(srp.Lexer().tokenize(text))
+    assert actual == expected
+    assert actual.options == expected.options
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "1 PX 1d-5",
+        "1 PX",
+        "1 PQ 1",
+        "-1 PX 1",
+    ],
+)
+def test_fast_parser_falls_back_on_unusual_syntax(text):
+    assert srp.parse_fast(text, ti.TransformationDummyIndex()) is None
+
+
 if __name__ == "__main__":
     pytest.main()
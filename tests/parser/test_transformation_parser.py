@@ -61,5 +61,32 @@ def test_transformation_parser(text, expected):
     assert actual == expected
 
 
+@pytest.mark.parametrize(
+    "text",
+    [
+        "tr2 0 0 1",
+        " *tr2 0 0 1 45 45 90 135 45 90 90 90 0",
+        "*TR1 0. 0. 0. 3.62 86.38 90. 93.62 3.62 90. 90. 90. 0.",
+        "tr3 1 2 3 0 1 0 1 0 0 0 0 1 -1",
+        "tr4 1 2 3 &\n 1 0 0 0 1 0 0 0 1",
+    ],
+)
+def test_fast_parser_is_equivalent_to_sly(text):
+    actual = trp.parse_fast(text)
+    expected = trp.Parser().parse(trp.Lexer().tokenize(text))
+    assert actual == expected
+    assert actual.name() == expected.name()
+
+
+@pytest.mark.parametrize("text", ["tr1 0 0", "tr1 0 0 1d-5", "tr1 0 0 0 1 0 0 0 1 0 0 0 1 1.0"])
+def test_fast_parser_falls_back_on_unusual_syntax(text):
+    assert trp.parse_fast(text) is None
+
+
+def test_fast_parser_checks_m_option():
+    with pytest.raises(ValueError, match="Invalid M option value 2"):
+        trp.parse_fast("tr1 0 0 0 1 0 0 0 1 0 0 0 1 2")
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -5,6 +5,8 @@ from typing import Final
 import numpy as np
 import pytest
 
+from mckit.geometry import Shape as _Shape
+
 from mckit.body import Body, Shape
 from mckit.box import Box
 from mckit.material import Material
@@ -1919,6 +1921,30 @@ class TestShape:
         result = geometry[case_no].test_box(box[box_no])
         assert result == expected[box_no]
 
+    def test_box_cache_stat(self, geometry, box):
+        shape = geometry[3]
+        expected = shape.test_box(box[2])
+        assert expected != 0
+        hits, misses = shape.box_cache_stat()
+        assert shape.test_box(box[2]) == expected
+        assert shape.box_cache_stat() == (hits + 1, misses)
+
+    def test_collect_statistics_in_deep_box(self):
+        sphere = create_surface("SO", 1.0)
+        plane = create_surface("PX", 0.5)
+        shape = Shape("I", Shape("S", sphere), Shape("C", plane))
+        box = Box([0, 0, 0], 4, 4, 4)
+        box = box.split(dir="y")[1]
+        for _ in range(70):  # deeper than 64 bits of subdivision code
+            box = box.split(dir="y")[0]
+        shape.collect_statistics(box, 1.0)
+        assert {tuple(row) for row in shape.get_stat_table()} == {
+            (-1, -1),
+            (-1, 1),
+            (1, -1),
+            (1, 1),
+        }
+
     @pytest.mark.slow
     @pytest.mark.parametrize("tol", [0.2, None])
     @pytest.mark.parametrize(
@@ -1951,6 +1977,44 @@ class TestShape:
             assert bb.center[j] + bbd_halves_of_dimensions >= high
             assert bb.center[j] + bbd_halves_of_dimensions <= high + tol
 
+    @pytest.mark.parametrize(
+        "case, expected",
+        [
+            (("C", ("SO", 1.0)), [[-1, 1], [-1, 1], [-1, 1]]),
+            (("S", ("SO", 1.0)), [[-15, 15], [-15, 15], [-15, 15]]),
+            (("C", ("S", 1, 2, 3, 1)), [[0, 2], [1, 3], [2, 4]]),
+            (("C", ("RCC", 0, 0, 0, 3, 4, 0, 1)), [[-0.8, 3.8], [-0.6, 4.6], [-1, 1]]),
+            (("C", ("BOX", -1, -1, -1, 2, 0, 0, 0, 3, 0, 0, 0, 4)), [[-1, 1], [-1, 2], [-1, 3]]),
+            (("C", ("BOX", 0, 0, 0, 1, 1, 0, -1, 1, 0, 0, 0, 1)), [[-1, 1], [0, 2], [0, 1]]),
+            (("C", ("RPP", -1, 2, -3, 4, -5, 6)), [[-1, 2], [-3, 4], [-5, 6]]),
+            (("C", ("CZ", 2.0)), [[-2, 2], [-2, 2], [-15, 15]]),
+            (
+                ("I", ("C", ("CZ", 2.0)), ("S", ("PZ", -1.0)), ("C", ("PZ", 5.0))),
+                [[-2, 2], [-2, 2], [-1, 5]],
+            ),
+            (
+                ("U", ("C", ("SO", 1.0)), ("C", ("RPP", 0, 3, 0, 3, 0, 3))),
+                [[-1, 3], [-1, 3], [-1, 3]],
+            ),
+            (("I", ("C", ("SO", 2.0)), ("C", ("RPP", 0, 3, 0, 3, 0, 3))), [[0, 2], [0, 2], [0, 2]]),
+            (
+                ("U", ("C", ("SO", 1.0)), ("I", ("C", ("PX", -1.0)), ("S", ("PX", 1.0)))),
+                [[-1, 1], [-1, 1], [-1, 1]],
+            ),
+        ],
+    )
+    def test_analytic_bounding_box(self, case, expected):
+        def build(spec):
+            opc, *args = spec
+            if opc in {"S", "C"}:
+                kind, *params = args[0]
+                return Shape(opc, create_surface(kind, *params))
+            return Shape(opc, *(build(a) for a in args))
+
+        gb = Box([0, 0, 0], 30, 30, 30)
+        bb = build(case).bounding_box(tol=100.0, box=gb)
+        np.testing.assert_array_almost_equal(bb.bounds, expected)
+
     @pytest.mark.slow
     @pytest.mark.parametrize("box_no", range(len(box_data)))
     @pytest.mark.parametrize(
@@ -1970,6 +2034,24 @@ class TestShape:
         v = geometry[case_no].volume(box[box_no], min_volume=1.0e-4)
         assert v == pytest.approx(expected[box_no], rel=1.0e-2)
 
+    def test_volume_of_planes_cell_is_exact(self):
+        surfaces = [
+            create_surface("PX", -1.3),
+            create_surface("PX", 2.1),
+            create_surface("PY", -0.7),
+            create_surface("PY", 0.45),
+            create_surface("PZ", 0.1),
+            create_surface("PZ", 1.9),
+        ]
+        args = [Shape("S" if i % 2 == 0 else "C", s) for i, s in enumerate(surfaces)]
+        shape = Shape("I", *args)
+        v = _Shape.volume(shape, Box([0, 0, 0], 10, 10, 10), min_volume=1.0)
+        assert v == pytest.approx(3.4 * 1.15 * 1.8, rel=1.0e-12)
+
+    def test_ultimate_test_box_across_plane(self):
+        shape = Shape("C", create_surface("PX", 0.3))
+        assert shape.ultimate_test_box(Box([0, 0, 0], 2, 2, 2), min_volume=1.0e-3) == 0
+
     @pytest.mark.parametrize(
         "case_no, expected",
         enumerate(
@@ -1994,6 +2076,103 @@ class TestShape:
         surfs = geometry[case_no].get_surfaces()
         assert surfs == expected
 
+    @pytest.mark.parametrize("other_names", [(1, 2, 3), (2, 1, 3), (3, 1, 2)])
+    def test_eq_with_colliding_hashes(self, other_names):
+        # PX 5, PY 5 and PZ 5 have equal hashes
+        def make_shape(px, py, pz):
+            return Shape(
+                "I",
+                Shape("C", create_surface("PX", 5, name=px)),
+                Shape("C", create_surface("PY", 5, name=py)),
+                Shape("C", create_surface("PZ", 5, name=pz)),
+            )
+
+        shape = make_shape(1, 2, 3)
+        other = make_shape(*other_names)
+        assert shape == other
+        assert other == shape
+
+    def test_not_eq_with_colliding_hashes(self):
+        px = create_surface("PX", 5, name=1)
+        py = create_surface("PY", 5, name=2)
+        pz = create_surface("PZ", 5, name=3)
+        shape = Shape("I", Shape("C", px), Shape("C", py), Shape("S", pz))
+        other = Shape("I", Shape("C", px), Shape("C", pz), Shape("S", py))
+        assert hash(shape) == hash(other)
+        assert shape != other
+
+    def test_args_with_unnamed_surfaces(self):
+        named = create_surface("PX", 0, name=1)
+        unnamed = create_surface("PX", 0)
+        shape = Shape("I", named, unnamed)
+        other = Shape("I", unnamed, named)
+        assert [a.args[0] for a in shape.args] == [named, unnamed]
+        assert [a.args[0].name() for a in other.args] == [1, None]
+        assert shape == other
+
+    @pytest.mark.parametrize(
+        "polish, expected_opc, expected_args",
+        [
+            ([1, 2, "I", 3, "I", 4, "I"], "I", 4),
+            ([1, 2, "U", 3, 4, "U", "U"], "U", 4),
+            ([1, 2, "I", 3, "U", 4, "I"], "I", 2),
+            ([1, 2, "I", "C", 3, "I"], "I", 2),
+            ([1, 2, "I", -1, "I"], "E", 0),
+            ([1, 2, "U", 3, "I", -3, "I"], "E", 0),
+            ([1, 2, "U", -2, "U"], "R", 0),
+        ],
+    )
+    def test_from_polish_notation_chains(self, polish, expected_opc, expected_args):
+        surfaces = {i: create_surface("PX", float(i), name=i) for i in range(1, 5)}
+
+        def convert(x):
+            if isinstance(x, str):
+                return x
+            if x < 0:
+                return Shape("C", surfaces[-x])
+            return surfaces[x]
+
+        polish = [convert(x) for x in polish]
+        shape = Shape.from_polish_notation(polish)
+        assert shape.opc == expected_opc
+        assert len(shape.args) == expected_args
+        operands = []
+        for op in polish:  # binary construction to compare with
+            if isinstance(op, str):
+                if op == "C":
+                    operands.append(operands.pop().complement())
+                else:
+                    operands.append(Shape(op, operands.pop(), operands.pop()))
+            else:
+                operands.append(op if isinstance(op, Shape) else Shape("S", op))
+        assert shape == operands.pop()
+
+    def test_shapes_are_interned(self):
+        px = create_surface("PX", 5, name=1)
+        py = create_surface("PY", 5, name=2)
+        shape = Shape("I", Shape("C", px), py)
+        assert Shape("I", py, Shape("C", px)) is shape
+        assert Shape("U", shape, Shape("S", px)) is Shape("U", Shape("S", px), shape)
+        other_px = create_surface("PX", 5, name=3)
+        other = Shape("I", Shape("C", other_px), py)
+        assert other is not shape
+        assert other == shape
+        assert Shape("E") is Shape("E")
+        restored = pass_through_pickle(shape)
+        assert restored == shape
+
+    def test_derived_properties_are_cached(self, geometry):
+        shape = geometry[3]
+        assert shape.get_surfaces() is shape.get_surfaces()
+        assert isinstance(shape.get_surfaces(), frozenset)
+        box = Box([0, 0, 0], 30, 30, 30)
+        bb = shape.bounding_box(tol=1.0, box=box)
+        assert shape.bounding_box(tol=1.0, box=box) is bb
+        assert shape.bounding_box(tol=2.0, box=box) is not bb
+        restored = pass_through_pickle(shape)
+        assert restored.get_surfaces() == shape.get_surfaces()
+        assert restored.complexity() == shape.complexity()
+
     @pytest.mark.parametrize("case_no, polish", enumerate(polish_cases))
     def test_pickle(self, surfaces, case_no, polish):
         polish = [self.filter_arg(a, surfaces) for a in polish]
@@ -2048,6 +2227,17 @@ class TestShape:
         }
         assert ids == ids_ans
 
+    @pytest.mark.parametrize("case_no", range(len(basic_geoms)))
+    def test_copy_with_surfaces(self, geometry, case_no):
+        shape = geometry[case_no]
+        copies = {}
+        new_shape = shape._copy_with_surfaces(copies)
+        assert new_shape == shape
+        assert hash(new_shape) == hash(shape)
+        assert new_shape._get_words() == shape._get_words()
+        assert copies.keys() == {id(s) for s in shape.get_surfaces()}
+        assert {id(s) for s in new_shape.get_surfaces()} == {id(s) for s in copies.values()}
+
 
 class TestBody:
     kwarg_data: Final = [
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from mckit.geometry import Shape as _Shape
+from numpy.testing import assert_array_almost_equal
+
+from mckit import polyhedron
+from mckit.body import Shape
+from mckit.box import Box
+from mckit.parser import from_text
+from mckit.polyhedron import (
+    convex_decomposition,
+    convex_polyhedron,
+    polyhedra_bounds,
+    polyhedra_volume,
+)
+from mckit.surface import create_surface
+
+GLOBAL = Box([0, 0, 0], 100, 100, 100)
+
+
+@pytest.fixture(scope="module")
+def surfaces():
+    return {
+        1: create_surface("PX", -1.0, name=1),
+        2: create_surface("PX", 1.0, name=2),
+        3: create_surface("PY", -1.0, name=3),
+        4: create_surface("PY", 1.0, name=4),
+        5: create_surface("PZ", -1.0, name=5),
+        6: create_surface("PZ", 1.0, name=6),
+        7: create_surface("PX", 0.0, name=7),
+        8: create_surface("P", 1, 1, 0, 1, name=8),
+        9: create_surface("BOX", -1, -1, -1, 2, 0, 0, 0, 3, 0, 0, 0, 4, name=9),
+        10: create_surface("SO", 1.0, name=10),
+    }
+
+
+def cube(surfaces, x1=1, x2=2):
+    return Shape(
+        "I",
+        Shape("S", surfaces[x1]),
+        Shape("C", surfaces[x2]),
+        Shape("S", surfaces[3]),
+        Shape("C", surfaces[4]),
+        Shape("S", surfaces[5]),
+        Shape("C", surfaces[6]),
+    )
+
+
+@pytest.mark.parametrize(
+    "case, expected",
+    [
+        (cube, 8.0),
+        (lambda s: cube(s, x2=7), 4.0),
+        (lambda s: Shape("U", cube(s, x2=7), cube(s, x1=7)), 8.0),
+        (lambda s: Shape("U", cube(s), cube(s, x2=7)), 8.0),
+        (lambda s: Shape("I", cube(s), Shape("C", s[8])), 7.0),
+        (lambda s: Shape("I", cube(s), Shape("S", s[7]), Shape("C", s[8])), 3.0),
+        (lambda s: Shape("I", cube(s, x2=7), Shape("S", s[8])), 0.0),
+        (lambda s: Shape("C", s[9]), 24.0),
+        (lambda s: Shape("I", Shape("C", s[9]), Shape("S", s[7])), 12.0),
+        (lambda s: Shape("U", Shape("C", s[9]), cube(s)), 24.0),
+    ],
+)
+def test_volume(surfaces, case, expected):
+    shape = case(surfaces)
+    polyhedra = convex_decomposition(shape)
+    assert polyhedra is not None
+    assert polyhedra_volume(polyhedra, GLOBAL) == pytest.approx(expected)
+    assert shape.volume(GLOBAL, exact=True) == pytest.approx(expected)
+
+
+def test_volume_of_union_of_complements(surfaces):
+    shape = Shape("U", Shape("S", surfaces[2]), Shape("C", surfaces[1]))
+    box = Box([0, 0, 0], 4, 4, 4)
+    assert shape.volume(box, exact=True) == pytest.approx(32.0)
+
+
+def test_volume_agrees_with_bisection(surfaces):
+    shape = Shape("U", cube(surfaces), Shape("C", surfaces[9]), Shape("C", surfaces[8]))
+    box = Box([0, 0, 0], 8, 8, 8)
+    exact = shape.volume(box, exact=True)
+    assert _Shape.volume(shape, box, min_volume=1.0e-5) == pytest.approx(exact, rel=1.0e-3)
+
+
+@pytest.mark.parametrize(
+    "case, expected",
+    [
+        (cube, [[-1, 1], [-1, 1], [-1, 1]]),
+        (lambda s: cube(s, x2=7), [[-1, 0], [-1, 1], [-1, 1]]),
+        (lambda s: Shape("I", cube(s), Shape("C", s[8])), [[-1, 1], [-1, 1], [-1, 1]]),
+        (lambda s: Shape("I", cube(s), Shape("S", s[8])), [[0, 1], [0, 1], [-1, 1]]),
+        (lambda s: Shape("I", cube(s, x1=7), Shape("C", s[8])), [[0, 1], [-1, 1], [-1, 1]]),
+        (lambda s: Shape("C", s[9]), [[-1, 1], [-1, 2], [-1, 3]]),
+    ],
+)
+def test_bounding_box(surfaces, case, expected):
+    shape = case(surfaces)
+    bb = shape.bounding_box(tol=1.0, box=GLOBAL, exact=True)
+    assert_array_almost_equal(bb.bounds, expected)
+
+
+def test_bounds_in_rotated_box(surfaces):
+    shape = cube(surfaces)
+    c = np.sqrt(0.5)
+    box = Box([0, 0, 0], 10, 10, 10, ex=[c, c, 0], ey=[-c, c, 0], ez=[0, 0, 1])
+    lower, upper = polyhedra_bounds(convex_decomposition(shape), box)
+    assert_array_almost_equal(lower, [-2 * c, -2 * c, -1])
+    assert_array_almost_equal(upper, [2 * c, 2 * c, 1])
+
+
+def test_empty_shape_has_no_bounds(surfaces):
+    shape = Shape("I", cube(surfaces, x2=7), Shape("S", surfaces[8]))
+    assert polyhedra_bounds(convex_decomposition(shape), GLOBAL) is None
+
+
+def test_shape_with_curved_surfaces_is_not_decomposed(surfaces):
+    shape = Shape("I", cube(surfaces), Shape("C", surfaces[10]))
+    assert convex_decomposition(shape) is None
+
+
+def test_too_complex_shape_is_not_decomposed():
+    planes = [create_surface("PX", float(x), name=x + 1) for x in range(10)]
+    slabs = [
+        Shape("U", Shape("C", create_surface("PY", float(y), name=100 + y)), Shape("S", p))
+        for y, p in enumerate(planes)
+    ]
+    assert convex_decomposition(Shape("I", *slabs)) is None
+
+
+def _overlapping_boxes(count: int) -> Shape:
+    def planes(kind, name, x):
+        return Shape("S", create_surface(kind, x, name=name)), Shape(
+            "C", create_surface(kind, x + 2.0, name=name + 1)
+        )
+
+    boxes = [
+        Shape("I", *planes("PX", 6 * i + 1, 0.1 * i), *planes("PY", 6 * i + 3, 0.2 * i))
+        for i in range(count)
+    ]
+    return Shape("U", *boxes)
+
+
+def test_feasibility_checks_are_estimated_in_advance(monkeypatch):
+    def fail(_halfspaces):
+        raise AssertionError("The checks are to be estimated before solving")
+
+    monkeypatch.setattr(polyhedron, "_chebyshev_center", fail)
+    monkeypatch.setattr(polyhedron, "MAX_FEASIBILITY_CHECKS", 20)
+    assert convex_decomposition(_overlapping_boxes(8)) is None
+
+
+def test_feasibility_checks_are_limited(monkeypatch):
+    calls = 0
+    chebyshev_center = polyhedron._chebyshev_center
+
+    def count(halfspaces):
+        nonlocal calls
+        calls += 1
+        return chebyshev_center(halfspaces)
+
+    monkeypatch.setattr(polyhedron, "_chebyshev_center", count)
+    monkeypatch.setattr(polyhedron, "MAX_FEASIBILITY_CHECKS", 40)
+    assert convex_decomposition(_overlapping_boxes(6)) is None
+    assert calls == 40
+
+
+def test_convex_shape_is_exact_by_default(surfaces):
+    shape = Shape("I", cube(surfaces, x1=7), Shape("C", surfaces[8]))
+    assert shape.volume(GLOBAL) == pytest.approx(3.0, rel=1.0e-12)
+    bb = shape.bounding_box(box=GLOBAL)
+    assert_array_almost_equal(bb.center, [0.5, 0.0, 0.0])
+    assert_array_almost_equal(bb.dimensions, [1.0, 2.0, 2.0])
+    assert "_polyhedra" not in shape.__dict__
+
+
+def test_rpp_cell_volume_is_exact_by_default():
+    cell = from_text(
+        """rpp
+1 0 -1 imp:n=1
+2 0 1 imp:n=0
+
+1 rpp -1 2 -1 1.5 0 0.3
+"""
+    ).cells[0]
+    assert cell.shape.volume() == pytest.approx(3.0 * 2.5 * 0.3, rel=1.0e-12)
+
+
+def test_exact_decomposition_is_optional(surfaces):
+    shape = Shape("U", cube(surfaces, x2=7), cube(surfaces, x1=7))
+    assert convex_polyhedron(shape) is None
+    assert shape.volume(GLOBAL, min_volume=1.0e-3) == pytest.approx(8.0, rel=1.0e-2)
+    assert "_polyhedra" not in shape.__dict__
+    assert shape.bounding_box(tol=1.0, box=GLOBAL).volume >= 8.0
+    assert "_polyhedra" not in shape.__dict__
@@ -6,7 +6,21 @@ import numpy as np
 import pytest
 
 from mckit.box import Box
-from mckit.surface import BOX, RCC, Cone, Cylinder, GQuadratic, Plane, Sphere, Torus, create_surface
+from mckit.surface import (
+    BOX,
+    RCC,
+    _BUCKET_WIDTH_FACTOR,
+    Cone,
+    Cylinder,
+    GQuadratic,
+    Plane,
+    Sphere,
+    Surface,
+    Torus,
+    create_replace_dictionary,
+    create_surface,
+    transform_surfaces,
+)
 from mckit.transformation import Transformation
 
 from tests import pass_through_pickle
@@ -519,11 +533,13 @@ class TestPlane:
             ([0, 0, 1], -2, {}),
             ([1, 0, 0], -2, {"name": 3}),
             ([0, 1, 0], -2, {"name": 4, "comments": ["abc", "def"]}),
+            ([1, 1, 0], -2, {"name": 5}),
         ],
     )
     def test_pickle(self, transform, norm, offset, options):
         surf = Plane(norm, offset, transform=transform, **options)
         surf_un = pass_through_pickle(surf)
+        assert surf == surf_un, "Pickling should preserve the plane exactly"
         assert surf.is_close_to(surf_un)
         np.testing.assert_array_almost_equal(surf._v, surf_un._v)
         np.testing.assert_almost_equal(surf._k, surf_un._k)
@@ -535,6 +551,21 @@ class TestPlane:
             np.testing.assert_almost_equal(surf._k, surf_un._k)
         assert surf.options == surf_un.options
 
+    def test_unpickle_previous_format(self, monkeypatch):
+        surf = Plane([1, 1, 0], -2, name=5)
+
+        def previous_getstate(plane):
+            return plane._v, plane._k, Surface.__getstate__(plane)
+
+        monkeypatch.setattr(Plane, "__getstate__", previous_getstate)
+        surf_un = pass_through_pickle(surf)
+        assert surf.is_close_to(surf_un)
+        np.testing.assert_array_almost_equal(surf._v, surf_un._v)
+        np.testing.assert_almost_equal(surf._k, surf_un._k)
+        assert surf_un._k_digits == surf._k_digits
+        np.testing.assert_array_equal(surf_un._v_digits, surf._v_digits)
+        assert surf_un.options == surf.options
+
     surfs: Final = [
         create_surface("PX", 5.0, name=1),  # 0
         create_surface("PX", 5.0 + 1.0e-12, name=1),  # 1
@@ -2948,6 +2979,71 @@ class TestGQuadratic:
         desc = surface.round().mcnp_repr(pretty=False)
         assert desc == answer
 
+    @pytest.mark.parametrize(
+        "m, v, k, expected",
+        [
+            (np.diag([2, 2, 2]), [-4, -8, -12], 20, Sphere([1, 2, 3], 2)),
+            (np.diag([1, 1, 0]), [-2, -4, 0], 1, Cylinder([1, 2, 0], [0, 0, 1], 2)),
+            (np.diag([1, 1, -0.25]), [0, 0, 1.5], -2.25, Cone([0, 0, 3], [0, 0, 1], 0.25)),
+            (
+                [[1, 0, 0], [0, 0.5, -0.5], [0, -0.5, 0.5]],
+                [0, 0, 0],
+                -9,
+                Cylinder([0, 0, 0], [0, 1, 1], 3),
+            ),
+        ],
+    )
+    def test_round_to_specialized_surface(self, m, v, k, expected):
+        surf = GQuadratic(m, v, k, name=1).round()
+        assert surf == expected.round()
+        assert surf.name() == 1
+
+    def test_round_transformed_cylinder(self):
+        tr = Transformation([1, 2, 3], [30, 60, 90, 120, 30, 90, 90, 90, 0], indegrees=True)
+        cylinder = create_surface("C/X", 1, 2, 3, transform=tr).apply_transformation()
+        words = cylinder.mcnp_repr().split()
+        assert words[1] == "GQ"
+        gq = create_surface("GQ", *map(float, words[2:]))
+        assert isinstance(gq, Cylinder)
+        assert gq.round() == cylinder.round()
+
+
+@pytest.mark.parametrize(
+    "kind, params, cls",
+    [
+        ("GQ", [1, 1, 1, 0, 0, 0, -2, -4, -6, 10], Sphere),
+        ("GQ", [1, 1, 0, 0, 0, 0, -2, -4, 0, 1], Cylinder),
+        ("GQ", [1, 1, -1, 0, 0, 0, 0, 0, 0, 0], Cone),
+        ("GQ", [1, 1, -1, 0, 0, 0, 0, 0, 0, -1], GQuadratic),  # hyperboloid
+        ("GQ", [1, 2, 3, 0, 0, 0, 0, 0, 0, -1], GQuadratic),  # ellipsoid
+        ("GQ", [1, 1, 0, 0, 0, 0, 0, 0, 1, -1], GQuadratic),  # paraboloid
+        ("GQ", [-1, -1, 0, 0, 0, 0, 0, 0, 0, 1], GQuadratic),  # negative inside
+        ("GQ", [1, 1, 1, 0, 0, 0, -2, -2, -2, 3], GQuadratic),  # point
+        ("SQ", [1, 1, 0, 0, 0, 0, -4, 1, 2, 3], Cylinder),
+        ("SQ", [4, 4, 4, 0, 0, 0, -4, 1, 2, 3], Sphere),
+    ],
+)
+def test_gq_classification(kind, params, cls):
+    surf = create_surface(kind, *params, name=1)
+    assert type(surf) is cls
+    assert surf.name() == 1
+    gq = GQuadratic(*_gq_coefficients(kind, params))
+    points = np.random.default_rng(0).uniform(-5, 5, (1000, 3))
+    np.testing.assert_array_equal(surf.test_points(points), gq.test_points(points))
+
+
+def _gq_coefficients(kind, params):
+    if kind == "SQ":
+        a, b, c, d, e, f, g, x, y, z = params
+        params = [a, b, c, 0, 0, 0, 2 * d, 2 * e, 2 * f, g]
+        shift = np.array([x, y, z])
+    else:
+        shift = np.zeros(3)
+    a, b, c, d, e, f, g, h, j, k = params
+    m = np.array([[a, 0.5 * d, 0.5 * f], [0.5 * d, b, 0.5 * e], [0.5 * f, 0.5 * e, c]])
+    v = np.array([g, h, j])
+    return Transformation(translation=shift).apply2gq(m, v, k)
+
 
 class TestBOX:
     @pytest.mark.parametrize(
@@ -3318,3 +3414,145 @@ class TestRCC:
 def test_plane_is_close(a: Plane, b: Plane, expected: bool) -> None:
     assert a.is_close_to(b) == expected
     assert b.is_close_to(a) == expected
+
+
+def test_transform_surfaces(transform):
+    surfaces = [
+        create_surface("PX", 5.3, name=1),
+        create_surface("P", 3.2, -1.4, 5.7, -4.8, name=2),
+        create_surface("S", 1, 2, 3, 4, name=3),
+        create_surface("C/Y", 1, 2, 3, name=4),
+        create_surface("K/Z", 1, 2, 3, 0.25, name=5),
+        create_surface("KX", 4, 0.5, 1, name=6),
+        create_surface("TZ", 1, 2, 3, 4, 2, 1, name=7),
+        create_surface("GQ", 1, 2, 3, 4, 5, 6, 7, 8, 9, -10, name=8),
+        *random_planes(20, first_name=9),
+    ]
+    actual = transform_surfaces(surfaces, transform)
+    assert actual.keys() == set(surfaces)
+    for s in surfaces:
+        expected = s.transform(transform)
+        assert actual[s] == expected
+        if isinstance(expected, Surface):
+            assert actual[s].name() == s.name()
+
+
+def random_planes(count: int, first_name: int = 1, seed: int = 0) -> list[Surface]:
+    rng = np.random.default_rng(seed)
+    return [
+        create_surface("P", *rng.uniform(-10, 10, size=4), name=name)
+        for name in range(first_name, first_name + count)
+    ]
+
+
+def random_transformation(seed: int) -> Transformation:
+    rng = np.random.default_rng(seed)
+    rotation, _ = np.linalg.qr(rng.normal(size=(3, 3)))
+    return Transformation(translation=rng.uniform(-10, 10, size=3), rotation=rotation.ravel())
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_transform_surfaces_transforms_planes_exactly(seed):
+    planes = random_planes(40, seed=seed)
+    tr = random_transformation(seed)
+    actual = transform_surfaces(planes, tr)
+    for p in planes:
+        expected = p.transform(tr)
+        assert actual[p] == expected
+        assert actual[p]._k == expected._k
+        np.testing.assert_array_equal(actual[p]._v, expected._v)
+        assert actual[p].mcnp_words() == expected.mcnp_words()
+
+
+@pytest.mark.parametrize(
+    "kind, params",
+    [
+        ("PX", [5.3]),
+        ("P", [3.2, -1.4, 5.7, -4.8]),
+        ("S", [1, 2, 3, 4]),
+        ("C/Y", [1, 2, 3]),
+        ("K/Z", [1, 2, 3, 0.25, -1]),
+        ("TZ", [1, 2, 3, 4, 2, 1]),
+        ("GQ", [1, 2, 3, 4, 5, 6, 7, 8, 9, -10]),
+    ],
+)
+def test_rounded_parameters_and_hash_are_cached(kind, params):
+    surf = create_surface(kind, *params, name=1)
+    assert "_hash_value" not in surf.__dict__
+    hash_value = hash(surf)
+    assert surf.__dict__["_hash_value"] == hash_value
+    assert surf._rounded is surf._rounded
+    for other in [surf.copy(), pass_through_pickle(surf)]:
+        assert "_rounded" not in other.__dict__
+        assert hash(other) == hash_value
+        assert other == surf
+    assert surf != create_surface(kind, *[p + 1 for p in params], name=1)
+
+
+def test_create_replace_dictionary():
+    surfaces = [
+        create_surface("PX", 1, name=1),
+        create_surface("PX", 1 + 1e-11, name=2),
+        create_surface("P", -1, 0, 0, -(1 - 1e-11), name=3),
+        create_surface("PX", 1.01, name=4),
+        create_surface("S", 1, 2, 3, 4, name=5),
+        create_surface("S", 1, 2, 3 + 1e-11, 4, name=6),
+        create_surface("C/Z", 1, 2, 3, name=7),
+        create_surface("C/Z", 1, 2, 3 + 1e-11, name=8),
+        create_surface("K/Z", 1, 2, 3, 0.25, 1, name=9),
+        create_surface("K/Z", 1, 2, 3, 0.25, -1, name=10),
+        create_surface("RCC", 0, 0, 0, 0, 0, 1, 2, name=11),
+        create_surface("RCC", 0, 0, 0, 0, 0, 1, 2, name=12),
+    ]
+    actual = create_replace_dictionary(surfaces)
+    expected = {2: (1, 1), 3: (1, -1), 6: (5, 1), 8: (7, 1), 12: (11, 1)}
+    assert {s.name(): (us.name(), sense) for s, (us, sense) in actual.items()} == expected
+
+
+def test_create_replace_dictionary_with_unique():
+    unique = {create_surface("SO", 1, name=1)}
+    surfaces = [create_surface("SO", 1 + 1e-11, name=2), create_surface("SO", 2, name=3)]
+    actual = create_replace_dictionary(surfaces, unique=unique)
+    assert {s.name(): us.name() for s, (us, _) in actual.items()} == {2: 1}
+    assert {s.name() for s in unique} == {1, 3}
+
+
+def test_create_replace_dictionary_on_buckets_boundaries():
+    tol = 1e-4
+    scale = 10.0
+    width = _BUCKET_WIDTH_FACTOR * tol * scale
+    surfaces: list[Surface] = [create_surface("SO", scale, name=1)]
+    for m in range(-9, 10):
+        boundary = m * width
+        delta = 0.25 * tol * max(1.0, abs(boundary))
+        surfaces.append(create_surface("PX", boundary - delta, name=len(surfaces) + 1))
+        surfaces.append(create_surface("PX", boundary + delta, name=len(surfaces) + 1))
+    actual = create_replace_dictionary(surfaces, tol=tol)
+    expected = {i: (i - 1, 1) for i in range(3, len(surfaces) + 1, 2)}
+    assert {s.name(): (us.name(), sense) for s, (us, sense) in actual.items()} == expected
+
+
+def test_box_cache_stat():
+    surface = create_surface("SO", 1)
+    assert surface.box_cache_stat() == (0, 0)
+    assert surface.test_box(Box([0, 0, 0], 0.5, 0.5, 0.5)) == -1
+    assert surface.box_cache_stat() == (0, 1)
+    assert surface.test_box(Box([0.1, 0, 0], 0.2, 0.2, 0.2)) == -1, "contained box hits the cache"
+    assert surface.box_cache_stat() == (1, 1)
+    assert surface.test_box(Box([0, 0, 0], 4, 4, 4)) == 0, "containing box misses the cache"
+    assert surface.box_cache_stat() == (1, 2)
+    rotated = Box([0.1, 0, 0], 0.2, 0.2, 0.2, ex=[0, 1, 0], ey=[-1, 0, 0])
+    assert surface.test_box(rotated) == -1, "rotated boxes are not cached"
+    assert surface.box_cache_stat() == (1, 2)
+
+
+@pytest.mark.parametrize(
+    "kind, params, position",
+    [("PX", [0.3], 0.3), ("P", [2, 0, 0, 0.6], 0.3), ("PX", [-1e6 + 0.3], -1e6 + 0.3)],
+)
+def test_plane_test_box_at_split(kind, params, position):
+    surface = create_surface(kind, *params)
+    box = Box([position + 0.3, 0, 0], 2, 2, 2)
+    box1, box2 = box.split(dir="x", ratio=0.35)
+    assert surface.test_box(box1) == -1
+    assert surface.test_box(box2) == +1
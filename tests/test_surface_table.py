@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from numpy.testing import assert_array_almost_equal, assert_array_equal
+
+from mckit.surface import Cone, GQuadratic, Surface, create_surface
+from mckit.surface_table import SurfaceTable
+from mckit.transformation import Transformation
+
+
+@pytest.fixture
+def surfaces():
+    return [
+        create_surface("PX", 5.3, name=1),
+        create_surface("P", 3.2, -1.4, 5.7, -4.8, name=2),
+        create_surface("S", 1, 2, 3, 4, name=3),
+        create_surface("C/Y", 1, 2, 3, name=4),
+        create_surface("K/Z", 1, 2, 3, 0.25, name=5),
+        create_surface("KX", 4, 0.5, 1, name=6),
+        create_surface("TZ", 1, 2, 3, 4, 2, 1, name=7),
+        create_surface("GQ", 1, 2, 3, 4, 5, 6, 7, 8, 9, -10, name=8),
+        create_surface("SO", 2, name=9),
+        create_surface("PX", 5.3, name=10),
+        create_surface("K/Z", 1, 2, 3, 0.25, -1, name=11),
+        create_surface("RPP", -1, 1, -2, 2, -3, 3, name=12),
+        create_surface("CZ", 2, name=13),
+        create_surface("S", 1, 2, 3, 4, name=14),
+    ]
+
+
+@pytest.fixture(
+    params=[
+        {},
+        {
+            "translation": [1, 2, -3],
+            "indegrees": True,
+            "rotation": [30, 60, 90, 120, 30, 90, 90, 90, 0],
+        },
+    ],
+)
+def transform(request):
+    return Transformation(**request.param)
+
+
+def test_surfaces_keep_indices(surfaces):
+    table = SurfaceTable(surfaces)
+    assert len(table) == len(surfaces)
+    assert list(table) == surfaces
+    assert all(table[i] is s for i, s in enumerate(surfaces))
+    assert table.names() == [s.name() for s in surfaces]
+
+
+def test_test_points(surfaces):
+    rng = np.random.default_rng(0)
+    points = rng.uniform(-10, 10, size=(1000, 3))
+    table = SurfaceTable(surfaces)
+    actual = table.test_points(points)
+    assert actual.shape == (len(surfaces), len(points))
+    for i, s in enumerate(surfaces):
+        assert_array_equal(actual[i], s.test_points(points))
+    assert_array_equal(table.test_points(points[0]), actual[:, 0])
+
+
+def test_transform(surfaces, transform):
+    table = SurfaceTable(surfaces).transform(transform)
+    assert len(table) == len(surfaces)
+    for s, actual in zip(surfaces, table, strict=True):
+        expected = s.transform(transform)
+        if isinstance(s, Cone) and s._sheet:
+            expected = Cone(s._apex, s._axis, s._t2, s._sheet, transform=transform, **s.options)
+        assert type(actual) is type(expected)
+        assert actual == expected
+        assert actual.name() == expected.name()
+        assert actual.mcnp_words() == expected.mcnp_words()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_transform_planes_exactly(seed):
+    rng = np.random.default_rng(seed)
+    planes = [
+        create_surface("P", *rng.uniform(-10, 10, size=4), name=name) for name in range(1, 61)
+    ]
+    rotation, _ = np.linalg.qr(rng.normal(size=(3, 3)))
+    tr = Transformation(translation=rng.uniform(-10, 10, size=3), rotation=rotation.ravel())
+    table = SurfaceTable(planes).transform(tr)
+    for p, actual in zip(planes, table, strict=True):
+        expected = p.transform(tr).apply_transformation()
+        assert actual == expected
+        assert actual._k == expected._k
+        assert_array_equal(actual._v, expected._v)
+
+
+def test_transform_axis_plane():
+    table = SurfaceTable([create_surface("PY", 1.0, name=1)])
+    actual = table.transform(Transformation(translation=[1, 2, 3]))[0]
+    expected = create_surface("PY", 3.0, name=1)
+    assert actual == expected
+    assert actual.mcnp_words() == expected.mcnp_words()
+
+
+def test_transformed_table_test_points(surfaces, transform):
+    rng = np.random.default_rng(1)
+    points = rng.uniform(-10, 10, size=(1000, 3))
+    table = SurfaceTable(surfaces).transform(transform)
+    expected = SurfaceTable(list(table)).test_points(points)
+    assert_array_equal(table.test_points(points), expected)
+
+
+def test_transform_gq_as_apply2gq(transform):
+    gq = create_surface("GQ", 1, 2, 3, 4, 5, 6, 7, 8, 9, -10, name=1)
+    assert isinstance(gq, GQuadratic)
+    actual = SurfaceTable([gq]).transform(transform)[0]
+    m, v, k = transform.apply2gq(gq._m, gq._v, gq._k)
+    assert_array_almost_equal(actual._m, m)
+    assert_array_almost_equal(actual._v, v)
+    assert actual._k == pytest.approx(k)
+
+
+def test_equal_indices(surfaces):
+    table = SurfaceTable(surfaces)
+    actual = table.equal_indices()
+    expected = [next(j for j, o in enumerate(surfaces) if o == s) for s in surfaces]
+    assert actual.tolist() == expected
+    assert actual[9] == 0
+    assert actual[13] == 2
+
+
+def test_equal_indices_of_close_surfaces():
+    surfaces: list[Surface] = [
+        create_surface("S", 1, 2, 3, 4, name=1),
+        create_surface("S", 1 + 1.0e-14, 2, 3, 4, name=2),
+        create_surface("S", 1 + 1.0e-3, 2, 3, 4, name=3),
+        create_surface("CX", 1.0, name=4),
+        create_surface("C/X", -0.0, 0.0, 1.0, name=5),
+    ]
+    assert SurfaceTable(surfaces).equal_indices().tolist() == [0, 0, 2, 3, 3]
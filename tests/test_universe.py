@@ -397,6 +397,27 @@ def test_add_cells_neg(universe, case, cells, shapes):
     assert_change(s_before, s_after, {})
 
 
+def test_add_cells_one_by_one(universe):
+    expected = universe(1)
+    cells = list(expected)
+    u = Universe([], name_rule="new")
+    for cell in cells:
+        u.add_cells(cell, name_rule="new")
+    assert [c.name() for c in u] == list(range(1, len(cells) + 1))
+    assert [c.shape for c in u] == [c.shape for c in cells]
+    assert len(u.get_surfaces()) == len(expected.get_surfaces())
+    assert u.get_compositions() == expected.get_compositions()
+
+
+def test_add_cells_after_rename(universe):
+    u = universe(1)
+    u.rename(start_cell=100, start_surf=200)
+    u.add_cells(Body(Shape("C", Sphere([0, 3, 0], 0.5, name=1)), name=1), name_rule="new")
+    added = u[-1]
+    assert added.name() == 100 + len(u) - 1
+    assert next(iter(added.shape.get_surfaces())).name() == 200 + len(u.get_surfaces()) - 1
+
+
 @pytest.mark.parametrize(
     "case, common_materials, ans_compositions",
     [
@@ -499,6 +520,25 @@ def test_get_surfaces(universe, case, recursive, answer_data):
     assert names == names_ans
 
 
+@pytest.mark.parametrize("case, recursive", [(1, False), (1, True)])
+def test_surface_table(universe, case, recursive):
+    u = universe(case)
+    table = u.surface_table(inner=recursive)
+    surfaces = sorted(u.get_surfaces(inner=recursive), key=Surface.name)
+    assert table.names() == [s.name() for s in surfaces]
+    points = np.random.default_rng(0).uniform(-10, 10, size=(100, 3))
+    expected = np.array([s.test_points(points) for s in surfaces])
+    np.testing.assert_array_equal(table.test_points(points), expected)
+
+
+def test_surface_table_with_unnamed_surfaces():
+    u = Universe([Body(Shape("C", create_surface("SO", 1, name=1)), name=1)])
+    u.add_cells(Body(Shape("C", create_surface("SO", 2, name=2)), name=2))
+    unnamed = next(s for s in u.get_surfaces() if s.name() == 2)
+    del unnamed.options["name"]  # the registry doesn't accept unnamed surfaces
+    assert u.surface_table().names() == [1, None]
+
+
 @pytest.mark.parametrize(
     "case, answer", [(5, {Composition(atomic=[("6012", 1)], name=10)}), (1, set())]
 )
@@ -589,6 +629,53 @@ def test_transform(universe, case, tr, extent):
         np.testing.assert_array_equal(r, r_tr)
 
 
+APPLY_TRANSFORMATION_TEXT = """apply transformation
+1 0 -1 fill=1 (10 0 0)
+2 0 1 -2 fill=1 (10 0 0)
+3 0 2 -3 fill=1 (0 10 0)
+4 0 3
+5 0 -4 u=1
+6 0 4 u=1
+
+1 so 100
+2 so 200
+3 so 300
+4 so 1
+
+"""
+
+
+def _filling_sphere_center(cell: Body) -> list[float]:
+    filling_universe = cell.options["FILL"]["universe"]
+    (surface,) = filling_universe.get_surfaces()
+    return list(surface._center)
+
+
+def test_apply_transformation_shares_filling_universes():
+    src = from_text(APPLY_TRANSFORMATION_TEXT).universe
+    u = src.apply_transformation()
+    c1, c2, c3, c4 = u
+    assert c1.options["FILL"]["universe"] is c2.options["FILL"]["universe"]
+    assert c1.options["FILL"]["universe"] is not c3.options["FILL"]["universe"]
+    assert "transform" not in c1.options["FILL"]
+    assert _filling_sphere_center(c1) == [10.0, 0.0, 0.0]
+    assert _filling_sphere_center(c3) == [0.0, 10.0, 0.0]
+    assert "FILL" not in c4.options
+
+
+def test_apply_transformation_with_instancing():
+    src = from_text(APPLY_TRANSFORMATION_TEXT).universe
+    u = src.apply_transformation(instancing=True)
+    c1, c2, c3, _ = u
+    filling_universe = c1.options["FILL"]["universe"]
+    assert c2.options["FILL"]["universe"] is filling_universe
+    assert c3.options["FILL"]["universe"] is filling_universe
+    for c, src_c in zip(u, src, strict=False):
+        if "FILL" in c.options:
+            assert c.options["FILL"]["transform"] == src_c.options["FILL"]["transform"]
+    assert _filling_sphere_center(c1) == [0.0, 0.0, 0.0]
+
+
 @pytest.mark.parametrize("case", [1])
 def test_copy(universe, case):
     u = universe(case)
@@ -869,16 +956,79 @@ def test_set_common_materials(universe, case, common_mat):
         ),
     ],
 )
-def test_apply_fill(universe, case, condition, answer_case, box):
+@pytest.mark.parametrize("prune", [False, True])
+def test_apply_fill(universe, case, condition, answer_case, box, prune):  # noqa: PLR0917
     u = universe(case)
     ua = universe(answer_case)
-    u.apply_fill(**condition)
+    u.apply_fill(**condition, prune=prune)
     points = box.generate_random_points(1000000)
     test_f = u.test_points(points)
     test_a = ua.test_points(points)
     np.testing.assert_array_equal(test_f, test_a)
 
 
+PRUNE_TEXT = """prune
+1 0 -1 fill=1
+2 0 1
+10 0 -2 u=1
+11 0 -3 u=1
+12 0 2 3 u=1
+
+1 so 10
+2 s 100 0 0 5
+3 s -100 0 0 5
+
+"""
+
+
+@pytest.mark.parametrize("prune, expected", [(False, [10, 11, 12]), (True, [12])])
+def test_fill_prune(prune, expected):
+    u = from_text(PRUNE_TEXT).universe
+    cells = u[0].fill(prune=prune)
+    assert [c.name() for c in cells] == expected
+
+
+MERGE_TEXT = """merge
+1 0 -2 4
+2 0 2 -3
+3 0 5 -1
+
+1 px 1
+2 so 10
+3 so 20
+4 p -1 0 0 -1.00000000005
+5 so 20.000000001
+
+"""
+
+
+def test_merge_close_surfaces():
+    u = from_text(MERGE_TEXT).universe
+    points = [[0, 0, 0], [15, 0, 0], [-30, 0, 0]]
+    expected_points = u.test_points(points)
+    assert expected_points.tolist() == [0, 1, 2]
+    replace = u.merge_close_surfaces()
+    assert {s.name(): (us.name(), sense) for s, (us, sense) in replace.items()} == {
+        4: (1, -1),
+        5: (3, 1),
+    }
+    assert {s.name() for s in u.get_surfaces()} == {1, 2, 3}
+    assert [sorted(s.name() for s in c.shape.get_surfaces()) for c in u] == [[1, 2], [2, 3], [1, 3]]
+    np.testing.assert_array_equal(u.test_points(points), expected_points)
+    assert u.merge_close_surfaces() == {}
+
+
+def test_merge_close_unnamed_surfaces():
+    named = create_surface("SO", 20, name=1)
+    unnamed = create_surface("SO", 20.000000001, name=2)
+    u = Universe([Body(Shape("C", named), name=1), Body(Shape("S", unnamed), name=2)])
+    unnamed = next(s for s in u.get_surfaces() if s.name() == 2)
+    del unnamed.options["name"]  # the registry doesn't accept unnamed surfaces
+    replace = u.merge_close_surfaces()
+    assert replace == {unnamed: (named, 1)}
+    assert next(iter(replace.values()))[0].name() == 1
+
+
 @pytest.mark.parametrize(
     "case, start, answer",
     [
@@ -4,7 +4,7 @@ from typing import NoReturn
 
 import pytest
 
-from mckit.utils.indexes import Index
+from mckit.utils.indexes import Index, LazyIndex
 
 
 def dummy_strategy(c: int) -> int:
@@ -50,3 +50,38 @@ def test_index_with_strict_strategy(
         else:
             with pytest.raises(MyKeyError):
                 _ = dictionary[k]
+
+
+def test_lazy_index() -> None:
+    created = []
+
+    def factory(source: str) -> int:
+        created.append(source)
+        return int(source)
+
+    index = LazyIndex({1: "10", 2: "20"}, factory, strict_strategy)
+    assert not index
+    assert index[2] == 20
+    assert index[2] == 20
+    assert created == ["20"]
+    with pytest.raises(MyKeyError):
+        _ = index[3]
+    assert index.materialize() == [10, 20]
+    assert created == ["20", "10"]
+
+
+def test_lazy_index_with_recursive_dependencies() -> None:
+    def factory(source: tuple[int, int | None]) -> int:
+        value, dependency = source
+        if dependency is None:
+            return value
+        return value + index[dependency]
+
+    index = LazyIndex(
+        {1: (1, None), 2: (2, 1), 3: (3, 2), 4: (4, 5), 5: (5, 4)}, factory, strict_strategy
+    )
+    assert index[3] == 6
+    assert sorted(index) == [1, 2, 3]
+    with pytest.raises(MyKeyError):
+        _ = index[4]
+    assert sorted(index) == [1, 2, 3]
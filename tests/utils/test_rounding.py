@@ -117,3 +117,21 @@ def test_round_array(array, reltol, resolution, answer):
     result = round_array(array, digits_array)
     assert result.shape == answer.shape
     assert np.all(result == answer)
+
+
+@pytest.mark.parametrize("resolution", [None, 1.0e-12])
+@pytest.mark.parametrize("shape", [(5,), (1000,), (100, 3)])
+def test_vectorized_rounding_is_same_as_scalar(shape, resolution):
+    rng = np.random.default_rng(0)
+    size = np.prod(shape)
+    values = (rng.random(size) - 0.5) * 10.0 ** rng.integers(-14, 14, size)
+    values[::7] = np.round(values[::7], 2) + 0.005  # half-integers on scaling
+    values[::11] = 0.0
+    values = values.reshape(shape)
+    digits = significant_array(values, 1.0e-12, resolution)
+    assert digits.shape == shape
+    expected_digits = [significant_digits(v, 1.0e-12, resolution) for v in values.ravel().tolist()]
+    assert digits.ravel().tolist() == expected_digits
+    result = round_array(values, digits)
+    expected = [round(v, d) for v, d in zip(values.ravel().tolist(), expected_digits, strict=True)]
+    assert result.ravel().tolist() == expected
@@ -7,6 +7,7 @@ from mckit.utils import (
     FLOAT_TOLERANCE,
     are_equal,
     compute_hash,
+    decades_array,
     filter_dict,
     get_decades,
     prettify_float,
@@ -41,6 +42,7 @@ from mckit.utils import (
 )
 def test_get_decades(value, expected):
     assert get_decades(value) == expected
+    assert decades_array(np.array([value, value])).tolist() == [expected, expected]
 
 
 @pytest.mark.parametrize(